@@ -1,8 +1,10 @@
 from .base import Docker
 from .batch import BatchDocker
+from .bandit import BanditDocker
 from .serial import SerialDocker
 from .success import SuccessDocker, SuccessMonteCarloDocker
 from .subdock import Subdocker
 from .mcdocker import MonteCarloDocker
+from .tempering import TemperingDocker
 
-__all__ = [BatchDocker, Subdocker, SerialDocker, SuccessDocker, MonteCarloDocker, SuccessMonteCarloDocker]
+__all__ = [BatchDocker, BanditDocker, Subdocker, SerialDocker, SuccessDocker, MonteCarloDocker, SuccessMonteCarloDocker, TemperingDocker]
@@ -0,0 +1,183 @@
+import time
+import numpy as np
+
+from .batch import BatchDocker
+from VOID.utils.geometry import uniform_rotation_matrices
+
+
+INITIAL_ATTEMPTS = 10
+ROUND_ATTEMPTS = 10
+POLICY = "ucb"
+POLICY_CHOICES = ["ucb", "thompson"]
+MAX_POSES = None
+TIME_BUDGET = None
+
+# poses closer than this (Å and rotation matrix entries) are duplicates
+DUPLICATE_TOL = 1e-6
+
+
+class BanditDocker(BatchDocker):
+    PARSER_NAME = "bandit"
+    HELP = "Docks guests to host distributing the attempts among points according to their success rate (multi-armed bandit)"
+
+    def __init__(
+        self,
+        *args,
+        initial_attempts=INITIAL_ATTEMPTS,
+        round_attempts=ROUND_ATTEMPTS,
+        policy=POLICY,
+        max_poses=MAX_POSES,
+        time_budget=TIME_BUDGET,
+        **kwargs,
+    ):
+        """The total budget is the same as for the `BatchDocker`, i.e.
+            `attempts` per point. Each point first receives
+            `initial_attempts`; the remaining budget is then given in
+            rounds of `round_attempts` to the point chosen by `policy`.
+
+        Args:
+            initial_attempts (int): attempts given to every point at first
+            round_attempts (int): attempts given to the chosen point at
+                each round
+            policy (str): "ucb" (upper confidence bound) or "thompson"
+                (Thompson sampling) on the success rate of each point
+            max_poses (int): if given, stop after this number of
+                successful poses
+            time_budget (float): if given, stop after this number of seconds
+        """
+        super().__init__(*args, **kwargs)
+        self.initial_attempts = initial_attempts
+        self.round_attempts = round_attempts
+        self.policy = policy
+        self.max_poses = max_poses
+        self.time_budget = time_budget
+
+    @staticmethod
+    def add_arguments(parser):
+        BatchDocker.add_arguments(parser)
+        parser.add_argument(
+            "--initial_attempts",
+            type=int,
+            help="attempts initially given to each point (default: %(default)s)",
+            default=INITIAL_ATTEMPTS,
+        )
+        parser.add_argument(
+            "--round_attempts",
+            type=int,
+            help="attempts given to the selected point at each round (default: %(default)s)",
+            default=ROUND_ATTEMPTS,
+        )
+        parser.add_argument(
+            "--policy",
+            type=str,
+            choices=POLICY_CHOICES,
+            help="policy used to select the next point (default: %(default)s)",
+            default=POLICY,
+        )
+        parser.add_argument(
+            "--max_poses",
+            type=int,
+            help="stop docking after this number of successful poses (default: %(default)s)",
+            default=MAX_POSES,
+        )
+        parser.add_argument(
+            "--time_budget",
+            type=float,
+            help="stop docking after this number of seconds (default: %(default)s)",
+            default=TIME_BUDGET,
+        )
+
+    def copy(self):
+        docker = super().copy()
+        docker.initial_attempts = self.initial_attempts
+        docker.round_attempts = self.round_attempts
+        docker.policy = self.policy
+        docker.max_poses = self.max_poses
+        docker.time_budget = self.time_budget
+        return docker
+
+    def select_point(self, trials, successes, rng):
+        if self.policy == "thompson":
+            return int(np.argmax(rng.beta(1 + successes, 1 + trials - successes)))
+
+        # UCB1 on the success rate
+        rate = successes / trials
+        bonus = np.sqrt(2 * np.log(trials.sum()) / trials)
+        return int(np.argmax(rate + bonus))
+
+    def get_round_rotations(self, size, rng):
+        """Orientations tried at a point which was already docked. As
+            deterministic samplers (e.g. the Hopf grid) return the same
+            orientations for the same `size`, the set is rotated as a
+            whole by a random rotation.
+        """
+        offset = uniform_rotation_matrices(1, rng)[0]
+        return offset @ self.get_rotations(size, rng)
+
+    @staticmethod
+    def remove_duplicates(complexes, tol=DUPLICATE_TOL):
+        """Keeps the first of the poses with the same point, rotation
+            and conformer.
+        """
+        unique, keys = [], set()
+        for cpx in complexes:
+            arrays = [cpx.point, cpx.rotation]
+            if cpx.conformer is not None:
+                arrays.append(cpx.conformer)
+
+            key = np.round(np.concatenate([np.ravel(a) for a in arrays]) / tol).tobytes()
+            if key not in keys:
+                keys.add(key)
+                unique.append(cpx)
+
+        return unique
+
+    def should_stop(self, num_poses, start):
+        if self.max_poses is not None and num_poses >= self.max_poses:
+            return True
+
+        if self.time_budget is not None and time.perf_counter() - start > self.time_budget:
+            return True
+
+        return False
+
+    def dock(self, attempts):
+        self.fitness.prepare(self.host, self.guest)
+        start = time.perf_counter()
+
+        points, multiplicity = self.get_weighted_points()
+        if len(points) == 0:
+            return []
+
+        rngs = self.get_point_rngs(len(points))
+        rng = np.random if self.seed is None else np.random.default_rng([self.seed, len(points)])
+
+        # symmetry-distinct points keep the budget of their equivalent points
+        budget = attempts * multiplicity.sum()
+        initial = max(min(self.initial_attempts, attempts), 1)
+
+        trials = np.full(len(points), initial)
+        successes = np.zeros(len(points))
+
+        complexes = []
+        for i, point in enumerate(points):
+            poses = self.dock_at_point(point, initial, rngs[i])
+            successes[i] += len(poses)
+            complexes += poses
+
+        while trials.sum() < budget and not self.should_stop(len(complexes), start):
+            i = self.select_point(trials, successes, rng)
+            size = int(min(self.round_attempts, budget - trials.sum()))
+
+            rotation = self.get_round_rotations(size, rngs[i])
+            poses = self.dock_at_point(points[i], len(rotation), rngs[i], rotation)
+            trials[i] += size
+            successes[i] += len(poses)
+            complexes += poses
+
+        complexes = self.rank_complexes(self.remove_duplicates(complexes))
+
+        if self.symmetrize and self.expand_poses:
+            complexes = self.expand_complexes(complexes)
+
+        return complexes
@@ -1,12 +1,35 @@
 import numpy as np
 from typing import List
+from concurrent.futures import ProcessPoolExecutor
 from pymatgen.core import Structure, Molecule
 
-from VOID.structure import Complex
+from VOID.structure import Complex, PoseRecord, materialize
+from VOID.structure.symmetry import SYMPREC, get_host_symmetry
+from VOID.structure.environment import get_host_environment
 from VOID.object import ParseableObject
+from VOID.utils.geometry import ORIENTATION_SAMPLERS
 
 
 ATTEMPTS = 50
+BATCH_SIZE = 256
+WORKERS = 1
+SEED = None
+ORIENTATION_SAMPLER = "uniform"
+SYMMETRIZE = False
+EXPAND_POSES = False
+CROP_RADIUS = None
+
+
+_WORKER_DOCKER = None
+
+
+def _init_worker(docker):
+    global _WORKER_DOCKER
+    _WORKER_DOCKER = docker
+
+
+def _dock_at_point(point, attempts, rng):
+    return _WORKER_DOCKER.dock_at_point(point, attempts, rng)
 
 
 class Docker(ParseableObject):
@@ -15,11 +38,55 @@ class Docker(ParseableObject):
     PARSER_NAME = "base"
     HELP = "Base docker; does not implement any docking procedure"
 
-    def __init__(self, host, guest, sampler, fitness, **kwargs):
+    def __init__(
+        self,
+        host,
+        guest,
+        sampler,
+        fitness,
+        workers=WORKERS,
+        seed=SEED,
+        orientation_sampler=ORIENTATION_SAMPLER,
+        symmetrize=SYMMETRIZE,
+        symprec=SYMPREC,
+        expand_poses=EXPAND_POSES,
+        crop_radius=CROP_RADIUS,
+        **kwargs,
+    ):
+        """
+        Args:
+            host (Structure)
+            guest (Molecule)
+            sampler (Sampler): gives the points where the guest is docked
+            fitness (Fitness): scores the poses
+            workers (int): number of processes among which the
+                docking points are distributed
+            seed (int): seed for the random orientations. Each docking
+                point has its own random stream, so results do not
+                depend on the number of workers.
+            orientation_sampler (str): how the orientations of the guest
+                are generated (see `VOID.utils.geometry.ORIENTATION_SAMPLERS`)
+            symmetrize (bool): if True, only dock at points which are not
+                equivalent by the symmetry of the host. Each of them gets
+                the attempts of all points it represents.
+            symprec (float): tolerance (in Å) of the symmetry analysis
+            expand_poses (bool): if True, poses found at the symmetry-distinct
+                points are mapped back to all equivalent points
+            crop_radius (float): if given, poses are scored using only the
+                host atoms within this distance (plus the extent of the
+                guest) of the docking point, whenever the fitness allows it
+        """
         self.host = host
         self.guest = guest
         self.sampler = sampler
         self.fitness = fitness
+        self.workers = workers
+        self.seed = seed
+        self.orientation_sampler = orientation_sampler
+        self.symmetrize = symmetrize
+        self.symprec = symprec
+        self.expand_poses = expand_poses
+        self.crop_radius = crop_radius
 
     @staticmethod
     def add_arguments(parser):
@@ -29,10 +96,63 @@ class Docker(ParseableObject):
             help="maximum number of attempts to dock (default: %(default)s)",
             default=ATTEMPTS,
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="number of processes used to dock at different points (default: %(default)s)",
+            default=WORKERS,
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="seed for the random orientations of the guest (default: %(default)s)",
+            default=SEED,
+        )
+        parser.add_argument(
+            "--orientation_sampler",
+            type=str,
+            choices=list(ORIENTATION_SAMPLERS.keys()),
+            help="method to generate the orientations of the guest (default: %(default)s)",
+            default=ORIENTATION_SAMPLER,
+        )
+        parser.add_argument(
+            "--symmetrize",
+            help="if set, only dock at points which are symmetry-distinct in the host, giving each of them the attempts of its equivalent points (default: %(default)s)",
+            default=SYMMETRIZE,
+            action="store_true",
+        )
+        parser.add_argument(
+            "--symprec",
+            type=float,
+            help="tolerance (in Å) used to find symmetry-equivalent points (default: %(default)s)",
+            default=SYMPREC,
+        )
+        parser.add_argument(
+            "--expand_poses",
+            help="if set with --symmetrize, map the docked poses to all equivalent points (default: %(default)s)",
+            default=EXPAND_POSES,
+            action="store_true",
+        )
+        parser.add_argument(
+            "--crop_radius",
+            type=float,
+            help="if given, score the poses using only the host atoms within this distance of the guest (default: %(default)s)",
+            default=CROP_RADIUS,
+        )
 
     def copy(self):
         return self.__class__(
-            self.host.copy(), self.guest.copy(), self.sampler, self.fitness
+            self.host.copy(),
+            self.guest.copy(),
+            self.sampler,
+            self.fitness,
+            workers=self.workers,
+            seed=self.seed,
+            orientation_sampler=self.orientation_sampler,
+            symmetrize=self.symmetrize,
+            symprec=self.symprec,
+            expand_poses=self.expand_poses,
+            crop_radius=self.crop_radius,
         )
 
     def new_host(self, newcoords=None):
@@ -55,6 +175,11 @@ class Docker(ParseableObject):
             coords=newcoords,
         )
 
+    def get_rotations(self, size, rng=None):
+        """Returns (size, 3, 3) rotation matrices for the guest"""
+        sampler = ORIENTATION_SAMPLERS[self.orientation_sampler]
+        return sampler(size, rng).reshape(-1, 3, 3)
+
     def create_new_complex(self, host_coords, guest_coords):
         return Complex(
             self.new_host(newcoords=host_coords),
@@ -62,21 +187,201 @@ class Docker(ParseableObject):
             add_transform=False,
         )
 
-    def dock(self, attempts: int) -> List[Complex]:
-        """Docks the guest into the host."""
-        complexes = []
-        for point in self.sampler.get_points(self.host):
-            complexes += self.dock_at_point(point, attempts)
+    def score_batch(self, point, guest_batch):
+        """Scores all guest poses at `point` using the batched fitness.
+            Instead of translating the host by `-point`, the guests are
+            translated by `point`, so the host (and everything cached for
+            it by the fitness) is the same for all points. Falls back to
+            scoring one complex at a time if the fitness does not
+            implement `score_batch`.
+
+        Args:
+            point (np.ndarray): (3, ) docking point
+            guest_batch (np.ndarray): (B, M, 3) Cartesian coordinates of the
+                guests relative to `point`
+
+        Returns:
+            scores (np.ndarray): (B, ) fitness of each pose
+        """
+        if self.crop_radius is not None:
+            try:
+                return self.score_local(point, guest_batch)
+            except NotImplementedError:
+                pass
+
+        lattice = self.host.lattice
+        host_frac = self.host.frac_coords
+        guest_batch = guest_batch + point
+
+        try:
+            return np.concatenate(
+                [
+                    self.fitness.score_batch(
+                        host_frac, guest_batch[i : i + BATCH_SIZE], lattice
+                    )
+                    for i in range(0, len(guest_batch), BATCH_SIZE)
+                ]
+            )
+        except NotImplementedError:
+            return np.array(
+                [
+                    self.fitness(Complex(self.host, self.new_guest(gcoords), add_transform=False))
+                    for gcoords in guest_batch
+                ]
+            )
+
+    def get_environment(self, point):
+        """Returns the host atoms around `point` which can be closer than
+            `crop_radius` to any atom of the guest, whatever its rotation.
+        """
+        extent = np.linalg.norm(self.guest.cart_coords, axis=-1).max()
+
+        return get_host_environment(
+            self.host.frac_coords,
+            self.host.lattice,
+            point,
+            extent + self.crop_radius,
+        )
 
+    def score_local(self, point, guest_batch):
+        """Scores all guest poses at `point` against the cropped host
+            environment. Raises NotImplementedError if the fitness
+            depends on the whole host.
+        """
+        environment = self.get_environment(point)
+
+        return np.concatenate(
+            [
+                self.fitness.score_local(environment, guest_batch[i : i + BATCH_SIZE])
+                for i in range(0, len(guest_batch), BATCH_SIZE)
+            ]
+        )
+
+    def create_pose_record(self, point, rotation, score=None, conformer=None):
+        return PoseRecord(
+            self.host, self.guest, point, rotation, score=score, conformer=conformer
+        )
+
+    def dock(self, attempts: int) -> List[PoseRecord]:
+        """Docks the guest into the host. Returns the poses as
+            `PoseRecord`s; use `materialize` to build their complexes.
+        """
+        self.fitness.prepare(self.host, self.guest)
+
+        points, multiplicity = self.get_weighted_points()
+        rngs = self.get_point_rngs(len(points))
+
+        complexes = self.dock_points(points, attempts * multiplicity, rngs)
         complexes = self.rank_complexes(complexes)
 
+        if self.symmetrize and self.expand_poses:
+            complexes = self.expand_complexes(complexes)
+
         return complexes
 
-    def dock_at_point(self, point, attempts):
+    def get_points(self):
+        """Returns the points given by the sampler. If `symmetrize` is set,
+            points equivalent by symmetry are docked only once.
+        """
+        points, _ = self.get_weighted_points()
+        return points
+
+    def get_weighted_points(self):
+        """Returns the points to dock and the number of sampled points
+            each of them represents. Without `symmetrize`, all points
+            have unit multiplicity.
+
+        Returns:
+            points (list of np.ndarray): docking points
+            multiplicity (np.ndarray): (P, ) number of sampled points
+                equivalent to each docking point
+        """
+        points = list(self.sampler.get_points(self.host, self.guest))
+
+        if not self.symmetrize or len(points) == 0:
+            return points, np.ones(len(points), dtype=int)
+
+        symmetry = get_host_symmetry(self.host, self.symprec)
+        unique, multiplicity = symmetry.reduce_points(points)
+
+        return list(unique), multiplicity
+
+    def expand_complexes(self, complexes):
+        """Maps each pose to its symmetry-equivalent poses. Equivalent
+            poses have the same score and are kept next to each other.
+        """
+        symmetry = get_host_symmetry(self.host, self.symprec)
+
+        expanded = []
+        for cpx in complexes:
+            points, rotations = symmetry.expand_pose(cpx.point, cpx.rotation)
+            expanded += [
+                self.create_pose_record(point, rotation, cpx.score, cpx.conformer)
+                for point, rotation in zip(points, rotations)
+            ]
+
+        return expanded
+
+    def get_point_rngs(self, num_points):
+        """Returns one independent `np.random.Generator` per docking
+            point, spawned from `seed`. Without seed and workers, the
+            global numpy random state is used instead (None).
+        """
+        if self.seed is None and self.workers <= 1:
+            return [None] * num_points
+
+        return [
+            np.random.default_rng(seq)
+            for seq in np.random.SeedSequence(self.seed).spawn(num_points)
+        ]
+
+    def dock_points(self, points, attempts, rngs):
+        """Docks `attempts` times at each point, in parallel if
+            `workers` > 1. `attempts` is either an int or one number of
+            attempts per point. Returns the unranked poses.
+        """
+        attempts = np.broadcast_to(attempts, (len(points),)).astype(int).tolist()
+
+        if self.workers > 1:
+            return self.dock_parallel(points, attempts, rngs)
+
+        complexes = []
+        for point, num_attempts, rng in zip(points, attempts, rngs):
+            complexes += self.dock_at_point(point, num_attempts, rng)
+
+        return complexes
+
+    def dock_parallel(self, points, attempts, rngs):
+        """Docks at each point in a separate process. Poses are returned
+            in the same order as in the serial docking. The docker is sent
+            once to each worker, which keeps its own copy. State updated
+            during docking (e.g. adaptive estimates) is therefore not
+            shared between workers nor returned to this docker, so
+            subclasses should not adapt it when `workers` > 1.
+        """
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            results = executor.map(_dock_at_point, points, attempts, rngs)
+            complexes = [cpx for result in results for cpx in result]
+
+        # poses computed by the workers refer to copies of the host and guest
+        for cpx in complexes:
+            cpx.host, cpx.guest = self.host, self.guest
+
+        return complexes
+
+    def dock_at_point(self, point, attempts, rng=None):
         raise NotImplementedError
 
+    def get_score(self, cpx):
+        if isinstance(cpx, PoseRecord) and cpx.score is not None:
+            return cpx.score
+
+        return self.fitness(materialize(cpx))
+
     def rank_complexes(self, complexes):
-        scores = [self.fitness(cpx) for cpx in complexes]
+        scores = [self.get_score(cpx) for cpx in complexes]
         ranking = sorted(zip(complexes, scores), key=lambda x: x[1], reverse=True)
 
         return [cpx for cpx, fit in ranking if fit >= 0]
@@ -1,40 +1,112 @@
 import numpy as np
 
 from .base import Docker
-from VOID.structure import Complex
-from VOID.utils.geometry import random_rotation_matrices
+from VOID.structure.topology import NUM_TWISTS, get_guest_topology
+
+
+CONFORMERS = 1
 
 
 class BatchDocker(Docker):
     PARSER_NAME = "batch"
     HELP = "Docks guests to host by using batched (tensorial) operations"
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, conformers=CONFORMERS, num_twists=NUM_TWISTS, **kwargs):
+        """
+        Args:
+            conformers (int): number of conformers of the guest docked at
+                each point, including the original one. Conformers are
+                obtained by twisting the rotatable bonds of the guest.
+                If 1, the guest is rigid.
+            num_twists (int): number of bonds twisted in each conformer
+        """
         super().__init__(*args, **kwargs)
+        self.conformers = conformers
+        self.num_twists = num_twists
+
+    @staticmethod
+    def add_arguments(parser):
+        Docker.add_arguments(parser)
+        parser.add_argument(
+            "--conformers",
+            type=int,
+            help="number of conformers of a flexible guest docked at each point; 1 keeps the guest rigid (default: %(default)s)",
+            default=CONFORMERS,
+        )
+        parser.add_argument(
+            "--num_twists",
+            type=int,
+            help="number of bonds twisted in each conformer (default: %(default)s)",
+            default=NUM_TWISTS,
+        )
+
+    def copy(self):
+        docker = super().copy()
+        docker.conformers = self.conformers
+        docker.num_twists = self.num_twists
+        return docker
+
+    def get_conformers(self, rng=None):
+        """Returns (K, M, 3) conformers of the guest. The first one is
+            the guest itself.
+        """
+        coords = self.guest.cart_coords
+        if self.conformers <= 1:
+            return coords[None]
+
+        torsions = get_guest_topology(self.guest).torsions
+        return torsions.sample_conformers(coords, self.conformers, rng, self.num_twists)
 
-    def rotate_guest(self, attempts):
+    def rotate_guest(self, attempts, rotation=None):
         # (N, num_atoms, 3) matrix
         coords = np.repeat(self.guest.cart_coords[None, ...], attempts, axis=0)
 
         # (N, 3, 3) matrix
-        rotation = random_rotation_matrices(attempts)
+        if rotation is None:
+            rotation = self.get_rotations(attempts)
 
         # (N, num_atoms, 3) matrix
         return np.matmul(coords, rotation.swapaxes(-1, -2))
 
-    def translate_host(self, point, attempts):
-        translated = self.host.cart_coords - point
+    def dock_at_point(self, point, attempts, rng=None, rotation=None):
+        """Docks the guest at `point`. If `rotation` is not given,
+            `attempts` orientations are drawn with the orientation sampler.
+        """
+        if rotation is None:
+            rotation = self.get_rotations(attempts, rng)
 
-        return np.repeat(translated[None, ...], attempts, axis=0)
+        if self.conformers > 1:
+            return self.dock_conformers(point, rotation, rng)
 
-    def dock_at_point(self, point, attempts):
-        host_batch = self.translate_host(point, attempts)
-        guest_batch = self.rotate_guest(attempts)
+        guest_batch = self.rotate_guest(attempts, rotation)
+
+        # all attempts are scored at once; only the poses which
+        # survive the ranking are kept as records
+        scores = self.score_batch(point, guest_batch)
 
         complexes = [
-            self.create_new_complex(hcoords, gcoords)
-            for hcoords, gcoords in zip(host_batch, guest_batch)
+            self.create_pose_record(point, rotation[i], scores[i])
+            for i in np.flatnonzero(scores >= 0)
         ]
 
         return complexes
 
+    def dock_conformers(self, point, rotation, rng=None):
+        """Docks each of the K conformers of the guest with each of
+            the R rotations, scoring the (K * R) poses at once.
+        """
+        conformers = self.get_conformers(rng)
+
+        # (K, R, num_atoms, 3) matrix
+        guest_batch = np.matmul(conformers[:, None], rotation.swapaxes(-1, -2)[None])
+        scores = self.score_batch(point, guest_batch.reshape(-1, *conformers.shape[1:]))
+
+        complexes = []
+        for i in np.flatnonzero(scores >= 0):
+            k, r = divmod(i, len(rotation))
+            conformer = conformers[k] if k > 0 else None
+            complexes.append(
+                self.create_pose_record(point, rotation[r], scores[i], conformer)
+            )
+
+        return complexes
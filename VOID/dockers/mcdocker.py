@@ -1,42 +1,248 @@
 import numpy as np
 
-from VOID.structure import Complex
+from VOID.structure import Complex, RigidPose, WalkerPoses
 from VOID.mcarlo import Metropolis, Action
 from VOID.dockers import Docker
+from VOID.dockers.base import BATCH_SIZE
+from VOID.mcarlo.mcmc import BURN_IN, TARGET_ACCEPTANCE
+from VOID.utils.geometry import (
+    rotation_matrix,
+    axis_angle_matrices,
+    uniform_rotation_matrices,
+)
+
+
+WALKERS = 1
+TRANSLATION_STEP = 1.0
+ROTATION_STEP = 2 * np.pi
 
 
 class MonteCarloDocker(Metropolis, Docker):
     PARSER_NAME = "mcdocker"
     HELP = "Repeats actions such as docking, translating and rotating the molecule until the metric is improved"
 
-    def __init__(self, host, guest, *args, **kwargs):
+    MAX_STEP_SIZES = {"rotate": 2 * np.pi}
+
+    def __init__(
+        self,
+        host,
+        guest,
+        *args,
+        walkers=WALKERS,
+        translation_step=TRANSLATION_STEP,
+        rotation_step=ROTATION_STEP,
+        **kwargs,
+    ):
+        """
+        Args:
+            host (Structure)
+            guest (Molecule)
+            walkers (int): number of independent chains. If larger than
+                one, all chains are advanced at once with array operations.
+            translation_step (float): standard deviation (in Å) of the
+                translations of the guest
+            rotation_step (float): maximum angle (in radians) of the
+                rotations of the guest
+        """
         super().__init__(*args, **kwargs)
         self.host = host
         self.guest = guest
+        self.walkers = walkers
+        self.translation_step = translation_step
+        self.rotation_step = rotation_step
+
+        self.step_sizes = {"translate": translation_step, "rotate": rotation_step}
+
+    @staticmethod
+    def add_arguments(parser):
+        Metropolis.add_arguments(parser)
+        MonteCarloDocker.add_move_arguments(parser)
+
+    @staticmethod
+    def add_move_arguments(parser):
+        parser.add_argument(
+            "--walkers",
+            type=int,
+            help="number of Monte Carlo chains advanced together (default: %(default)s)",
+            default=WALKERS,
+        )
+        parser.add_argument(
+            "--translation_step",
+            type=float,
+            help="standard deviation (in Å) of the translations of the guest (default: %(default)s)",
+            default=TRANSLATION_STEP,
+        )
+        parser.add_argument(
+            "--rotation_step",
+            type=float,
+            help="maximum angle (in radians) of the rotations of the guest (default: %(default)s)",
+            default=ROTATION_STEP,
+        )
+        parser.add_argument(
+            "--burn_in",
+            type=int,
+            help="number of steps during which the step sizes are tuned (default: %(default)s)",
+            default=BURN_IN,
+        )
+        parser.add_argument(
+            "--target_acceptance",
+            type=float,
+            help="acceptance rate targeted when tuning the step sizes (default: %(default)s)",
+            default=TARGET_ACCEPTANCE,
+        )
+        parser.add_argument(
+            "--action_weights",
+            type=str,
+            nargs="+",
+            help="relative probability of the moves, e.g. translate=2 rotate=1 (default: %(default)s)",
+            default=None,
+        )
 
     @Action
-    def translate(self, cpx):
-        cpx.guest_transform.translate()
-        return cpx
+    def translate(self, pose):
+        pose.translate(np.random.randn(3) * self.step_sizes["translate"])
+        return pose
 
     @Action
-    def rotate(self, cpx):
-        cpx.guest_transform.rotate()
-        return cpx
+    def rotate(self, pose):
+        axis = np.random.randn(3)
+        # the axis is isotropic, so angles in [0, step) cover both directions
+        theta = self.step_sizes["rotate"] * np.random.uniform()
+        pose.rotate(rotation_matrix(axis, theta))
+        return pose
+
+    def propose(self, pose):
+        # moves are applied in place and reverted by `undo` if rejected
+        pose.save()
+        return pose
+
+    def undo(self, new, old):
+        new.undo()
+        return new
+
+    def evaluate(self, pose):
+        """Scores the pose with the batched fitness, falling back to
+            scoring a complex if the fitness does not implement it.
+        """
+        try:
+            return self.fitness.score_batch(
+                pose.host_frac, pose.coords[None], pose.host.lattice
+            )[0]
+        except NotImplementedError:
+            return self.fitness(pose.to_complex())
+
+    def evaluate_walkers(self, poses):
+        """Returns the (W, ) fitness of all walkers"""
+        try:
+            return np.concatenate(
+                [
+                    self.fitness.score_batch(
+                        poses.host_frac, poses.coords[i : i + BATCH_SIZE], poses.host.lattice
+                    )
+                    for i in range(0, poses.num_walkers, BATCH_SIZE)
+                ]
+            )
+        except NotImplementedError:
+            return np.array([self.fitness(cpx) for cpx in poses.to_complexes()])
+
+    def propose_walkers(self, poses):
+        """Either translates or rotates each walker, as `translate`
+            and `rotate` do for a single chain. Returns a boolean array
+            with the walkers which were rotated.
+        """
+        poses.save()
+        num_walkers = poses.num_walkers
+
+        if self.action_weights is None:
+            rotate = np.random.randint(2, size=num_walkers).astype(bool)
+        else:
+            weights = [self.action_weights.get(name, 1.0) for name in ["translate", "rotate"]]
+            rotate = np.random.uniform(size=num_walkers) < weights[1] / sum(weights)
+
+        translations = np.random.randn(num_walkers, 3) * self.step_sizes["translate"]
+        translations[rotate] = 0
+        poses.translate(translations)
+
+        if self.step_sizes["rotate"] >= 2 * np.pi:
+            rotations = uniform_rotation_matrices(num_walkers)
+        else:
+            thetas = self.step_sizes["rotate"] * np.random.uniform(size=num_walkers)
+            rotations = axis_angle_matrices(np.random.randn(num_walkers, 3), thetas)
+
+        rotations[~rotate] = np.eye(3)
+        poses.rotate(rotations)
+
+        return rotate
+
+    def step_walkers(self, poses, fitness, restart=False):
+        """Performs one Metropolis step on all walkers. Returns the
+            fitness of the walkers after the step. If `restart` is set,
+            each proposal also moves its walker to a random translation.
+        """
+        rotate = self.propose_walkers(poses)
+        if restart:
+            self.randomize_walkers(poses)
+
+        new_fitness = self.evaluate_walkers(poses)
+
+        accepted = self.accept_batch(new_fitness, fitness)
+        poses.undo(~accepted)
+
+        self.record_action("rotate", rotate.sum(), (accepted & rotate).sum())
+        self.record_action("translate", (~rotate).sum(), (accepted & ~rotate).sum())
+        self.on_statistics_update()
+
+        return np.where(accepted, new_fitness, fitness)
+
+    def run_walkers(self, poses, num_steps):
+        self.randomize_walkers(poses)
+        fitness = self.evaluate_walkers(poses)
+
+        for step in range(num_steps):
+            fitness = self.step_walkers(poses, fitness)
+            self.on_trial_end(step)
+
+        return fitness
+
+    def randomize_walkers(self, poses):
+        """Translates each walker by a random vector of the unit cell"""
+        v = np.random.rand(poses.num_walkers, 3)
+        poses.translate(v @ poses.host.lattice.matrix)
 
     def dock(self, attempts):
-        cpx = Complex(self.host.copy(), self.guest.copy())
-        cpx = self.run(cpx, attempts)
+        self.fitness.prepare(self.host, self.guest)
+
+        if self.walkers > 1:
+            poses = WalkerPoses(self.host, self.guest, self.walkers)
+            self.run_walkers(poses, attempts)
+            return self.rank_complexes(poses.to_complexes())
+
+        cpx = self.run(RigidPose(self.host, self.guest), attempts)
 
         return self.rank_complexes([cpx])
 
     def copy(self):
         return self.__class__(**self.__dict__.copy())
 
-    def on_start(self, cpx):
+    def get_pose(self, obj):
+        if isinstance(obj, Complex):
+            return RigidPose.from_complex(obj)
+
+        return obj
+
+    def on_start(self, obj):
+        pose = self.get_pose(super().on_start(obj))
+        self.randomize(pose)
+        return pose
+
+    def randomize(self, pose):
+        """Translates the pose by a random vector of the unit cell"""
         v = np.random.rand(1, 3)
-        lattice = cpx.host.lattice.matrix
+        lattice = pose.host.lattice.matrix
         translation = (v @ lattice).reshape(-1)
 
-        cpx.guest_transform.translate(translation)
-        return cpx
+        pose.translate(translation)
+        return pose
+
+    def on_end(self, pose):
+        return pose.to_complex()
@@ -1,8 +1,6 @@
 import numpy as np
 
 from .base import Docker
-from VOID.structure import Complex
-from VOID.utils.geometry import random_rotation_matrices
 
 
 class SerialDocker(Docker):
@@ -12,25 +10,30 @@ class SerialDocker(Docker):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    def rotate_guest(self):
+    def rotate_guest(self, rotation=None):
         coords = self.guest.cart_coords
-        rotation = random_rotation_matrices(1)
+        if rotation is None:
+            rotation = self.get_rotations(1)[0]
 
-        return np.matmul(coords, rotation)
+        return np.matmul(coords, rotation.T)
 
     def translate_host(self, point):
         return self.host.cart_coords - point
 
-    def dock_at_point(self, point, attempts):
-        hcoords = self.translate_host(point)
+    def dock_attempt(self, point, rotation=None, rng=None):
+        if rotation is None:
+            rotation = self.get_rotations(1, rng)[0]
 
-        complexes = [
-            Complex(
-                self.new_host(newcoords=hcoords),
-                self.new_guest(newcoords=self.rotate_guest())
-            )
-            for _ in range(attempts)
-        ]
+        gcoords = self.rotate_guest(rotation)
+        score = self.score_batch(point, gcoords[None, ...])[0]
+
+        return self.create_pose_record(point, rotation, score)
+
+    def dock_at_point(self, point, attempts, rng=None):
+        # orientations are generated together, as quasi-random
+        # orientation sets depend on their size
+        rotations = self.get_rotations(attempts, rng)
+        complexes = [self.dock_attempt(point, rotation) for rotation in rotations]
 
         return complexes
 
@@ -1,6 +1,7 @@
 import numpy as np
 
 from VOID.object import ParseableObject
+from VOID.structure import materialize
 
 
 MAX_SUBDOCK = 1
@@ -48,7 +49,7 @@ class Subdocker(ParseableObject):
 
             for cpx in complexes[: self.max_subdock]:
                 subdocker = self.docker.copy()
-                subdocker.host = cpx.pose
+                subdocker.host = materialize(cpx).pose
                 higher_loading += subdocker.dock(attempts)
 
             complexes = self.docker.rank_complexes(higher_loading)
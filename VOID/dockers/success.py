@@ -3,48 +3,161 @@ import numpy as np
 from pymatgen.core.sites import Site
 from pymatgen.core import Lattice, Structure
 
-from VOID.structure import Complex
+from VOID.structure import RigidPose, WalkerPoses
+from VOID.structure.complex import HOST_LABEL
+from VOID.dockers.base import Docker, BATCH_SIZE
 from VOID.dockers.serial import SerialDocker
 from VOID.dockers.mcdocker import MonteCarloDocker
 
 
+BLOCK_SIZE = 16
+
+
 class SuccessDocker(SerialDocker):
     PARSER_NAME = "success"
     HELP = "Docks guests to host until a successful docking is found"
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, block_size=BLOCK_SIZE, **kwargs):
+        """
+        Args:
+            block_size (int): initial number of rotations scored at once.
+                The block adapts to the success rate observed so far,
+                unless the points are docked by several workers, which
+                do not share their success rates. If 1, the attempts are
+                scored one at a time.
+        """
         super().__init__(*args, **kwargs)
+        self.block_size = block_size
+        self.num_trials = 0
+        self.num_successes = 0
+
+    @staticmethod
+    def add_arguments(parser):
+        Docker.add_arguments(parser)
+        parser.add_argument(
+            "--block_size",
+            type=int,
+            help="initial number of rotations tested at once; only adapted when docking with a single worker (default: %(default)s)",
+            default=BLOCK_SIZE,
+        )
 
-    def dock_at_point(self, point, attempts):
-        hcoords = self.translate_host(point)
+    def copy(self):
+        docker = super().copy()
+        docker.block_size = self.block_size
+        return docker
 
-        for trial in range(attempts):
-            cpx = self.create_new_complex(host_coords=hcoords, guest_coords=self.rotate_guest())
+    def get_block_size(self):
+        """Number of rotations expected to contain a success, estimated
+            from the success rate of the previous points.
+        """
+        if self.num_trials == 0 or self.workers > 1:
+            return self.block_size
+
+        rate = (self.num_successes + 1) / (self.num_trials + 2)
+        return int(np.clip(np.ceil(1 / rate), self.block_size, BATCH_SIZE))
+
+    def dock_at_point(self, point, attempts, rng=None):
+        if self.block_size <= 1:
+            return self.dock_serial(point, attempts, rng)
+
+        rotations = self.get_rotations(attempts, rng)
+
+        block_size = self.get_block_size()
+        trial = 0
+        while trial < attempts:
+            rotation = rotations[trial : trial + block_size]
+            guest_batch = np.matmul(self.guest.cart_coords, rotation.swapaxes(-1, -2))
+
+            scores = self.score_batch(point, guest_batch)
+            success = np.flatnonzero(scores >= 0)
+
+            if len(success) > 0:
+                # first success in trial order
+                idx = success[0]
+                self.update_success_rate(trial + idx + 1, True)
+                print(f"{trial + idx + 1} attempts to success")
+                return [self.create_pose_record(point, rotation[idx], scores[idx])]
+
+            trial += len(rotation)
+            block_size = min(2 * block_size, BATCH_SIZE)
+
+        self.update_success_rate(trial, False)
+        return []
+
+    def dock_serial(self, point, attempts, rng=None):
+        rotations = self.get_rotations(attempts, rng)
 
-            if self.fitness(cpx) >= 0:
+        for trial, rotation in enumerate(rotations):
+            pose = self.dock_attempt(point, rotation)
+
+            if pose.score >= 0:
+                self.update_success_rate(trial + 1, True)
                 print(f"{trial + 1} attempts to success")
-                return [cpx]
+                return [pose]
 
+        self.update_success_rate(attempts, False)
         return []
 
+    def update_success_rate(self, trials, success):
+        self.num_trials += trials
+        self.num_successes += int(success)
+
 
 class SuccessMonteCarloDocker(MonteCarloDocker):
     PARSER_NAME = "mcsuccess"
     HELP = "Docks guests to host until a successful docking is found (Monte Carlo version)"
 
     def dock(self, attempts):
-        cpx = Complex(self.host.copy(), self.guest.copy())
+        """Each attempt places the guest at a random translation and
+            applies one Monte Carlo move to it. The random translation is
+            part of the proposal, so a rejected attempt goes back to the
+            previous state, whose fitness is kept in `current_fitness`.
+            Only the proposed pose is scored at each attempt (plus the
+            starting pose once).
+        """
+        self.fitness.prepare(self.host, self.guest)
+
+        if self.walkers > 1:
+            return self.dock_walkers(attempts)
+
+        pose = self.on_start(RigidPose(self.host, self.guest))
 
         for trial in range(attempts):
-            cpx = self.run(cpx, 1)
+            pose = self.trial(pose)
+            self.on_trial_end(0)
 
-            if self.fitness(cpx) >= 0:
+            # the fitness of the last state is kept by `accept`
+            if self.current_fitness >= 0:
                 print(f"{trial + 1} attempts to success")
-                cpx = self.rescale(cpx)
+                cpx = self.rescale(self.on_end(pose))
                 return [cpx]
 
         return []
 
+    def propose(self, pose):
+        # the random restart of each attempt is part of the proposal
+        return self.randomize(super().propose(pose))
+
+    def dock_walkers(self, attempts):
+        """Vectorized `dock`. Each walker makes one attempt per step, so
+            the attempts are shared among the walkers. Stops as soon as
+            any walker succeeds.
+        """
+        poses = WalkerPoses(self.host, self.guest, self.walkers)
+        self.randomize_walkers(poses)
+        fitness = self.evaluate_walkers(poses)
+
+        for step in range(int(np.ceil(attempts / self.walkers))):
+            fitness = self.step_walkers(poses, fitness, restart=True)
+            self.on_trial_end(0)
+
+            success = np.flatnonzero(fitness >= 0)
+            if len(success) > 0:
+                print(f"{step * self.walkers + success[0] + 1} attempts to success")
+                return [self.rescale(poses.to_complex(success[0]))]
+
+        return []
+
     def rescale(self, cpx):
         """Rescale the complex to the 0-1 range so results can be visualized in direct and xyz format.
 
@@ -55,40 +168,26 @@ class SuccessMonteCarloDocker(MonteCarloDocker):
             Complex: The rescaled host-guest complex object.
         """
         complex = cpx.copy()
-        lattice = complex.pose.lattice
-        frac_coords = []
-        species_list = []
-        site_labels = []
-
-        for site in complex.pose:
-            site_labels.append(site.label)
-            species_list.append(site.species)
-            coords = site.frac_coords if site.label == "host" else np.mod(site.frac_coords, 1.0)
-            frac_coords.append(coords)
-
-        site_properties = {"label": site_labels}
-
-        updated_structure = Structure(lattice, species_list, frac_coords, site_properties=site_properties)
-
+        lattice = complex.host.lattice
         num_host_atoms = len(complex.host)
 
-        species = updated_structure.species
-        cart_coords = updated_structure.cart_coords
+        # only the sites which are not labelled as host are wrapped
+        frac_coords = complex.frac_coords
+        wrap = complex.labels != HOST_LABEL
+        frac_coords[wrap] = np.mod(frac_coords[wrap], 1.0)
 
         # Update the host and guest with the rescaled 0-1 species and coordinates
         complex.host = Structure(
-            lattice=complex.host.lattice,
-            species=species[:num_host_atoms],
-            coords=cart_coords[:num_host_atoms],
-            coords_are_cartesian=True,
+            lattice=lattice,
+            species=complex.host.species,
+            coords=frac_coords[:num_host_atoms],
             site_properties=complex.host.site_properties,
         )
 
         complex.guest = Structure(
-            lattice=complex.host.lattice,
-            species=species[num_host_atoms:],
-            coords=cart_coords[num_host_atoms:],
-            coords_are_cartesian=True,
+            lattice=lattice,
+            species=complex.guest.species,
+            coords=frac_coords[num_host_atoms:],
             site_properties=complex.guest.site_properties,
         )
 
@@ -0,0 +1,72 @@
+import numpy as np
+
+from VOID.structure import WalkerPoses
+from VOID.mcarlo import ParallelTempering
+from VOID.dockers.mcdocker import MonteCarloDocker
+from VOID.dockers.success import SuccessMonteCarloDocker
+
+
+class TemperingDocker(ParallelTempering, SuccessMonteCarloDocker):
+    PARSER_NAME = "mctempering"
+    HELP = "Docks guests to host until a successful docking is found, exchanging poses between Monte Carlo chains at a fixed ladder of temperatures. All replicas run as vectorized walkers of a single process; temperature profiles are not supported"
+
+    def __init__(self, *args, **kwargs):
+        """Parallel tempering version of the `SuccessMonteCarloDocker`.
+            Each of the `walkers` independent ladders holds one replica per
+            temperature, and all replicas are advanced at once as walkers
+            in the current process (there is no process-parallel replica
+            mode). The temperatures of the ladder are fixed, so a
+            `temperature_profile` is accepted for compatibility but
+            ignored. After `dock`, `swap_acceptance` and `report_swaps`
+            describe the swaps of the last run.
+        """
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def add_arguments(parser):
+        ParallelTempering.add_arguments(parser)
+        SuccessMonteCarloDocker.add_move_arguments(parser)
+
+    def propose(self, pose):
+        # replicas only make local moves, without the random restarts
+        # of the success docker
+        return MonteCarloDocker.propose(self, pose)
+
+    def dock(self, attempts):
+        """Advances all replicas of all ladders at once as walkers.
+            Stops as soon as any replica succeeds.
+        """
+        self.fitness.prepare(self.host, self.guest)
+        self.reset_swaps()
+
+        # each replica runs at its own temperature during the ladder run
+        self.temperature = np.tile(self.temperatures, self.walkers)
+        try:
+            return self.run_ladders(attempts)
+        finally:
+            self.temperature = self.temperatures[0]
+
+    def run_ladders(self, attempts):
+        # replica i of ladder l is the walker l * num_replicas + i
+        poses = WalkerPoses(self.host, self.guest, self.walkers * self.num_replicas)
+        offsets = self.num_replicas * np.arange(self.walkers)[:, None]
+
+        self.randomize_walkers(poses)
+        fitness = self.evaluate_walkers(poses)
+
+        for step in range(attempts):
+            fitness = self.step_walkers(poses, fitness)
+
+            success = np.flatnonzero(fitness >= 0)
+            if len(success) > 0:
+                print(f"{step + 1} steps to success")
+                return [self.rescale(poses.to_complex(success[0]))]
+
+            if self.is_swap_step(step):
+                order = self.get_swaps(fitness.reshape(self.walkers, -1), step)
+                order = (order + offsets).reshape(-1)
+
+                poses.coords[:] = poses.coords[order]
+                fitness = fitness[order]
+
+        return []
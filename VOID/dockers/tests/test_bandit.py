@@ -0,0 +1,82 @@
+import numpy as np
+import unittest as ut
+
+from VOID.dockers import BanditDocker
+from VOID.samplers import RandomSampler
+from VOID.fitness import MinDistanceFitness
+
+from VOID.tests.test_inputs import DockerTestMixin, load_structure, load_molecule
+
+
+class TestBandit(DockerTestMixin, ut.TestCase):
+    docker_class = BanditDocker
+    docker_kwargs = {"seed": 42}
+
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.sampler = RandomSampler(num_samples=4)
+        self.fitness = MinDistanceFitness(threshold=0.5)
+
+    def test_dock(self):
+        for policy in ["ucb", "thompson"]:
+            np.random.seed(0)
+            complexes = self.get_docker(policy=policy).dock(20)
+            self.assertTrue(len(complexes) > 0)
+
+            scores = [cpx.score for cpx in complexes]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertTrue(min(scores) >= 0)
+
+    def test_max_poses(self):
+        np.random.seed(0)
+        complexes = self.get_docker(max_poses=1, round_attempts=1).dock(50)
+
+        # the initial round may already find several poses
+        np.random.seed(0)
+        initial = self.get_docker(max_poses=0).dock(50)
+        self.assertEqual(len(complexes), max(len(initial), 1))
+
+    def test_deterministic_orientations(self):
+        docker = self.get_docker(orientation_sampler="hopf", round_attempts=8)
+        rng = np.random.default_rng(0)
+
+        # later rounds do not repeat the orientations of the grid
+        first = docker.get_round_rotations(8, rng)
+        second = docker.get_round_rotations(8, rng)
+        self.assertFalse(np.allclose(first, second))
+        identity = np.broadcast_to(np.eye(3), first.shape)
+        np.testing.assert_allclose(first @ first.swapaxes(-1, -2), identity, atol=1e-8)
+
+        complexes = docker.dock(40)
+        self.assertEqual(len(docker.remove_duplicates(complexes)), len(complexes))
+
+        duplicated = docker.remove_duplicates(complexes + complexes[:3])
+        self.assertEqual(len(duplicated), len(complexes))
+
+    def test_copy(self):
+        docker = self.get_docker(
+            policy="thompson",
+            initial_attempts=3,
+            round_attempts=5,
+            max_poses=5,
+            time_budget=10.0,
+            conformers=2,
+        ).copy()
+
+        self.assertEqual(docker.policy, "thompson")
+        self.assertEqual(docker.initial_attempts, 3)
+        self.assertEqual(docker.round_attempts, 5)
+        self.assertEqual(docker.max_poses, 5)
+        self.assertEqual(docker.time_budget, 10.0)
+        self.assertEqual(docker.conformers, 2)
+
+    def test_select(self):
+        docker = self.get_docker()
+        trials = np.array([10, 10, 10])
+        successes = np.array([0, 8, 1])
+        self.assertEqual(docker.select_point(trials, successes, np.random), 1)
+
+
+if __name__ == "__main__":
+    ut.main()
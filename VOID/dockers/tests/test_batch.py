@@ -2,8 +2,9 @@ import numpy as np
 import unittest as ut
 
 from VOID.dockers import BatchDocker
-from VOID.samplers import OriginSampler
+from VOID.samplers import OriginSampler, RandomSampler
 from VOID.fitness import MinDistanceFitness
+from VOID.structure.symmetry import get_host_symmetry
 
 from VOID.tests.test_inputs import load_structure, load_molecule
 
@@ -23,10 +24,21 @@ class TestBatch(ut.TestCase):
 
         self.assertEqual(coords.shape, (10, 47, 3))
 
-    def test_translate(self):
+    def test_score_point(self):
         point = np.array([0, 0, 1])
-        coords = self.docker.translate_host(point, 10)
-        self.assertEqual(coords.shape, (10, 72, 3))
+        rotation = self.docker.get_rotations(10)
+        guest_batch = self.docker.rotate_guest(10, rotation)
+
+        # scoring at a point is equivalent to translating the host by -point
+        scores = self.docker.score_batch(point, guest_batch)
+        expected = [
+            self.fitness(self.docker.create_pose_record(point, rot).to_complex())
+            for rot in rotation
+        ]
+        np.testing.assert_allclose(scores, expected)
+
+        complexes = self.docker.dock_at_point(point, 10, rotation=rotation)
+        self.assertEqual(len(complexes), np.sum(scores >= 0))
 
     def test_dock(self):
         complexes = []
@@ -35,11 +47,105 @@ class TestBatch(ut.TestCase):
 
         self.assertIsInstance(complexes, list)
 
-        pose = complexes[0].pose
+        pose = complexes[0].to_complex().pose
         self.assertEqual(len(pose), 119)
 
         self.assertTrue(pose.distance_matrix[:72, 72:].min() > 1.5)
 
+    def test_parallel(self):
+        sampler = RandomSampler(num_samples=3)
+        fitness = MinDistanceFitness(threshold=0.5)
+
+        results = []
+        for workers in [1, 2]:
+            # same sampled points for both runs
+            np.random.seed(0)
+            docker = BatchDocker(
+                self.host, self.guest, sampler, fitness, workers=workers, seed=42
+            )
+            results.append(docker.dock(20))
+
+        serial, parallel = results
+        self.assertTrue(len(serial) > 0)
+        self.assertEqual(len(serial), len(parallel))
+        for cpx1, cpx2 in zip(serial, parallel):
+            self.assertEqual(cpx1.score, cpx2.score)
+            self.assertTrue(np.array_equal(cpx1.rotation, cpx2.rotation))
+            self.assertIs(cpx2.host, self.host)
+
+    def test_symmetrize(self):
+        np.random.seed(0)
+        sampler = RandomSampler(num_samples=2)
+        fitness = MinDistanceFitness(threshold=0.5)
+        docker = BatchDocker(
+            self.host,
+            self.guest,
+            sampler,
+            fitness,
+            seed=42,
+            symmetrize=True,
+            expand_poses=True,
+        )
+        complexes = docker.dock(20)
+        self.assertTrue(len(complexes) > 0)
+
+        scores = [cpx.score for cpx in complexes]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_symmetry_budget(self):
+        rotations, translations = get_host_symmetry(self.host).get_cartesian_operations()
+        point = np.array([1.0, 2.0, 3.0])
+        points = [np.zeros(3), point, rotations[1] @ point + translations[1]]
+
+        docker = BatchDocker(
+            self.host, self.guest, self.sampler, self.fitness, symmetrize=True
+        )
+        docker.sampler.get_points = lambda host, guest: points
+        unique, multiplicity = docker.get_weighted_points()
+
+        # each distinct point gets the attempts of its equivalent points
+        self.assertEqual(len(unique), 2)
+        self.assertEqual(multiplicity.tolist(), [1, 2])
+
+        attempts = []
+        docker.dock_at_point = lambda point, num, rng=None: attempts.append(num) or []
+        docker.dock(10)
+        self.assertEqual(attempts, (10 * multiplicity).tolist())
+
+    def test_conformers(self):
+        np.random.seed(0)
+        guest = load_molecule("DEB+.xyz")
+        guest = guest.get_centered_molecule()
+        docker = BatchDocker(
+            self.host,
+            guest,
+            RandomSampler(num_samples=2),
+            MinDistanceFitness(threshold=0.5),
+            seed=42,
+            conformers=4,
+        )
+        complexes = docker.dock(10)
+        self.assertTrue(len(complexes) > 0)
+
+        flexible = [cpx for cpx in complexes if cpx.conformer is not None]
+        self.assertTrue(len(flexible) > 0)
+
+        cpx = flexible[0].to_complex()
+        np.testing.assert_allclose(
+            cpx.guest.cart_coords, flexible[0].conformer @ flexible[0].rotation.T
+        )
+
+    def test_crop(self):
+        point = self.host.lattice.get_cartesian_coords([0.3, 0.6, 0.5])
+        guest_batch = self.docker.rotate_guest(10)
+
+        full = self.docker.score_batch(point, guest_batch)
+
+        self.docker.crop_radius = 2.0
+        cropped = self.docker.score_batch(point, guest_batch)
+
+        np.testing.assert_allclose(cropped, full)
+
 
 if __name__ == "__main__":
     ut.main()
@@ -1,8 +1,9 @@
+import random
 import numpy as np
 import unittest as ut
 
 from VOID.structure import Complex
-from VOID.dockers import MonteCarloDocker
+from VOID.dockers import MonteCarloDocker, SuccessMonteCarloDocker
 from VOID.samplers import OriginSampler
 from VOID.fitness import MinDistanceFitness
 
@@ -11,6 +12,8 @@ from VOID.tests.test_inputs import load_structure, load_molecule
 
 class TestMCDocker(ut.TestCase):
     def setUp(self):
+        # actions are sampled with the `random` module
+        random.seed(1)
         self.host = load_structure()
         self.guest = load_molecule()
         self.complex = Complex(self.host, self.guest)
@@ -25,12 +28,12 @@ class TestMCDocker(ut.TestCase):
         )
 
     def test_run(self):
-        np.random.seed(28)
+        np.random.seed(1)
         cpx = self.mcdocker.run(self.complex.copy(), self.num_steps)
         self.assertTrue(cpx.distance_matrix.min() > 1.5)
 
     def test_dock(self):
-        np.random.seed(7)
+        np.random.seed(1)
         cpxs = self.mcdocker.dock(self.num_steps)
         self.assertIsInstance(cpxs, list)
         self.assertIsInstance(cpxs[0], Complex)
@@ -42,6 +45,59 @@ class TestMCDocker(ut.TestCase):
         self.assertEqual(newdocker.host, self.mcdocker.host)
         self.assertEqual(newdocker.guest, self.mcdocker.guest)
 
+    def test_adaptive_steps(self):
+        np.random.seed(7)
+        docker = MonteCarloDocker(
+            self.host, self.guest,
+            fitness=self.fitness, temperature=self.temperature, burn_in=100
+        )
+        docker.run(self.complex.copy(), self.num_steps)
+
+        # most large translations are rejected, so the steps become smaller
+        self.assertLess(docker.step_sizes["translate"], 1.0)
+        self.assertLessEqual(docker.step_sizes["rotate"], 2 * np.pi)
+        self.assertEqual(set(docker.acceptance_rates()), {"translate", "rotate"})
+
+    def test_walkers(self):
+        np.random.seed(7)
+        docker = MonteCarloDocker(
+            self.host, self.guest,
+            fitness=self.fitness, temperature=self.temperature, walkers=8
+        )
+        cpxs = docker.dock(50)
+
+        self.assertTrue(0 < len(cpxs) <= 8)
+        for cpx in cpxs:
+            self.assertTrue(cpx.distance_matrix.min() > 1.5)
+
+    def test_success_walkers(self):
+        np.random.seed(7)
+        docker = SuccessMonteCarloDocker(
+            self.host, self.guest,
+            fitness=self.fitness, temperature=self.temperature, walkers=16
+        )
+        cpxs = docker.dock(4 * self.num_steps)
+
+        self.assertEqual(len(cpxs), 1)
+        self.assertTrue(self.fitness(cpxs[0]) >= 0)
+
+    def test_success_evaluations(self):
+        calls = []
+
+        def counting_fitness(obj):
+            calls.append(obj)
+            return -1.0
+
+        docker = SuccessMonteCarloDocker(
+            self.host, self.guest,
+            fitness=MinDistanceFitness(threshold=1.5), temperature=self.temperature
+        )
+        docker.evaluate = counting_fitness
+        self.assertEqual(docker.dock(20), [])
+
+        # the starting pose plus one proposal per attempt
+        self.assertEqual(len(calls), 21)
+
 
 if __name__ == "__main__":
     ut.main()
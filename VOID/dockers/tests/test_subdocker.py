@@ -1,7 +1,7 @@
 import numpy as np
 import unittest as ut
 
-from VOID.structure import Complex
+from VOID.structure import PoseRecord
 from VOID.dockers import BatchDocker, Subdocker
 from VOID.samplers import OriginSampler
 from VOID.fitness import MinDistanceFitness
@@ -26,9 +26,9 @@ class TestSubdocker(ut.TestCase):
             complexes = self.subdocker.dock(10)
 
         self.assertIsInstance(complexes, list)
-        self.assertIsInstance(complexes[0], Complex)
+        self.assertIsInstance(complexes[0], PoseRecord)
 
-        pose = complexes[0].pose
+        pose = complexes[0].to_complex().pose
         self.assertEqual(len(pose), 119)
 
         self.assertTrue(pose.distance_matrix[:72, 72:].min() > 1.5)
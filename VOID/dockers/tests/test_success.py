@@ -0,0 +1,70 @@
+import numpy as np
+import unittest as ut
+
+from VOID.dockers import SuccessDocker
+from VOID.samplers import OriginSampler
+from VOID.fitness import MinDistanceFitness
+
+from VOID.tests.test_inputs import DockerTestMixin, load_structure, load_molecule
+
+
+class TestSuccess(DockerTestMixin, ut.TestCase):
+    docker_class = SuccessDocker
+
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.sampler = OriginSampler()
+        self.fitness = MinDistanceFitness(threshold=1.0)
+        self.point = np.array([0, 0, 0])
+
+    def test_block_equals_serial(self):
+        serial = self.get_docker(block_size=1).dock_at_point(
+            self.point, 500, np.random.default_rng(3)
+        )
+        block = self.get_docker(block_size=8).dock_at_point(
+            self.point, 500, np.random.default_rng(3)
+        )
+
+        self.assertEqual(len(serial), 1)
+        self.assertEqual(len(block), 1)
+        self.assertTrue(np.allclose(serial[0].rotation, block[0].rotation))
+        self.assertEqual(serial[0].score, block[0].score)
+
+    def test_adaptive_block(self):
+        docker = self.get_docker(block_size=4)
+        self.assertEqual(docker.get_block_size(), 4)
+
+        docker.update_success_rate(100, True)
+        self.assertTrue(docker.get_block_size() > 4)
+
+        # workers do not share their success rates
+        docker.workers = 2
+        self.assertEqual(docker.get_block_size(), 4)
+
+    def test_parallel(self):
+        points = [np.array([0, 0, 0]), np.array([0, 0, 4.3])]
+        docker = self.get_docker(seed=3, workers=2, block_size=4)
+        rngs = docker.get_point_rngs(len(points))
+        parallel = docker.dock_parallel(points, [50, 50], rngs)
+
+        # the same poses as docking each point with its own generator
+        rngs = docker.get_point_rngs(len(points))
+        serial = [
+            cpx
+            for point, rng in zip(points, rngs)
+            for cpx in docker.dock_at_point(point, 50, rng)
+        ]
+
+        self.assertTrue(len(serial) > 0)
+        self.assertEqual(len(parallel), len(serial))
+        for cpx1, cpx2 in zip(serial, parallel):
+            np.testing.assert_allclose(cpx1.rotation, cpx2.rotation)
+            self.assertIs(cpx2.host, self.host)
+
+    def test_copy(self):
+        self.assertEqual(self.get_docker(block_size=64).copy().block_size, 64)
+
+
+if __name__ == "__main__":
+    ut.main()
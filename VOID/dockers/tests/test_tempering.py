@@ -0,0 +1,61 @@
+import numpy as np
+import unittest as ut
+
+from VOID.structure import Complex
+from VOID.dockers import TemperingDocker
+from VOID.fitness import MinDistanceFitness
+
+from VOID.tests.test_inputs import load_structure, load_molecule
+
+
+class TestTemperingDocker(ut.TestCase):
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.fitness = MinDistanceFitness(threshold=1.5)
+        self.docker = TemperingDocker(
+            self.host,
+            self.guest,
+            fitness=self.fitness,
+            temperatures=[0.1, 0.3, 1.0],
+            swap_interval=5,
+            walkers=4,
+        )
+
+    def test_dock(self):
+        np.random.seed(0)
+        cpxs = self.docker.dock(200)
+
+        self.assertEqual(len(cpxs), 1)
+        self.assertIsInstance(cpxs[0], Complex)
+        self.assertTrue(self.fitness(cpxs[0]) >= 0)
+        self.assertEqual(self.docker.temperature, 0.1)
+
+    def test_restore_temperature(self):
+        def fail(poses):
+            raise RuntimeError
+
+        self.docker.randomize_walkers = fail
+        with self.assertRaises(RuntimeError):
+            self.docker.dock(10)
+
+        self.assertEqual(self.docker.temperature, 0.1)
+
+    def test_swap_report(self):
+        np.random.seed(0)
+        self.docker.dock(20)
+
+        report = self.docker.report_swaps()
+        self.assertEqual(len(report.split(", ")), 2)
+        self.assertTrue(np.all(self.docker.swap_attempts > 0))
+
+    def test_copy(self):
+        newdocker = self.docker.copy()
+
+        np.testing.assert_array_equal(newdocker.temperatures, self.docker.temperatures)
+        self.assertEqual(newdocker.walkers, 4)
+        self.assertEqual(newdocker.swap_interval, 5)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -7,3 +7,39 @@ class Fitness(ParseableObject):
 
     def __call__(self, input_):
         return 0
+
+    def prepare(self, host, guest):
+        """Called by the dockers before docking `guest` into `host`.
+            Useful to precompute data used by `score_batch`.
+        """
+        pass
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        """Scores a batch of guest poses against the same host
+            in a single array operation.
+
+        Args:
+            host_frac (np.ndarray): (N, 3) fractional coordinates of the host
+            guest_batch (np.ndarray): (B, M, 3) Cartesian coordinates of the guests
+            lattice (Lattice): lattice of the host
+
+        Returns:
+            scores (np.ndarray): (B, ) fitness of each pose
+        """
+        raise NotImplementedError
+
+    def score_local(self, environment, guest_batch):
+        """Scores a batch of guest poses using only the host atoms
+            around the docking point (see `VOID.structure.environment`).
+            Fitness functions which depend on the whole host do not
+            implement it, and are scored with `score_batch` instead.
+
+        Args:
+            environment (HostEnvironment): host atoms around the docking point
+            guest_batch (np.ndarray): (B, M, 3) Cartesian coordinates of the
+                guests relative to the docking point
+
+        Returns:
+            scores (np.ndarray): (B, ) fitness of each pose
+        """
+        raise NotImplementedError
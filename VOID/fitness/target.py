@@ -1,16 +1,27 @@
 import numpy as np
 
 from .base import Fitness
+from VOID.utils.geometry import batch_distance_matrix
+from VOID.structure.grid import get_distance_field
 
 
 TARGET = 1.5
 TOLERANCE = 0.2
+GRID_SPACING = None
+GRID_CACHE = None
 
 
 class TargetFitness(Fitness):
     """Fitness function that optimizes a target property"""
 
-    def __init__(self, target=TARGET, tolerance=TOLERANCE, **kwargs):
+    def __init__(
+        self,
+        target=TARGET,
+        tolerance=TOLERANCE,
+        grid_spacing=GRID_SPACING,
+        grid_cache=GRID_CACHE,
+        **kwargs
+    ):
         """
         Args:
             target (float): target value for the property
@@ -18,10 +29,15 @@ class TargetFitness(Fitness):
                 acceptable values for the property. Equivalent
                 to a standard deviation accepted for property
                 variation
+            grid_spacing (float): if given, host-guest minimum distances
+                are interpolated from a precomputed `HostDistanceGrid`
+            grid_cache (str): folder where distance grids are stored
         """
         super().__init__()
         self.target = target
         self.tolerance = tolerance
+        self.grid_spacing = grid_spacing
+        self.grid_cache = grid_cache
 
     @staticmethod
     def add_arguments(parser):
@@ -37,6 +53,24 @@ class TargetFitness(Fitness):
             help="tolerance for property optimization (default: %(default)s)",
             default=TOLERANCE,
         )
+        parser.add_argument(
+            "--grid_spacing",
+            type=float,
+            help="if given, interpolate host-guest distances from a precomputed grid with this spacing (default: %(default)s)",
+            default=GRID_SPACING,
+        )
+        parser.add_argument(
+            "--grid_cache",
+            type=str,
+            help="folder in which precomputed distance grids are stored (default: %(default)s)",
+            default=GRID_CACHE,
+        )
+
+    def get_distance_field(self, host_frac, lattice):
+        return get_distance_field(host_frac, lattice, self.grid_spacing, self.grid_cache)
+
+    def get_batch_distances(self, host_frac, guest_batch, lattice):
+        return batch_distance_matrix(host_frac, guest_batch, lattice)
 
 
 class GaussianTargetFitness(TargetFitness):
@@ -49,7 +83,20 @@ class MinDistanceGaussianTarget(GaussianTargetFitness):
     HELP = "Complexes have higher score if the minimum distance between host and guest is close to the given target"
 
     def __call__(self, complex):
-        return self.metric(complex.distance_matrix.min() - self.target)
+        distance = complex.min_distance(self.grid_spacing, self.grid_cache)
+        return self.metric(distance - self.target)
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        field = self.get_distance_field(host_frac, lattice)
+        distances = field.nearest_distances(guest_batch.reshape(-1, 3))
+        distances = distances.reshape(guest_batch.shape[:2])
+        return self.metric(distances.min(axis=1) - self.target)
+
+    def score_local(self, environment, guest_batch):
+        if self.grid_spacing is not None:
+            raise NotImplementedError
+
+        return self.metric(environment.min_distances(guest_batch) - self.target)
 
 
 class MeanDistanceGaussianTarget(GaussianTargetFitness):
@@ -59,6 +106,10 @@ class MeanDistanceGaussianTarget(GaussianTargetFitness):
     def __call__(self, complex, axis=1):
         return self.metric(complex.distance_matrix.min(axis=axis).mean() - self.target)
 
+    def score_batch(self, host_frac, guest_batch, lattice):
+        distances = self.get_batch_distances(host_frac, guest_batch, lattice)
+        return self.metric(distances.min(axis=2).mean(axis=1) - self.target)
+
 
 class MaxDistanceGaussianTarget(GaussianTargetFitness):
     PARSER_NAME = "max_distance_target"
@@ -66,3 +117,7 @@ class MaxDistanceGaussianTarget(GaussianTargetFitness):
 
     def __call__(self, complex, axis=1):
         return self.metric(complex.distance_matrix.min(axis=axis).max() - self.target)
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        distances = self.get_batch_distances(host_frac, guest_batch, lattice)
+        return self.metric(distances.min(axis=2).max(axis=1) - self.target)
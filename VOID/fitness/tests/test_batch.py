@@ -0,0 +1,74 @@
+import numpy as np
+import unittest as ut
+
+from VOID.fitness import (
+    MinDistanceFitness,
+    MeanDistanceFitness,
+    SumInvDistanceFitness,
+    MinDistanceGaussianTarget,
+    MeanDistanceGaussianTarget,
+    MaxDistanceGaussianTarget,
+    MultipleFitness,
+)
+from VOID.utils.geometry import random_rotation_matrices
+
+from VOID.tests.test_inputs import ComplexTestMixin, load_structure, load_molecule
+
+
+class TestBatchFitness(ComplexTestMixin, ut.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.num_poses = 5
+
+        rotation = random_rotation_matrices(self.num_poses)
+        self.guest_batch = np.matmul(
+            self.guest.cart_coords[None, ...], rotation.swapaxes(-1, -2)
+        )
+        self.host_frac = self.host.frac_coords
+
+    def assert_batch_equal(self, fitness):
+        scores = fitness.score_batch(self.host_frac, self.guest_batch, self.host.lattice)
+        expected = [fitness(self.get_complex(coords)) for coords in self.guest_batch]
+
+        self.assertEqual(scores.shape, (self.num_poses,))
+        np.testing.assert_allclose(scores, expected)
+
+    def test_threshold(self):
+        for structure in ["complex", "host", "guest"]:
+            self.assert_batch_equal(MinDistanceFitness(structure=structure))
+            self.assert_batch_equal(MeanDistanceFitness(structure=structure))
+            self.assert_batch_equal(SumInvDistanceFitness(structure=structure))
+
+    def test_step(self):
+        self.assert_batch_equal(MinDistanceFitness(step=True))
+
+    def test_target(self):
+        self.assert_batch_equal(MinDistanceGaussianTarget(target=2.0, tolerance=0.5))
+        self.assert_batch_equal(MeanDistanceGaussianTarget(target=2.0, tolerance=0.5))
+        self.assert_batch_equal(MaxDistanceGaussianTarget(target=2.0, tolerance=0.5))
+
+    def test_grid(self):
+        exact = MinDistanceFitness().score_batch(
+            self.host_frac, self.guest_batch, self.host.lattice
+        )
+        fitness = MinDistanceFitness(grid_spacing=0.2)
+        self.assert_batch_equal(fitness)
+
+        scores = fitness.score_batch(self.host_frac, self.guest_batch, self.host.lattice)
+        self.assertTrue(np.all(scores <= exact + 1e-8))
+        self.assertTrue((exact - scores).max() < np.sqrt(3) * 0.2)
+
+    def test_multiple(self):
+        fitness = MultipleFitness(
+            [MinDistanceFitness(), MinDistanceGaussianTarget()], weights=[1, 0.5]
+        )
+        self.assert_batch_equal(fitness)
+
+        with self.assertRaises(ValueError):
+            MultipleFitness([])
+
+
+if __name__ == "__main__":
+    ut.main()
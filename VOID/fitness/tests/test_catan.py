@@ -0,0 +1,62 @@
+import numpy as np
+import unittest as ut
+from unittest import mock
+
+from VOID.fitness import MinDistanceCationAnionFitness
+from VOID.structure.topology import get_guest_topology
+from VOID.utils.geometry import random_rotation_matrices
+
+from VOID.tests.test_inputs import ComplexTestMixin, load_structure, load_molecule
+
+
+class TestCationAnionFitness(ComplexTestMixin, ut.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.host = load_structure("UTL_Al.cif")
+        self.guest = load_molecule("DEB+.xyz")
+        self.fitness = MinDistanceCationAnionFitness(threshold=1.2, threshold_catan=6.0)
+
+        num_poses = 40
+        rotation = random_rotation_matrices(num_poses)
+        points = self.host.lattice.get_cartesian_coords(np.random.rand(num_poses, 3))
+        coords = self.guest.cart_coords - self.guest.center_of_mass
+        self.guest_batch = coords[None, ...] @ rotation.swapaxes(-1, -2) + points[:, None, :]
+
+    def test_sites(self):
+        cpx = self.get_complex(self.guest.cart_coords)
+        acid_sites, cation_indexes = self.fitness.get_sites(cpx)
+
+        self.assertEqual(len(acid_sites), 1)
+        self.assertEqual(len(acid_sites[0]), 4)
+        self.assertTrue(all(idx >= len(self.host) for idx in cation_indexes))
+
+    def test_cached_sites(self):
+        cpx = self.get_complex(self.guest_batch[0])
+        self.fitness.get_sites(cpx)
+
+        topology = get_guest_topology(cpx.guest)
+
+        with mock.patch.object(
+            MinDistanceCationAnionFitness, "compute_acid_sites"
+        ) as acid:
+            for coords in self.guest_batch[1:5]:
+                cpx = self.get_complex(coords)
+                self.fitness.get_sites(cpx)
+                self.assertIs(get_guest_topology(cpx.guest), topology)
+
+        acid.assert_not_called()
+
+    def test_batch(self):
+        expected = [self.fitness(self.get_complex(coords)) for coords in self.guest_batch]
+
+        self.fitness.prepare(self.host, self.guest)
+        scores = self.fitness.score_batch(
+            self.host.frac_coords, self.guest_batch, self.host.lattice
+        )
+
+        np.testing.assert_allclose(scores, expected)
+        self.assertTrue(np.isfinite(scores).any())
+
+
+if __name__ == "__main__":
+    ut.main()
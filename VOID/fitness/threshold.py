@@ -1,6 +1,11 @@
 import numpy as np
 import argparse
 from .base import Fitness
+from VOID.utils.geometry import periodic_distances, batch_distance_matrix
+from VOID.structure import Complex
+from VOID.structure.grid import get_distance_field
+from VOID.structure.topology import SCALE_CUTOFF, get_guest_topology
+from VOID.utils.cache import LRUCache, array_key
 from rdkit import Chem
 from rdkit.Chem import AllChem
 from rdkit.Chem import GetPeriodicTable
@@ -13,6 +18,10 @@ STRUCTURE_CHOICES = ["complex", "guest", "host"]
 DEFAULT_STEP = False
 CATION_INDEXES = None
 ACID_SITES = None
+GRID_SPACING = None
+GRID_CACHE = None
+
+_ACID_SITES_CACHE = LRUCache()
 
 
 class ThresholdFitness(Fitness):
@@ -21,6 +30,8 @@ class ThresholdFitness(Fitness):
         threshold=THRESHOLD,
         structure="complex",
         step=False,
+        grid_spacing=GRID_SPACING,
+        grid_cache=GRID_CACHE,
         **kwargs,
     ):
         """Fitness is positive if the minimum distance is above
@@ -30,10 +41,16 @@ class ThresholdFitness(Fitness):
             threshold (float)
             structure (str): defines to which structure the threshold will
                 be applied. Can be either complex, guest or host.
+            grid_spacing (float): if given, host-guest minimum distances are
+                interpolated from a precomputed `HostDistanceGrid` with this
+                spacing instead of being computed exactly.
+            grid_cache (str): folder where distance grids are stored
         """
         super().__init__()
         self.threshold = threshold
         self.step = step
+        self.grid_spacing = grid_spacing
+        self.grid_cache = grid_cache
         self.extra_args = kwargs
 
         if structure not in STRUCTURE_CHOICES:
@@ -55,6 +72,18 @@ class ThresholdFitness(Fitness):
             help="threshold for distance calculations (default: %(default)s)",
             default=DEFAULT_STRUCTURE,
         )
+        parser.add_argument(
+            "--grid_spacing",
+            type=float,
+            help="if given, interpolate host-guest distances from a precomputed grid with this spacing (default: %(default)s)",
+            default=GRID_SPACING,
+        )
+        parser.add_argument(
+            "--grid_cache",
+            type=str,
+            help="folder in which precomputed distance grids are stored (default: %(default)s)",
+            default=GRID_CACHE,
+        )
 
     def get_distances(self, complex):
         if self.structure == "complex":
@@ -71,6 +100,51 @@ class ThresholdFitness(Fitness):
         else:
             raise ValueError("structure type not supported")
 
+    def get_distance_field(self, host_frac, lattice):
+        return get_distance_field(host_frac, lattice, self.grid_spacing, self.grid_cache)
+
+    def get_min_distance(self, complex):
+        """Minimum of `get_distances`. Host-guest distances are obtained
+            from the periodic neighbor search (or the distance grid)
+            instead of the dense matrix. Results are memoized by the complex.
+        """
+        if self.structure == "complex":
+            return complex.min_distance(self.grid_spacing, self.grid_cache)
+
+        return self.get_distances(complex).min()
+
+    def get_batch_min_distances(self, host_frac, guest_batch, lattice):
+        if self.structure == "complex":
+            field = self.get_distance_field(host_frac, lattice)
+            distances = field.nearest_distances(guest_batch.reshape(-1, 3))
+            return distances.reshape(guest_batch.shape[:2]).min(axis=1)
+
+        distances = self.get_batch_distances(host_frac, guest_batch, lattice)
+        return distances.reshape(len(guest_batch), -1).min(axis=1)
+
+    def get_batch_distances(self, host_frac, guest_batch, lattice):
+        """Batched version of `get_distances`. Returns one set of
+            distances per guest pose, stacked along the first axis.
+        """
+        if self.structure == "complex":
+            return batch_distance_matrix(host_frac, guest_batch, lattice)
+
+        elif self.structure == "host":
+            idx = np.triu_indices(len(host_frac), k=1)
+            distances = lattice.get_all_distances(host_frac, host_frac)[idx]
+            return np.broadcast_to(distances, (len(guest_batch), len(distances)))
+
+        elif self.structure == "guest":
+            idx = np.triu_indices(guest_batch.shape[1], k=1)
+            guest_frac = lattice.get_fractional_coords(
+                guest_batch.reshape(-1, 3)
+            ).reshape(guest_batch.shape)
+            distances = periodic_distances(guest_frac, guest_frac, lattice.matrix)
+            return distances[:, idx[0], idx[1]]
+
+        else:
+            raise ValueError("structure type not supported")
+
     def get_cation_anion_distances(self, acid_sites, cation_indexes, distance_matrices):
         """Get the distances between the cation and the anion sites.
 
@@ -95,13 +169,29 @@ class ThresholdFitness(Fitness):
             return 0 if value > 0 else -np.inf
         return value
 
+    def normalize_batch(self, values):
+        if self.step:
+            return np.where(values > 0, 0.0, -np.inf)
+        return values
+
 
 class MinDistanceFitness(ThresholdFitness):
     PARSER_NAME = "min_distance"
     HELP = "Complexes have positive score if the minimum distance between host and guest is above the given threshold"
 
     def __call__(self, complex):
-        return self.normalize(self.get_distances(complex).min() - self.threshold)
+        return self.normalize(self.get_min_distance(complex) - self.threshold)
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        distances = self.get_batch_min_distances(host_frac, guest_batch, lattice)
+        return self.normalize_batch(distances - self.threshold)
+
+    def score_local(self, environment, guest_batch):
+        if self.structure != "complex" or self.grid_spacing is not None:
+            raise NotImplementedError
+
+        distances = environment.min_distances(guest_batch)
+        return self.normalize_batch(distances - self.threshold)
 
 
 class MinDistanceCationAnionFitness(ThresholdFitness):
@@ -121,6 +211,7 @@ class MinDistanceCationAnionFitness(ThresholdFitness):
         self.threshold_catan = threshold_catan
         self.cation_indexes = cation_indexes
         self.acid_sites = acid_sites
+        self._sites = None
 
     @staticmethod
     def add_arguments(parser):
@@ -170,97 +261,51 @@ class MinDistanceCationAnionFitness(ThresholdFitness):
 
 
     @staticmethod
-    def compute_cation_indexes(complex, scale_cutoff=1.2):
+    def compute_cation_indexes(complex, scale_cutoff=SCALE_CUTOFF):
         """
         Identify likely cation atoms in the guest molecule heuristically:
         any atom that has one fewer bond than its typical neutral valence,
-        using distances and covalent radii from pymatgen.
-        
+        using distances and covalent radii. The bonding analysis is shared
+        by all poses of the guest (see `VOID.structure.topology`).
+
         scale_cutoff: float
             Factor to scale the sum of covalent radii to define a bond.
         """
-    
-        NEUTRAL_VALENCES = {
-            "H": 1, "C": 4, "N": 3, "O": 2, "F": 1,
-            "P": 3, "S": 2, "Cl": 1, "Br": 1, "I": 1, "Si": 4,
-        }
-    
-        # Approximate bond orders based on distance ranges (Å)
-        BOND_ORDER_VALUES = {
-            "SINGLE": 1,
-            "DOUBLE": 2,
-            "TRIPLE": 3,
-            "AROMATIC": 1.5,
-        }
-    
-        guest_coords = np.array([site.coords for site in complex.guest])
-        guest_elements = [site.specie.symbol for site in complex.guest]
-        n_atoms = len(guest_coords)
-    
-        # Build connectivity and assign bond orders
-        neighbor_map = {i: [] for i in range(n_atoms)}
-        bond_order_map = {i: [] for i in range(n_atoms)}
-    
-        for i in range(n_atoms):
-            for j in range(i + 1, n_atoms):
-                dist = np.linalg.norm(guest_coords[i] - guest_coords[j])
-                COVALENT_RADII = {
-                    "H": 0.31, "C": 0.76, "N": 0.71, "O": 0.66, "F": 0.57,
-                    "P": 1.07, "S": 1.05, "Cl": 1.02, "Br": 1.20, "I": 1.39, "Si": 1.11,
-                }
-                r1 = COVALENT_RADII.get(guest_elements[i], 0.77)  # default ~C
-                r2 = COVALENT_RADII.get(guest_elements[j], 0.77)
-                cutoff = scale_cutoff * (r1 + r2)
-                if dist <= cutoff:
-                    # Assign bond order based on distance relative to typical covalent radii
-                    if dist >= 1.15 and dist <= 1.25:
-                        order = "TRIPLE"
-                    elif dist >= 1.26 and dist <= 1.34:
-                        order = "DOUBLE"
-                    elif dist >=1.38 and dist <= 1.42:
-                        order = "AROMATIC"
-                    else:
-                        order = "SINGLE"
-
-                    neighbor_map[i].append(j)
-                    neighbor_map[j].append(i)
-                    bond_order_map[i].append(order)
-                    bond_order_map[j].append(order)
-    
-        # Identify undercoordinated atoms (likely cations)
-        cation_indexes = []
+        topology = get_guest_topology(complex.guest, scale_cutoff)
         host_len = len(complex.host)
-    
-        for idx, elem in enumerate(guest_elements):
-            max_valence = NEUTRAL_VALENCES.get(elem)
-            if max_valence is None:
-                continue
-            current_valence = sum(BOND_ORDER_VALUES[bo] for bo in bond_order_map[idx])
-            if (current_valence - (max_valence - 1)) == 0:
-                cation_indexes.append(host_len + idx)
-    
-        #print("cation indexes (heuristic with distance-based bonds):", cation_indexes)
-        return cation_indexes
 
+        return [host_len + idx for idx in topology.cation_indexes]
 
-        
+    def get_acid_sites(self, complex):
+        """Returns the acid sites given by the user or the ones computed
+            for the host. Computed acid sites are cached per host.
+        """
+        if self.acid_sites:
+            return self.acid_sites
 
-    def __call__(self, complex):
-        """Docks a guest cation into a host with anionic spots while ensuring a minimal distance between them.
+        host = complex.host
+        key = array_key(host.frac_coords, host.lattice.matrix, host.atomic_numbers)
+        acid_sites = _ACID_SITES_CACHE.get(key)
 
-        Args:
-            complex (structure): The host-guest complex object containing the host and guest molecules.
+        if acid_sites is None:
+            acid_sites = _ACID_SITES_CACHE.put(key, self.compute_acid_sites(complex))
 
-        Returns:
-            float: The score of the docking process. Returns normalized minimum distance if the optimal cation-anion distance is found, otherwise returns negative infinity.
+        return acid_sites
+
+    def get_cation_indexes(self, complex):
+        """Returns the cation indexes given by the user or the ones computed
+            for the guest.
         """
+        if self.cation_indexes:
+            return self.cation_indexes
+
+        return self.compute_cation_indexes(complex)
+
+    def get_sites(self, complex):
+        # Use computed acid sites and cation indexes if none were provided
+        acid_sites = self.get_acid_sites(complex)
+        cation_indexes = self.get_cation_indexes(complex)
 
-        # Use computed acid sites if none were provided
-        acid_sites = self.acid_sites or self.compute_acid_sites(complex)
-        
-        # Use computed cation indexes if none were provided
-        cation_indexes = self.cation_indexes or self.compute_cation_indexes(complex)
-        #print(cation_indexes, acid_sites)
         if not acid_sites or not cation_indexes:
             missing = []
             if not acid_sites:
@@ -268,23 +313,81 @@ class MinDistanceCationAnionFitness(ThresholdFitness):
             if not cation_indexes:
                 missing.append("cation_indexes")
             raise ValueError(f"The following required variables are missing or empty: {', '.join(missing)}, condiser giving them as an input on the command line with --acid_sites and --cation_indexes")
-        cation_anion_distances = self.get_cation_anion_distances(
+
+        return acid_sites, cation_indexes
+
+    def prepare(self, host, guest):
+        self._sites = self.get_sites(Complex(host, guest, add_transform=False))
+
+    @staticmethod
+    def get_pose_coords(indexes, host_coords, guest_coords):
+        """Gathers the coordinates of atoms given by their index in the
+            pose (host atoms first, then guest atoms) without building it.
+            `guest_coords` may have leading batch dimensions.
+        """
+        indexes = np.asarray(indexes)
+        in_host = indexes < len(host_coords)
+
+        host_part = host_coords[np.where(in_host, indexes, 0)]
+        guest_part = guest_coords[..., np.where(in_host, 0, indexes - len(host_coords)), :]
+
+        return np.where(in_host[:, None], host_part, guest_part)
+
+    def get_catan_distances(self, acid_sites, cation_indexes, host_frac, guest_frac, lattice):
+        """Periodic distances between the anions (rows) and the cations
+            (columns). Only these pairs are computed.
+        """
+        anions = host_frac[[idx for sites in acid_sites for idx in sites]]
+        cations = self.get_pose_coords(cation_indexes, host_frac, guest_frac)
+
+        return periodic_distances(anions, cations, lattice.matrix)
+
+    def __call__(self, complex):
+        """Docks a guest cation into a host with anionic spots while ensuring a minimal distance between them.
+
+        Args:
+            complex (structure): The host-guest complex object containing the host and guest molecules.
+
+        Returns:
+            float: The score of the docking process. Returns normalized minimum distance if the optimal cation-anion distance is found, otherwise returns negative infinity.
+        """
+        acid_sites, cation_indexes = self.get_sites(complex)
+
+        cation_anion_distances = self.get_catan_distances(
             acid_sites,
             cation_indexes,
-            complex.pose.distance_matrix,
+            complex.host.frac_coords,
+            complex.to_frac_coords(complex.guest.cart_coords),
+            complex.host.lattice,
         )
 
-        if (
-            any(distance < self.threshold_catan for distance_list in cation_anion_distances for distance in distance_list)
-            and self.normalize(self.get_distances(complex).min() - self.threshold) > 0
-        ):
-            print("Optimal cation-anion distance found! Aborting the run")
-            return self.normalize(self.get_distances(complex).min())
+        if (cation_anion_distances < self.threshold_catan).any():
+            min_distance = self.get_min_distance(complex)
 
-        else:
-            return -np.inf
+            if self.normalize(min_distance - self.threshold) > 0:
+                print("Optimal cation-anion distance found! Aborting the run")
+                return self.normalize(min_distance)
+
+        return -np.inf
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        if self._sites is None:
+            raise ValueError("prepare has to be called before scoring batches")
+
+        acid_sites, cation_indexes = self._sites
+        guest_frac = lattice.get_fractional_coords(
+            guest_batch.reshape(-1, 3)
+        ).reshape(guest_batch.shape)
+
+        cation_anion_distances = self.get_catan_distances(
+            acid_sites, cation_indexes, host_frac, guest_frac, lattice
+        )
+        close = (cation_anion_distances < self.threshold_catan).any(axis=(1, 2))
+
+        min_distances = self.get_batch_min_distances(host_frac, guest_batch, lattice)
+        success = close & (self.normalize_batch(min_distances - self.threshold) > 0)
 
-        
+        return np.where(success, self.normalize_batch(min_distances), -np.inf)
 
 
 class MeanDistanceFitness(ThresholdFitness):
@@ -294,6 +397,14 @@ class MeanDistanceFitness(ThresholdFitness):
     def __call__(self, complex, axis=-1):
         return self.normalize(self.get_distances(complex).min(axis=axis).mean() - self.threshold)
 
+    def score_batch(self, host_frac, guest_batch, lattice):
+        distances = self.get_batch_distances(host_frac, guest_batch, lattice)
+        values = distances.min(axis=-1)
+        if values.ndim > 1:
+            values = values.mean(axis=-1)
+
+        return self.normalize_batch(values - self.threshold)
+
 
 class SumInvDistanceFitness(ThresholdFitness):
     PARSER_NAME = "sum_distance"
@@ -304,3 +415,27 @@ class SumInvDistanceFitness(ThresholdFitness):
         distances = distances[distances < 2 * self.threshold]
 
         return self.normalize(-np.mean(1 / distances))
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        distances = self.get_batch_distances(host_frac, guest_batch, lattice)
+        distances = distances.reshape(len(guest_batch), -1)
+        close = distances < 2 * self.threshold
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = np.where(close, 1 / distances, 0).sum(axis=1) / close.sum(axis=1)
+
+        return self.normalize_batch(-inverse)
+
+    def score_local(self, environment, guest_batch):
+        # only distances below 2 * threshold contribute to the score
+        extent = np.linalg.norm(guest_batch, axis=-1).max()
+        if self.structure != "complex" or environment.radius < extent + 2 * self.threshold:
+            raise NotImplementedError
+
+        distances = environment.distances(guest_batch).reshape(len(guest_batch), -1)
+        close = distances < 2 * self.threshold
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = np.where(close, 1 / distances, 0).sum(axis=1) / close.sum(axis=1)
+
+        return self.normalize_batch(-inverse)
@@ -1,10 +1,59 @@
 from .base import Fitness
 
 
+WEIGHTS = None
+
+
 class MultipleFitness(Fitness):
-    def __init__(self, fitness, weights=None):
+    PARSER_NAME = "multiple"
+    HELP = "Weighted sum of the fitness functions given by --fitnesses. Distances are computed once per complex and shared by all of them"
+
+    def __init__(self, fitness, weights=WEIGHTS, **kwargs):
+        """
+        Args:
+            fitness (list of Fitness): fitness functions to be combined
+            weights (list of float): weight of each fitness function.
+                If None, all fitness functions have unit weight.
+        """
+        super().__init__()
+        if len(fitness) == 0:
+            raise ValueError("at least one fitness function has to be combined")
+
         self.fitness = fitness
         self.weights = [1] * len(fitness) if weights is None else weights
 
+        if len(self.weights) != len(self.fitness):
+            raise ValueError("the number of weights has to match the number of fitness functions")
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--weights",
+            type=float,
+            nargs="+",
+            help="weight of each fitness function given by --fitnesses (default: %(default)s)",
+            default=WEIGHTS,
+        )
+
     def __call__(self, obj):
         return sum([w * f(obj) for w, f in zip(self.weights, self.fitness)])
+
+    def prepare(self, host, guest):
+        for f in self.fitness:
+            f.prepare(host, guest)
+
+    def score_batch(self, host_frac, guest_batch, lattice):
+        return sum(
+            [
+                w * f.score_batch(host_frac, guest_batch, lattice)
+                for w, f in zip(self.weights, self.fitness)
+            ]
+        )
+
+    def score_local(self, environment, guest_batch):
+        return sum(
+            [
+                w * f.score_local(environment, guest_batch)
+                for w, f in zip(self.weights, self.fitness)
+            ]
+        )
@@ -1,5 +1,6 @@
 from .base import MonteCarlo
 from .mcmc import MarkovChainMC, Action
 from .metropolis import Metropolis
+from .tempering import ParallelTempering
 
 __all__ = []
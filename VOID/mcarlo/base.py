@@ -21,10 +21,14 @@ class MonteCarlo(ParseableObject):
         )
 
     def on_start(self, obj):
-        pass
+        """Called before the first step. Returns the object to be
+            updated by the trials.
+        """
+        return obj
 
     def on_end(self, obj):
-        pass
+        """Called after the last step. Returns the result of `run`."""
+        return obj
 
     def on_trial_start(self, step):
         pass
@@ -33,15 +37,14 @@ class MonteCarlo(ParseableObject):
         pass
 
     def run(self, obj, num_steps):
-        self.on_start(obj)
+        obj = self.on_start(obj)
 
         for step in range(num_steps):
             self.on_trial_start(step)
             obj = self.trial(obj)
             self.on_trial_end(step)
 
-        self.on_end(obj)
-        return obj
+        return self.on_end(obj)
 
     def trial(self, obj):
         return obj
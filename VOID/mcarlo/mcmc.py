@@ -6,12 +6,47 @@ import numpy as np
 from .base import MonteCarlo
 
 
+BURN_IN = 0
+TARGET_ACCEPTANCE = 0.3
+ADAPT_INTERVAL = 10
+
+
 class MarkovChainMC(MonteCarlo):
     PARSER_NAME = "mcmc"
     HELP = "Markov Chain Monte Carlo simulation. Updates an object based on given actions and acceptance criterion"
 
-    def __init__(self, *args, **kwargs):
+    # initial step size of the actions which have one (see `adapt_step_sizes`)
+    STEP_SIZES = {}
+    MAX_STEP_SIZES = {}
+
+    def __init__(
+        self,
+        *args,
+        action_weights=None,
+        burn_in=BURN_IN,
+        target_acceptance=TARGET_ACCEPTANCE,
+        adapt_interval=ADAPT_INTERVAL,
+        **kwargs,
+    ):
+        """
+        Args:
+            action_weights (dict or list of str): relative probability of
+                each action, by name (or as "name=weight" strings). Actions
+                not given have unit weight. If None, actions are uniform.
+            burn_in (int): number of trials during which the step sizes
+                are tuned towards `target_acceptance`
+            target_acceptance (float): acceptance rate targeted by the tuning
+            adapt_interval (int): number of trials between two updates
+                of the step sizes
+        """
         super().__init__(*args, **kwargs)
+        self.action_weights = parse_action_weights(action_weights)
+        self.burn_in = burn_in
+        self.target_acceptance = target_acceptance
+        self.adapt_interval = adapt_interval
+
+        self.step_sizes = dict(self.STEP_SIZES)
+        self.reset_statistics()
 
     def get_actions(self):
         return Action.get_actions(self)
@@ -19,20 +54,96 @@ class MarkovChainMC(MonteCarlo):
     def trial(self, obj):
         action = self.sample_action()
 
-        newobj = action(self, copy.deepcopy(obj))
+        newobj = action(self, self.propose(obj))
+        accepted = self.accept(newobj, obj)
+
+        self.record_action(action.name, 1, int(accepted))
+        self.on_statistics_update()
+
+        if accepted:
+            return newobj
+
+        return self.undo(newobj, obj)
 
-        if self.accept(newobj, obj):
-            obj = newobj
+    def propose(self, obj):
+        """Returns the object onto which the action is applied. By
+            default, actions are applied to a copy of `obj`. Classes
+            whose objects can revert their moves in place override
+            `propose` and `undo` to avoid copying the object at each trial.
+        """
+        return copy.deepcopy(obj)
 
-        return obj
+    def undo(self, new, old):
+        """Returns the state of the chain after `new` is rejected"""
+        return old
 
     def sample_action(self):
         actions = self.get_actions()
-        return random.sample(actions, 1)[0]
+
+        if self.action_weights is None:
+            return random.sample(actions, 1)[0]
+
+        weights = [self.action_weights.get(action.name, 1.0) for action in actions]
+        return random.choices(actions, weights=weights)[0]
 
     def accept(self, new, old):
         return np.random.uniform() >= 0.5
 
+    def reset_statistics(self):
+        """Clears the number of proposed and accepted moves per action"""
+        self.num_trials = 0
+        self.action_stats = {}
+        self.window_stats = {}
+
+    def record_action(self, name, proposed, accepted):
+        for stats in [self.action_stats, self.window_stats]:
+            counts = stats.setdefault(name, np.zeros(2, dtype=int))
+            counts += (proposed, accepted)
+
+    def on_statistics_update(self):
+        """Called once per trial, after the moves are recorded. Tunes
+            the step sizes every `adapt_interval` trials of the burn-in.
+        """
+        self.num_trials += 1
+
+        if self.num_trials <= self.burn_in and self.num_trials % self.adapt_interval == 0:
+            self.adapt_step_sizes()
+
+    def acceptance_rates(self):
+        """Returns the fraction of accepted moves of each action"""
+        return {
+            name: accepted / proposed
+            for name, (proposed, accepted) in self.action_stats.items()
+            if proposed > 0
+        }
+
+    def adapt_step_sizes(self):
+        """Scales the step size of each action by exp(rate - target), where
+            `rate` is its acceptance rate since the last update. Actions
+            accepted too often take larger steps and vice versa.
+        """
+        for name, (proposed, accepted) in self.window_stats.items():
+            if name not in self.step_sizes or proposed == 0:
+                continue
+
+            size = self.step_sizes[name] * np.exp(accepted / proposed - self.target_acceptance)
+            self.step_sizes[name] = min(size, self.MAX_STEP_SIZES.get(name, np.inf))
+
+        self.window_stats = {}
+
+
+def parse_action_weights(weights):
+    """Converts a list of "name=weight" strings to a dictionary"""
+    if weights is None or isinstance(weights, dict):
+        return weights
+
+    parsed = {}
+    for item in weights:
+        name, weight = item.split("=")
+        parsed[name] = float(weight)
+
+    return parsed
+
 
 class Action:
     """Decorator that defines an action for MCMC-derived classes.
@@ -40,8 +151,11 @@ class Action:
         of the new method.
     """
 
+    _REGISTRY = {}
+
     def __init__(self, func):
         self.func = func
+        self.name = func.__name__
 
     def __call__(self, *args, **kwargs):
         return self.func(*args, **kwargs)
@@ -52,5 +166,15 @@ class Action:
 
     @staticmethod
     def get_actions(cls):
-        """Return methods in `cls` that are actions"""
-        return [fn for name, fn in inspect.getmembers(cls, Action.is_action)]
+        """Return methods in `cls` that are actions. The actions are
+            looked up once per class.
+        """
+        if not isinstance(cls, type):
+            cls = type(cls)
+
+        if cls not in Action._REGISTRY:
+            Action._REGISTRY[cls] = [
+                fn for name, fn in inspect.getmembers(cls, Action.is_action)
+            ]
+
+        return Action._REGISTRY[cls]
@@ -19,6 +19,7 @@ class Metropolis(MarkovChainMC):
         super().__init__(*args, **kwargs)
         self.temperature = temperature
         self.temperature_profile = self.set_temperature_profile(temperature_profile)
+        self.current_fitness = None
 
     @staticmethod
     def add_arguments(parser):
@@ -43,15 +44,54 @@ class Metropolis(MarkovChainMC):
         assert hasattr(profile, "__call__"), "Temperature profile is not callable"
         return profile
 
+    def evaluate(self, obj):
+        """Returns the fitness of `obj`"""
+        return self.fitness(obj)
+
+    def on_start(self, obj):
+        # the fitness of the current state is evaluated on the first trial
+        self.current_fitness = None
+        return super().on_start(obj)
+
+    def trial(self, obj):
+        # the fitness of the current state is kept between trials, so
+        # only the proposed state is evaluated at each step
+        if self.current_fitness is None:
+            self.current_fitness = self.evaluate(obj)
+
+        return super().trial(obj)
+
     def accept(self, new, old):
         """Convention: Metropolis tries to maximize the fitness"""
+        new_fitness = self.evaluate(new)
+
         # accept if the new fitness is larger than the old one
-        delta_e = self.fitness(old) - self.fitness(new)
+        delta_e = self.current_fitness - new_fitness
 
         if self.temperature == 0:
+            accepted = delta_e < 0
+        else:
+            accepted = np.exp(-delta_e / self.temperature) > np.random.uniform()
+
+        if accepted:
+            self.current_fitness = new_fitness
+
+        return accepted
+
+    def accept_batch(self, new_fitness, old_fitness):
+        """Vectorized `accept` for independent chains. Returns a boolean
+            array with the accepted proposals. `temperature` may also be
+            an array with the temperature of each chain.
+        """
+        delta_e = old_fitness - new_fitness
+
+        if np.all(self.temperature == 0):
             return delta_e < 0
 
-        return np.exp(-delta_e / self.temperature) > np.random.uniform()
+        with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+            accepted = np.exp(-delta_e / self.temperature) > np.random.uniform(size=len(delta_e))
+
+        return np.where(np.equal(self.temperature, 0), delta_e < 0, accepted)
 
     def on_trial_end(self, step):
         self.update_temperature(step)
@@ -0,0 +1,140 @@
+import copy
+import numpy as np
+
+from .metropolis import Metropolis, ATTEMPTS
+
+
+TEMPERATURES = [0.1, 0.3, 1.0, 3.0]
+SWAP_INTERVAL = 10
+
+
+class ParallelTempering(Metropolis):
+    PARSER_NAME = "tempering"
+    HELP = "Runs replicas of a Metropolis chain at a ladder of temperatures which periodically exchange their states"
+
+    def __init__(self, *args, temperatures=TEMPERATURES, swap_interval=SWAP_INTERVAL, **kwargs):
+        """
+        Args:
+            temperatures (list of float): temperature of each replica
+            swap_interval (int): number of steps between swap moves
+        """
+        kwargs.pop("temperature", None)
+        self.temperatures = np.sort(np.array(temperatures, dtype=float))
+        super().__init__(*args, temperature=self.temperatures[0], **kwargs)
+
+        self.swap_interval = swap_interval
+        self.reset_swaps()
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument(
+            "--attempts",
+            type=int,
+            help="maximum number of Monte Carlo steps (default: %(default)s)",
+            default=ATTEMPTS,
+        )
+        parser.add_argument(
+            "--temperatures",
+            type=float,
+            nargs="+",
+            help="fixed temperatures of the replicas; temperature profiles are ignored (default: %(default)s)",
+            default=TEMPERATURES,
+        )
+        parser.add_argument(
+            "--swap_interval",
+            type=int,
+            help="number of steps between swaps of replicas (default: %(default)s)",
+            default=SWAP_INTERVAL,
+        )
+
+    @property
+    def num_replicas(self):
+        return len(self.temperatures)
+
+    def reset_swaps(self):
+        self.swap_attempts = np.zeros(self.num_replicas - 1, dtype=int)
+        self.swap_accepts = np.zeros(self.num_replicas - 1, dtype=int)
+
+    def swap_acceptance(self):
+        """Returns the fraction of accepted swaps between each pair
+            of neighboring temperatures (nan if never attempted).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.swap_accepts / self.swap_attempts
+
+    def report_swaps(self):
+        pairs = zip(self.temperatures[:-1], self.temperatures[1:], self.swap_acceptance())
+        return ", ".join([f"{t1:g}-{t2:g}: {rate:.2f}" for t1, t2, rate in pairs])
+
+    def get_swaps(self, fitness, step):
+        """Proposes swaps between neighboring temperatures. Even and odd
+            pairs are tried in alternate swap moves.
+
+        Args:
+            fitness (np.ndarray): (L, R) fitness of the replicas of each of
+                the L independent ladders, sorted by temperature
+            step (int): current step
+
+        Returns:
+            order (np.ndarray): (L, R) replica that ends up at each
+                temperature of each ladder
+        """
+        fitness = np.asarray(fitness, dtype=float)
+        order = np.broadcast_to(np.arange(self.num_replicas), fitness.shape).copy()
+
+        first = (step // self.swap_interval) % 2
+        pairs = np.arange(first, self.num_replicas - 1, 2)
+        if len(pairs) == 0:
+            return order
+
+        # maximizing the fitness is equivalent to an energy -fitness
+        beta = 1 / self.temperatures
+        delta = (beta[pairs] - beta[pairs + 1]) * (fitness[:, pairs + 1] - fitness[:, pairs])
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            accepted = np.exp(delta) > np.random.uniform(size=delta.shape)
+
+        self.swap_attempts[pairs] += len(fitness)
+        self.swap_accepts[pairs] += accepted.sum(axis=0)
+
+        ladder, pair = np.nonzero(accepted)
+        order[ladder, pairs[pair]] = pairs[pair] + 1
+        order[ladder, pairs[pair] + 1] = pairs[pair]
+
+        return order
+
+    def accept_batch(self, new_fitness, old_fitness):
+        # replicas whose states are all infeasible (-inf) keep moving
+        # instead of freezing until a swap brings them a feasible state
+        infeasible = np.isneginf(new_fitness) & np.isneginf(old_fitness)
+        return super().accept_batch(new_fitness, old_fitness) | infeasible
+
+    def is_swap_step(self, step):
+        return (step + 1) % self.swap_interval == 0
+
+    def run(self, obj, num_steps):
+        """Runs one replica of `obj` at each temperature. Returns the
+            replica with the highest fitness.
+        """
+        self.reset_swaps()
+        states = [self.on_start(copy.deepcopy(obj)) for _ in self.temperatures]
+        fitness = [self.evaluate(state) for state in states]
+
+        for step in range(num_steps):
+            for i, temperature in enumerate(self.temperatures):
+                self.temperature = temperature
+                self.current_fitness = fitness[i]
+                states[i] = self.trial(states[i])
+                fitness[i] = self.current_fitness
+
+            if self.is_swap_step(step):
+                order = self.get_swaps([fitness], step)[0]
+                states = [states[i] for i in order]
+                fitness = [fitness[i] for i in order]
+
+        self.temperature = self.temperatures[0]
+        return self.on_end(states[int(np.argmax(fitness))])
+
+    def on_trial_end(self, step):
+        # temperatures are fixed by the ladder
+        pass
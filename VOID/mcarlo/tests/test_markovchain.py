@@ -28,6 +28,28 @@ class TestMCMC(ut.TestCase):
     def test_actions(self):
         self.assertEqual(len(self.mcarlo.get_actions()), 2)
 
+    def test_registry(self):
+        self.assertIs(self.mcarlo.get_actions(), ExampleMCMC(self.fitness).get_actions())
+        self.assertEqual(
+            [action.name for action in self.mcarlo.get_actions()], ["decrement", "increment"]
+        )
+
+    def test_weights(self):
+        mcarlo = ExampleMCMC(self.fitness, action_weights=["decrement=0"])
+        self.assertEqual(mcarlo.action_weights, {"decrement": 0.0})
+
+        actions = [mcarlo.sample_action().name for _ in range(20)]
+        self.assertEqual(set(actions), {"increment"})
+
+    def test_statistics(self):
+        self.mcarlo.run(0, self.num_steps)
+
+        proposed = sum(counts[0] for counts in self.mcarlo.action_stats.values())
+        self.assertEqual(proposed, self.num_steps)
+        self.assertEqual(self.mcarlo.num_trials, self.num_steps)
+        for rate in self.mcarlo.acceptance_rates().values():
+            self.assertTrue(0 <= rate <= 1)
+
     def test_examplemc(self):
         initial = 0
         final = self.mcarlo.run(initial, self.num_steps)
@@ -58,6 +58,20 @@ class TestMetropolis(ut.TestCase):
         self.assertAlmostEqual(self.mcarlo.update_temperature(5), 0, places=5)
         self.assertAlmostEqual(self.mcarlo.update_temperature(10), 0, places=5)
 
+    def test_evaluations(self):
+        calls = []
+
+        def counting_fitness(number):
+            calls.append(number)
+            return number
+
+        mcarlo = ExampleMetropolis(counting_fitness, temperature=self.temperature)
+        final = mcarlo.run(0, self.num_steps)
+
+        # the initial state plus one proposed state per step
+        self.assertEqual(len(calls), self.num_steps + 1)
+        self.assertEqual(mcarlo.current_fitness, final)
+
 
 if __name__ == "__main__":
     ut.main()
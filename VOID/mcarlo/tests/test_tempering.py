@@ -0,0 +1,53 @@
+import numpy as np
+import unittest as ut
+
+from VOID.mcarlo import ParallelTempering, Action
+
+
+def example_fitness(number):
+    return number
+
+
+class ExampleTempering(ParallelTempering):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    @Action
+    def increment(self, obj):
+        return obj + 1
+
+    @Action
+    def decrement(self, obj):
+        return obj - 1
+
+
+class TestParallelTempering(ut.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.num_steps = 20
+        self.mcarlo = ExampleTempering(
+            example_fitness, temperatures=[2.0, 1.0], swap_interval=5
+        )
+
+    def test_temperatures(self):
+        np.testing.assert_array_equal(self.mcarlo.temperatures, [1.0, 2.0])
+        self.assertEqual(self.mcarlo.temperature, 1.0)
+
+    def test_swaps(self):
+        # the hotter replica has a much better fitness
+        order = self.mcarlo.get_swaps([[0, 100], [100, 0]], step=0)
+        np.testing.assert_array_equal(order, [[1, 0], [0, 1]])
+
+        self.assertEqual(self.mcarlo.swap_attempts[0], 2)
+        self.assertEqual(self.mcarlo.swap_acceptance()[0], 0.5)
+
+    def test_run(self):
+        final = self.mcarlo.run(0, self.num_steps)
+
+        self.assertTrue(-self.num_steps <= final <= self.num_steps)
+        self.assertTrue(self.mcarlo.swap_attempts.sum() > 0)
+        self.assertIn("1-2", self.mcarlo.report_swaps())
+
+
+if __name__ == "__main__":
+    ut.main()
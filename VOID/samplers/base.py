@@ -3,11 +3,49 @@ import numpy as np
 from VOID.object import ParseableObject
 
 
+GUEST_MARGIN = None
+
+
+def get_guest_extent(guest):
+    """Returns the half-thickness of the guest along its shortest
+        principal axis. The dockers rotate the guest around the origin,
+        which is placed at the docking point, so the thickness is
+        measured about the origin: it is the smallest, over the
+        principal axes, of the largest distance from the origin to
+        the atoms along that axis.
+    """
+    coords = guest.cart_coords
+    _, axes = np.linalg.eigh(coords.T @ coords)
+    projections = coords @ axes
+
+    return np.abs(projections).max(axis=0).min()
+
+
 class Sampler(ParseableObject):
+    guest_margin = GUEST_MARGIN
+
     def __init__(self):
         pass
 
-    def get_points(self, structure):
+    @staticmethod
+    def add_guest_arguments(parser):
+        parser.add_argument(
+            "--guest_margin",
+            type=float,
+            help="if given, discard points closer to the host than the half-thickness of the guest plus this margin (default: %(default)s)",
+            default=GUEST_MARGIN,
+        )
+
+    def get_guest_radius(self, guest=None):
+        """Minimum distance between a point and the host for the guest to
+            fit there. Zero if no guest or `guest_margin` is given.
+        """
+        if guest is None or self.guest_margin is None:
+            return 0.0
+
+        return get_guest_extent(guest) + self.guest_margin
+
+    def get_points(self, structure, guest=None):
         raise NotImplementedError
 
 
@@ -18,5 +56,5 @@ class OriginSampler(Sampler):
     def __init__(self):
         super().__init__()
 
-    def get_points(self, structure):
+    def get_points(self, structure, guest=None):
         return [np.array([0, 0, 0])]
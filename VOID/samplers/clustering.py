@@ -0,0 +1,99 @@
+import numpy as np
+
+
+MAX_ITER = 50
+CANDIDATES = 256
+
+
+def kmedoids_init(frac_coords, lattice, num_clusters, rng):
+    """k-medoids++ initialization: each new medoid is drawn with
+        probability proportional to the squared distance to the
+        closest medoid chosen so far.
+    """
+    medoids = [rng.integers(len(frac_coords))]
+    closest = lattice.get_all_distances(frac_coords, frac_coords[medoids]).min(axis=1)
+
+    for _ in range(1, num_clusters):
+        weights = closest ** 2
+        if weights.sum() == 0:
+            break
+
+        new = rng.choice(len(frac_coords), p=weights / weights.sum())
+        medoids.append(new)
+
+        distances = lattice.get_all_distances(frac_coords, frac_coords[[new]])[:, 0]
+        closest = np.minimum(closest, distances)
+
+    return np.array(medoids)
+
+
+def update_medoid(frac_coords, lattice, members, medoid, rng, candidates=CANDIDATES):
+    """Returns the member of a cluster with the smallest sum of distances
+        to all members. For large clusters, only a random subset of the
+        members (plus the current medoid) are candidates, so the cost
+        never increases between iterations.
+    """
+    if len(members) > candidates:
+        sample = rng.choice(members, candidates, replace=False)
+    else:
+        sample = members
+
+    sample = np.unique(np.append(sample, medoid))
+    cost = lattice.get_all_distances(frac_coords[sample], frac_coords[members]).sum(axis=1)
+
+    # keeps the current medoid unless another candidate is strictly better
+    current = cost[sample == medoid][0]
+    if cost.min() < current:
+        return sample[cost.argmin()]
+
+    return medoid
+
+
+def periodic_kmedoids(frac_coords, lattice, num_clusters, seed=0, max_iter=MAX_ITER):
+    """Clusters points of a periodic structure with k-medoids, using
+        minimum-image distances. Only distances between the points and
+        the medoids are computed for the assignment, so the cost per
+        iteration is O(n k).
+
+    Args:
+        frac_coords (np.ndarray): (N, 3) fractional coordinates
+        lattice (Lattice): lattice of the structure
+        num_clusters (int): maximum number of clusters
+        seed (int): seed of the random initialization
+        max_iter (int): maximum number of iterations
+
+    Returns:
+        labels (np.ndarray): (N, ) cluster of each point
+    """
+    rng = np.random.default_rng(seed)
+    num_clusters = min(num_clusters, len(frac_coords))
+
+    medoids = kmedoids_init(frac_coords, lattice, num_clusters, rng)
+
+    for _ in range(max_iter):
+        labels = lattice.get_all_distances(frac_coords, frac_coords[medoids]).argmin(axis=1)
+
+        new_medoids = medoids.copy()
+        for k in range(len(medoids)):
+            members = np.flatnonzero(labels == k)
+            if len(members) > 0:
+                new_medoids[k] = update_medoid(
+                    frac_coords, lattice, members, medoids[k], rng
+                )
+
+        if np.array_equal(new_medoids, medoids):
+            break
+
+        medoids = new_medoids
+
+    return lattice.get_all_distances(frac_coords, frac_coords[medoids]).argmin(axis=1)
+
+
+def select_representatives(labels, values):
+    """Returns the index of the point with the largest value in each
+        cluster, sorted by cluster label.
+    """
+    order = np.lexsort((-np.asarray(values), labels))
+    _, first = np.unique(labels[order], return_index=True)
+
+    return order[first]
@@ -1,6 +1,7 @@
 import numpy as np
 
-from .base import Sampler
+from .base import Sampler, GUEST_MARGIN
+from VOID.structure.neighbors import get_neighbor_search
 
 
 SAMPLES = 10
@@ -10,8 +11,9 @@ class RandomSampler(Sampler):
     PARSER_NAME = "random"
     HELP = "Sample random points inside the unit cell of the given crystal structure"
 
-    def __init__(self, num_samples=SAMPLES, **kwargs):
+    def __init__(self, num_samples=SAMPLES, guest_margin=GUEST_MARGIN, **kwargs):
         self.num_samples = num_samples
+        self.guest_margin = guest_margin
 
     @staticmethod
     def add_arguments(parser):
@@ -21,7 +23,16 @@ class RandomSampler(Sampler):
             help="maximum number of points inside the crystal structure to sample (default: %(default)s)",
             default=SAMPLES,
         )
+        Sampler.add_guest_arguments(parser)
 
-    def get_points(self, structure):
+    def get_points(self, structure, guest=None):
         points = np.random.rand(self.num_samples, 3)
-        return points @ structure.lattice.matrix
+        points = points @ structure.lattice.matrix
+
+        # discards points too close to the host for the guest to fit
+        min_radius = self.get_guest_radius(guest)
+        if min_radius > 0:
+            search = get_neighbor_search(structure.frac_coords, structure.lattice)
+            points = points[search.nearest_distances(points) >= min_radius]
+
+        return points
@@ -0,0 +1,38 @@
+import numpy as np
+import unittest as ut
+from pymatgen.core import Lattice
+
+from VOID.samplers.clustering import periodic_kmedoids, select_representatives
+
+
+class TestClustering(ut.TestCase):
+    def setUp(self):
+        self.lattice = Lattice.cubic(10)
+        rng = np.random.default_rng(0)
+
+        # the first cluster crosses the face of the cell
+        first = np.array([0.0, 0.5, 0.5]) + rng.normal(0, 0.01, (20, 3))
+        second = np.array([0.5, 0.5, 0.5]) + rng.normal(0, 0.01, (20, 3))
+        self.frac_coords = np.concatenate([first, second]) % 1.0
+
+    def test_periodic(self):
+        labels = periodic_kmedoids(self.frac_coords, self.lattice, 2)
+
+        self.assertEqual(len(set(labels[:20])), 1)
+        self.assertEqual(len(set(labels[20:])), 1)
+        self.assertNotEqual(labels[0], labels[20])
+
+    def test_deterministic(self):
+        labels = periodic_kmedoids(self.frac_coords, self.lattice, 5, seed=3)
+        again = periodic_kmedoids(self.frac_coords, self.lattice, 5, seed=3)
+        np.testing.assert_array_equal(labels, again)
+
+    def test_representatives(self):
+        labels = np.array([1, 0, 1, 0, 2])
+        values = np.array([0.5, 2.0, 3.0, 1.0, 0.1])
+
+        np.testing.assert_array_equal(select_representatives(labels, values), [1, 2, 4])
+
+
+if __name__ == "__main__":
+    ut.main()
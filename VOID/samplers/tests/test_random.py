@@ -2,6 +2,8 @@ import numpy as np
 import unittest as ut
 
 from VOID.samplers import RandomSampler
+from VOID.samplers.base import get_guest_extent
+from VOID.structure.neighbors import get_neighbor_search
 from VOID.tests.test_inputs import load_structure, load_molecule
 
 
@@ -14,6 +16,16 @@ class TestRandomSampler(ut.TestCase):
         points = self.sampler.get_points(self.host)
         self.assertEqual(len(points), 20)
 
+    def test_guest_filter(self):
+        guest = load_molecule()
+        sampler = RandomSampler(num_samples=200, guest_margin=1.0)
+        points = sampler.get_points(self.host, guest)
+        self.assertLess(len(points), 200)
+
+        search = get_neighbor_search(self.host.frac_coords, self.host.lattice)
+        min_radius = get_guest_extent(guest) + 1.0
+        self.assertTrue((search.nearest_distances(points) >= min_radius).all())
+
 
 if __name__ == "__main__":
     ut.main()
@@ -1,7 +1,9 @@
 import numpy as np
 import unittest as ut
+from pymatgen.core import Molecule
 
 from VOID.samplers import OriginSampler
+from VOID.samplers.base import get_guest_extent
 from VOID.tests.test_inputs import load_structure, load_molecule
 
 
@@ -16,5 +18,26 @@ class TestSampler(ut.TestCase):
         np.testing.assert_allclose(points[0], 0)
 
 
+class TestGuestExtent(ut.TestCase):
+    def test_extent(self):
+        # rotated box with half-sides 1, 2 and 3
+        corners = np.array(np.meshgrid([-1, 1], [-2, 2], [-3, 3])).reshape(3, -1).T
+        theta = 0.3
+        rot = np.array(
+            [
+                [np.cos(theta), -np.sin(theta), 0],
+                [np.sin(theta), np.cos(theta), 0],
+                [0, 0, 1],
+            ]
+        )
+        guest = Molecule(["C"] * len(corners), corners @ rot.T)
+
+        self.assertAlmostEqual(get_guest_extent(guest), 1.0)
+
+        # the guest is rotated around the docking point, not its center
+        shifted = Molecule(["C"] * len(corners), (corners + [1.0, 0, 0]) @ rot.T)
+        self.assertAlmostEqual(get_guest_extent(shifted), 2.0)
+
+
 if __name__ == "__main__":
     ut.main()
@@ -1,11 +1,16 @@
+import shutil
 import numpy as np
 import unittest as ut
 
 from VOID.samplers import VoronoiSampler, VoronoiClustering
+from VOID.samplers.voronoi import _NODES_CACHE
+from VOID.utils.cache import DiskCache
 from VOID.tests.test_inputs import load_structure, load_molecule
 
 
 class TestVoronoi(ut.TestCase):
+    tolerance = 1e-3
+
     def setUp(self):
         self.host = load_structure()
         self.guest = load_molecule()
@@ -36,7 +41,7 @@ class TestVoronoi(ut.TestCase):
         fp = self.host.lattice.get_fractional_coords(points)
         fe = self.host.lattice.get_fractional_coords(expected)
         distances = self.host.lattice.get_all_distances(fp, fe)
-        self.assertTrue(all([np.abs(d) < 1e-3 for d in distances.min(axis=0)]))
+        self.assertTrue(all([np.abs(d) < self.tolerance for d in distances.min(axis=0)]))
 
 
 class TestVoronoiClustering(ut.TestCase):
@@ -51,5 +56,82 @@ class TestVoronoiClustering(ut.TestCase):
         self.assertEqual(len(points), self.N)
 
 
+class TestScipyVoronoi(TestVoronoi):
+    # expected nodes are given with three decimals
+    tolerance = 1e-2
+
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.sampler = VoronoiSampler(remove_species=["O"], backend="scipy")
+
+    def tearDown(self):
+        _NODES_CACHE.clear()
+
+
+class TestScipyVoronoiClustering(TestVoronoiClustering):
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.N = 4
+        self.sampler = VoronoiClustering(num_clusters=self.N, backend="scipy")
+
+    def tearDown(self):
+        _NODES_CACHE.clear()
+
+
+class TestVoronoiCache(ut.TestCase):
+    def setUp(self):
+        self.host = load_structure()
+        self.scratchdir = ".tmp_voronoi"
+        self.sampler = VoronoiSampler(
+            remove_species=["O"], min_radius=0.0, voronoi_cache=self.scratchdir
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.scratchdir, ignore_errors=True)
+        _NODES_CACHE.clear()
+
+    def test_cached_nodes(self):
+        self.sampler._structure = self.host.copy()
+        self.sampler.remove_species_from_structure()
+        key = self.sampler.get_cache_key()
+
+        # nodes stored by a previous run are used without calling Zeo++
+        frac_coords = np.array([[0.0, 0.0, 0.25], [0.5, 0.5, 0.5]])
+        DiskCache(self.scratchdir, prefix="voronoi").put(
+            key,
+            matrix=self.host.lattice.matrix,
+            frac_coords=frac_coords,
+            voronoi_radius=np.array([3.5, 1.0]),
+        )
+
+        nodes = self.sampler.get_voronoi_nodes(self.host)
+        np.testing.assert_allclose(nodes.frac_coords, frac_coords)
+        self.assertEqual(nodes.site_properties["voronoi_radius"], [3.5, 1.0])
+
+    def test_scipy_cache(self):
+        sampler = VoronoiSampler(
+            remove_species=["O"], backend="scipy", voronoi_cache=self.scratchdir
+        )
+        nodes = sampler.get_voronoi_nodes(self.host)
+        key = sampler.get_cache_key()
+
+        disk_cache = DiskCache(self.scratchdir, prefix="voronoi")
+        self.assertIn(key, disk_cache)
+
+        # a new run reads the nodes from disk instead of computing them
+        _NODES_CACHE.clear()
+        sampler.get_scipy_voronoi_nodes = None
+        cached = sampler.get_voronoi_nodes(self.host)
+        np.testing.assert_allclose(cached.frac_coords, nodes.frac_coords)
+
+    def test_key(self):
+        self.sampler._structure = self.host.copy()
+        key = self.sampler.get_cache_key()
+        self.sampler.probe_radius = 0.5
+        self.assertNotEqual(self.sampler.get_cache_key(), key)
+
+
 if __name__ == "__main__":
     ut.main()
@@ -4,20 +4,35 @@ Requires changes in the pymatgen interface to work correctly.
 """
 
 import numpy as np
+from scipy.spatial import Voronoi
 from sklearn.cluster import KMeans
 import pymatgen.io.zeopp as zeopp
+from pymatgen.core import Lattice, Structure
 from pymatgen.core.periodic_table import Specie
 from pymatgen.analysis.bond_valence import BVAnalyzer
 
-from .base import Sampler
+from .base import Sampler, GUEST_MARGIN
+from .clustering import periodic_kmedoids, select_representatives
 from VOID.io.stdout import suppress_stdout
+from VOID.structure.neighbors import PeriodicNeighborSearch
+from VOID.utils.cache import DiskCache, LRUCache, MAX_DISK_ENTRIES, array_key
 
 
 PROBE_RADIUS = 0.1
 MIN_VORONOI_RADIUS = 3.0
 REMOVE_SPECIES = []
 NUM_CLUSTERS = 10
+CLUSTERING = "kmedoids"
+CLUSTERING_CHOICES = ["kmedoids", "kmeans"]
+CLUSTER_SEED = 0
 PYMATGEN_RADII = False
+VORONOI_CACHE = None
+BACKEND = "zeopp"
+BACKEND_CHOICES = ["zeopp", "scipy"]
+VORONOI_PADDING = 8.0
+NODE_TOLERANCE = 0.01
+
+_NODES_CACHE = LRUCache()
 
 
 class VoronoiSampler(Sampler):
@@ -31,12 +46,33 @@ class VoronoiSampler(Sampler):
         remove_species=REMOVE_SPECIES,
         min_radius=MIN_VORONOI_RADIUS,
         pymatgen_radii=PYMATGEN_RADII,
+        voronoi_cache=VORONOI_CACHE,
+        voronoi_cache_size=MAX_DISK_ENTRIES,
+        backend=BACKEND,
+        guest_margin=GUEST_MARGIN,
         **kwargs
     ):
+        """
+        Args:
+            guest_margin (float): if given, nodes whose radius is smaller
+                than the half-thickness of the guest plus `guest_margin`
+                are also discarded
+            backend (str): program computing the Voronoi diagram. "zeopp"
+                uses Zeo++, "scipy" computes the periodic diagram with
+                `scipy.spatial.Voronoi` and does not require Zeo++.
+            voronoi_cache (str): folder in which the Voronoi nodes are
+                stored, so that runs with the same host reuse them
+            voronoi_cache_size (int): maximum number of hosts kept in
+                `voronoi_cache`
+        """
         self.probe_radius = probe_radius
         self.remove_species = remove_species
         self.min_radius = min_radius
         self.pymatgen_radii = pymatgen_radii
+        self.voronoi_cache = voronoi_cache
+        self.voronoi_cache_size = voronoi_cache_size
+        self.backend = backend
+        self.guest_margin = guest_margin
 
     @staticmethod
     def add_arguments(parser):
@@ -59,6 +95,26 @@ class VoronoiSampler(Sampler):
             help="minimum radius of a voronoi point for it to be considered during sampling (default: %(default)s)",
             default=MIN_VORONOI_RADIUS,
         )
+        parser.add_argument(
+            "--voronoi_cache",
+            type=str,
+            help="folder in which Voronoi nodes are stored to be reused by other runs (default: %(default)s)",
+            default=VORONOI_CACHE,
+        )
+        parser.add_argument(
+            "--voronoi_cache_size",
+            type=int,
+            help="maximum number of structures kept in the Voronoi cache (default: %(default)s)",
+            default=MAX_DISK_ENTRIES,
+        )
+        parser.add_argument(
+            "--backend",
+            type=str,
+            choices=BACKEND_CHOICES,
+            help="program used to compute the voronoi diagram (default: %(default)s)",
+            default=BACKEND,
+        )
+        Sampler.add_guest_arguments(parser)
 
     def remove_species_from_structure(self):
         for species in self.remove_species:
@@ -74,6 +130,44 @@ class VoronoiSampler(Sampler):
 
         return nodes, edge_center, face_center
 
+    def get_scipy_voronoi_nodes(self):
+        """Computes the Voronoi nodes of the structure without Zeo++. The
+            atoms are padded with their periodic images and the vertices
+            of the Voronoi diagram inside the unit cell are kept. The
+            radius of each node is its distance to the closest atom (minus
+            the atomic radius, if `pymatgen_radii` is set).
+
+        Returns:
+            frac_coords (np.ndarray): (N, 3) fractional coordinates of the nodes
+            voronoi_radius (np.ndarray): (N, ) radius of each node
+        """
+        structure = self._structure
+        search = PeriodicNeighborSearch(
+            structure.frac_coords, structure.lattice, cutoff=VORONOI_PADDING
+        )
+        vertices = Voronoi(search.tree.data).vertices
+
+        frac = vertices @ search.inv_matrix
+        tol = NODE_TOLERANCE / np.array(structure.lattice.abc)
+        inside = np.all((frac >= -tol) & (frac < 1 + tol), axis=1)
+
+        # vertices on the faces of the cell appear once for each image,
+        # and degenerate vertices are split into several close ones
+        frac = frac[inside] % 1.0
+        close = structure.lattice.get_all_distances(frac, frac) < NODE_TOLERANCE
+        frac = frac[~np.tril(close, k=-1).any(axis=1)]
+
+        distances, nearest = search.tree.query(frac @ structure.lattice.matrix)
+
+        radii = self.get_atomic_radii()
+        if radii is not None:
+            atom_radii = np.array(
+                [radii.get(site.species_string, 0.0) for site in structure]
+            )
+            distances = distances - atom_radii[search.indices[nearest]]
+
+        return frac, distances
+
     def get_atomic_radii(self):
         if not self.pymatgen_radii:
             return None
@@ -93,41 +187,114 @@ class VoronoiSampler(Sampler):
 
         return radii
 
-    def remove_close_nodes(self, nodes):
+    def remove_close_nodes(self, nodes, min_radius=None):
         """Removes voronoi nodes with radius smaller than
-            `radius`.
+            `min_radius` (default: `self.min_radius`).
         """
+        if min_radius is None:
+            min_radius = self.min_radius
 
         remove_idx = [
             idx
             for idx, site in enumerate(nodes.sites)
-            if site.properties["voronoi_radius"] < self.min_radius
+            if site.properties["voronoi_radius"] < min_radius
         ]
         nodes.remove_sites(remove_idx)
 
         return nodes
 
-    def get_voronoi_nodes(self, structure):
+    def get_cache_key(self):
+        """Key of the Voronoi nodes of the current structure. It depends
+            on the structure (after removing species) and on all settings
+            of the tessellation.
+        """
+        return array_key(
+            self._structure.frac_coords,
+            self._structure.lattice.matrix,
+            np.array(self._structure.atomic_numbers),
+            probe_radius=self.probe_radius,
+            remove_species=sorted(self.remove_species),
+            pymatgen_radii=self.pymatgen_radii,
+            backend=self.backend,
+        )
+
+    def compute_voronoi_nodes(self):
+        """Returns the Voronoi nodes of the current structure as arrays.
+            Nodes are read from the memory and disk caches if possible.
+        """
+        key = self.get_cache_key()
+        data = _NODES_CACHE.get(key)
+
+        if data is not None:
+            return data
+
+        disk_cache = None
+        if self.voronoi_cache is not None:
+            disk_cache = DiskCache(
+                self.voronoi_cache, prefix="voronoi", max_entries=self.voronoi_cache_size
+            )
+            data = disk_cache.get(key)
+
+        if data is None:
+            data = self.get_voronoi_data()
+
+            if disk_cache is not None:
+                disk_cache.put(key, **data)
+
+        return _NODES_CACHE.put(key, data)
+
+    def get_voronoi_data(self):
+        """Computes the Voronoi nodes of the current structure with
+            the selected backend.
+        """
+        if self.backend == "scipy":
+            frac_coords, voronoi_radius = self.get_scipy_voronoi_nodes()
+            return {
+                "matrix": self._structure.lattice.matrix,
+                "frac_coords": frac_coords,
+                "voronoi_radius": voronoi_radius,
+            }
+
+        nodes, _, _ = self.get_voronoi_structures()
+        return {
+            "matrix": nodes.lattice.matrix,
+            "frac_coords": nodes.frac_coords.reshape(-1, 3),
+            "voronoi_radius": np.array(
+                nodes.site_properties.get("voronoi_radius", []), dtype=float
+            ),
+        }
+
+    def get_voronoi_nodes(self, structure, guest=None):
         self._structure = structure.copy()
         self.remove_species_from_structure()
 
-        nodes, _, _ = self.get_voronoi_structures()
-        nodes = self.remove_close_nodes(nodes)
+        data = self.compute_voronoi_nodes()
+        nodes = Structure(
+            Lattice(data["matrix"]),
+            ["X"] * len(data["frac_coords"]),
+            data["frac_coords"],
+            site_properties={"voronoi_radius": data["voronoi_radius"].tolist()},
+        )
+        nodes = self.remove_close_nodes(
+            nodes, max(self.min_radius, self.get_guest_radius(guest))
+        )
 
         return nodes
 
-    def get_points(self, structure):
-        nodes = self.get_voronoi_nodes(structure)
+    def get_points(self, structure, guest=None):
+        nodes = self.get_voronoi_nodes(structure, guest)
         return nodes.cart_coords
 
 
 class VoronoiClustering(VoronoiSampler):
-    """Select best sites according to a k-means clustering
-        algorithm. It provides us with a better selection of
-        which points to try in the zeolite. Periodic boundary
-        conditions are NOT taken into consideration when
-        calculating the distances. The best sites are those
-        further away from the zeolite (largest voronoi radius).
+    """Select best sites according to a clustering of the
+        Voronoi nodes. It provides us with a better selection of
+        which points to try in the zeolite. By default, nodes are
+        clustered with k-medoids using minimum-image distances,
+        so that periodic boundary conditions are taken into account
+        (`kmeans` clusters the Cartesian coordinates instead). The
+        best sites are those further away from the zeolite (largest
+        voronoi radius).
     """
 
     PARSER_NAME = "voronoi_cluster"
@@ -136,9 +303,18 @@ class VoronoiClustering(VoronoiSampler):
             the voronoi nodes to lower the number of points \
             being searched"
 
-    def __init__(self, *args, num_clusters=NUM_CLUSTERS, **kwargs):
+    def __init__(
+        self,
+        *args,
+        num_clusters=NUM_CLUSTERS,
+        clustering=CLUSTERING,
+        cluster_seed=CLUSTER_SEED,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
         self.num_clusters = num_clusters
+        self.clustering = clustering
+        self.cluster_seed = cluster_seed
 
     @staticmethod
     def add_arguments(parser):
@@ -149,44 +325,40 @@ class VoronoiClustering(VoronoiSampler):
             help="number of clusters to consider when sampling the structure with voronoi points (default: %(default)s)",
             default=NUM_CLUSTERS,
         )
+        parser.add_argument(
+            "--clustering",
+            type=str,
+            choices=CLUSTERING_CHOICES,
+            help="method used to cluster the voronoi points (default: %(default)s)",
+            default=CLUSTERING,
+        )
+        parser.add_argument(
+            "--cluster_seed",
+            type=int,
+            help="seed of the clustering of voronoi points (default: %(default)s)",
+            default=CLUSTER_SEED,
+        )
 
-    def get_points(self, structure):
-        nodes = self.get_voronoi_nodes(structure)
-
-        def cluster_points(X):
-            num_clusters = min(len(X), self.num_clusters)
-            kmeans = KMeans(n_clusters=num_clusters)
-            kmeans.fit(X)
+    def cluster_points(self, nodes):
+        if self.clustering == "kmeans":
+            num_clusters = min(len(nodes), self.num_clusters)
+            kmeans = KMeans(n_clusters=num_clusters, random_state=self.cluster_seed)
+            kmeans.fit(nodes.cart_coords)
             return kmeans.labels_
 
-        def select_sites(sites, labels):
-            """Gets the best Voronoi sites for each clustering label.
-                This is useful, as we want to minimize the number of
-                attempts during docking.
-            """
-            best_sites = []
-            for i in range(self.num_clusters):
-                sites_cluster = [
-                    site for site, cluster in zip(sites, labels) if cluster == i
-                ]
-
-                if len(sites_cluster) > 0:
-                    best_site = max(
-                        sites_cluster,
-                        key=lambda site: site.properties["voronoi_radius"],
-                    )
-
-                    best_sites.append(best_site)
+        return periodic_kmedoids(
+            nodes.frac_coords, nodes.lattice, self.num_clusters, seed=self.cluster_seed
+        )
 
-            return best_sites
+    def get_points(self, structure, guest=None):
+        nodes = self.get_voronoi_nodes(structure, guest)
 
-        if len(nodes.cart_coords) == 0:
+        if len(nodes) == 0:
             return []
 
-        clusters = cluster_points(nodes.cart_coords)
-        best_sites = select_sites(nodes.sites, clusters)
-
-        if len(best_sites) == 0:
-            return []
+        # the best site of each cluster is the one with largest radius
+        labels = self.cluster_points(nodes)
+        radii = nodes.site_properties["voronoi_radius"]
+        best_sites = select_representatives(labels, radii)
 
-        return [site.coords for site in best_sites]
+        return list(nodes.cart_coords[best_sites])
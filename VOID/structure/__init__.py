@@ -1,2 +1,4 @@
 from .complex import Complex
 from .molecule import MoleculeTransformer
+from .pose import PoseRecord, RigidPose, WalkerPoses, materialize
+from .grid import HostDistanceGrid
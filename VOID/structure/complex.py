@@ -2,15 +2,38 @@ import numpy as np
 from pymatgen.core import Molecule, Structure
 
 from .molecule import MoleculeTransformer
+from .neighbors import NEIGHBOR_CUTOFF, get_neighbor_search
+from .grid import get_distance_field
 from VOID.utils.geometry import random_rotation_matrices
 
 
+HOST_LABEL = "host"
+GUEST_LABEL = "guest"
+
+
 class Complex:
+    __slots__ = ("_host", "_guest", "_cache", "_host_arrays", "add_transform", "_guest_transform")
+
     def __init__(
         self, host, guest, add_transform=True
     ):
         """Constructor for host-guest pair. The `guest_transform` is useful to perform operations on the molecule. It performs all changes in place, meaning that the MoleculeTransformer has to have access to the reference of `self.guest` in order to be effective.
 
+        The transformer is only created the first time `guest_transform`
+        is accessed, and the bonding analysis it relies on is shared by
+        all guests with the same topology (see `MoleculeAnalyzer`).
+
+        Distances between host and guest are memoized, so that several
+        fitness functions evaluated on the same complex share them. The
+        cache is cleared whenever `guest_transform` moves the guest or
+        `host`/`guest` are replaced. Modifying `host` or `guest` in place
+        without the transformer requires calling `invalidate`.
+
+        The arrays describing the host (fractional coordinates, atomic
+        numbers and labels) are kept until `host` is replaced, and the
+        `pose` is built once and kept until the guest moves. Both are
+        shared with the caller and should be treated as read-only.
+
         Args:
             host (Structure)
             guest (Molecule)
@@ -18,32 +41,143 @@ class Complex:
                 operations to the guest
         """
 
-        self.host = host
-        self.guest = guest
-        self.guest_transform = MoleculeTransformer(self.guest) if add_transform else None
+        self._cache = {}
+        self._host_arrays = {}
+        self._host = host
+        self._guest = guest
+        self.add_transform = add_transform
+        self._guest_transform = None
 
     def __len__(self):
         return len(self.host) + len(self.guest)
 
     def copy(self):
-        return Complex(self.host.copy(), self.guest.copy())
+        cpx = Complex(self.host.copy(), self.guest.copy())
+        # the copied host has the same content, so its arrays are reused
+        cpx._host_arrays = self._host_arrays
+        return cpx
 
     @property
-    def pose(self):
-        species = self.host.species + self.guest.species
-        coords = np.concatenate([self.host.cart_coords, self.guest.cart_coords], axis=0)
-        host_props = self.host.site_properties.get("label", ["host"] * len(self.host))
-        guest_props = self.guest.site_properties.get(
-            "label", ["guest"] * len(self.guest)
+    def host(self):
+        return self._host
+
+    @host.setter
+    def host(self, host):
+        self._host = host
+        self._host_arrays = {}
+        self.invalidate()
+
+    @property
+    def guest(self):
+        return self._guest
+
+    @guest.setter
+    def guest(self, guest):
+        self._guest = guest
+        self._guest_transform = None
+        self.invalidate()
+
+    @property
+    def guest_transform(self):
+        if not self.add_transform:
+            return None
+
+        if self._guest_transform is None:
+            self._guest_transform = MoleculeTransformer(self.guest)
+            self._guest_transform.callbacks.append(self.invalidate)
+
+        return self._guest_transform
+
+    def invalidate(self):
+        """Clears the memoized distances of the complex"""
+        self._cache.clear()
+
+    def memoize(self, key, func):
+        """Returns the cached value of `key`, computing it
+            with `func()` if it is not cached yet.
+        """
+        if key not in self._cache:
+            self._cache[key] = func()
+
+        return self._cache[key]
+
+    def get_host_array(self, key, func):
+        """Returns the cached host array `key`, computing it with
+            `func()` if it is not cached yet.
+        """
+        if key not in self._host_arrays:
+            self._host_arrays[key] = func()
+
+        return self._host_arrays[key]
+
+    @property
+    def host_frac_coords(self):
+        return self.get_host_array(
+            "frac_coords", lambda: np.ascontiguousarray(self.host.frac_coords)
         )
-        props = {"label": host_props + guest_props}
+
+    @property
+    def host_numbers(self):
+        return self.get_host_array(
+            "numbers", lambda: np.array(self.host.atomic_numbers, dtype=int)
+        )
+
+    @property
+    def host_labels(self):
+        return self.get_host_array(
+            "labels",
+            lambda: np.array(
+                self.host.site_properties.get("label", [HOST_LABEL] * len(self.host))
+            ),
+        )
+
+    @property
+    def guest_coords(self):
+        return self.guest.cart_coords
+
+    @property
+    def guest_numbers(self):
+        return self.memoize(
+            "guest_numbers", lambda: np.array(self.guest.atomic_numbers, dtype=int)
+        )
+
+    @property
+    def guest_labels(self):
+        return self.memoize(
+            "guest_labels",
+            lambda: np.array(
+                self.guest.site_properties.get("label", [GUEST_LABEL] * len(self.guest))
+            ),
+        )
+
+    @property
+    def labels(self):
+        """Labels of the sites of the `pose`, host first"""
+        return np.concatenate([self.host_labels, self.guest_labels])
+
+    @property
+    def frac_coords(self):
+        """(N + M, 3) fractional coordinates of the sites of the `pose`"""
+        return np.concatenate(
+            [self.host_frac_coords, self.to_frac_coords(self.guest_coords)], axis=0
+        )
+
+    @property
+    def pose(self):
+        """Host and guest as a single `Structure`, built on first access
+            and cached until the guest moves.
+        """
+        return self.memoize("pose", self.build_pose)
+
+    def build_pose(self):
+        species = self.get_host_array("species", lambda: list(self.host.species))
+        lattice = self.host.lattice
 
         return Structure(
-            species=species,
-            coords=coords,
-            coords_are_cartesian=True,
-            lattice=self.host.lattice.matrix,
-            site_properties=props,
+            lattice,
+            species + self.guest.species,
+            self.frac_coords,
+            site_properties={"label": self.labels.tolist()},
         )
 
     @property
@@ -54,6 +188,12 @@ class Complex:
         return self.get_distance_matrix(structure="complex")
 
     def get_distance_matrix(self, structure="complex"):
+        return self.memoize(
+            ("distance_matrix", structure),
+            lambda: self.compute_distance_matrix(structure),
+        )
+
+    def compute_distance_matrix(self, structure="complex"):
         if structure == "complex":
             return self.host.lattice.get_all_distances(
                 self.host.frac_coords, self.to_frac_coords(self.guest.cart_coords)
@@ -68,6 +208,42 @@ class Complex:
         else:
             raise ValueError("invalid structure name")
 
+    def get_neighbor_search(self, cutoff=NEIGHBOR_CUTOFF):
+        """Returns the periodic neighbor search of the host. The search
+            is built once per host and shared between complexes.
+        """
+        return get_neighbor_search(self.host.frac_coords, self.host.lattice, cutoff)
+
+    def min_distance(self, grid_spacing=None, grid_cache=None):
+        """Returns the minimum distance between the host and the guest.
+            If `grid_spacing` is given, the distance is interpolated from
+            a `HostDistanceGrid` (see `VOID.structure.grid`).
+        """
+        def compute():
+            field = get_distance_field(
+                self.host.frac_coords, self.host.lattice, grid_spacing, grid_cache
+            )
+            return field.min_distance(self.guest.cart_coords)
+
+        return self.memoize(("min_distance", grid_spacing), compute)
+
+    def pairs_within(self, radius):
+        """Returns the (host, guest) pairs of atoms closer than `radius`.
+            See `PeriodicNeighborSearch.pairs_within`.
+        """
+        def compute():
+            search = self.get_neighbor_search(max(radius, NEIGHBOR_CUTOFF))
+            return search.pairs_within(self.guest.cart_coords, radius)
+
+        return self.memoize(("pairs_within", radius), compute)
+
+    def any_within(self, radius):
+        """Returns True if any host-guest pair is closer than `radius`"""
+        if ("min_distance", None) in self._cache:
+            return self._cache[("min_distance", None)] < radius
+
+        return self.get_neighbor_search().any_within(self.guest.cart_coords, radius)
+
     def to_frac_coords(self, coords):
         return self.host.lattice.get_fractional_coords(coords.reshape(-1, 3)).reshape(
             coords.shape
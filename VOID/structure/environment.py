@@ -0,0 +1,97 @@
+import numpy as np
+
+from .neighbors import NEIGHBOR_CUTOFF, get_neighbor_search
+from VOID.utils.cache import LRUCache, array_key
+
+
+_ENVIRONMENT_CACHE = LRUCache(max_entries=32)
+
+
+class HostEnvironment:
+    def __init__(self, coords, indices, point, radius, host_frac, lattice):
+        """Host atoms around a docking point. Periodic images are resolved
+            once, so that distances to guests placed at the point are plain
+            Euclidean distances to a few local atoms. Distances which may
+            depend on atoms outside of the environment are computed with
+            the full host instead.
+
+        Args:
+            coords (np.ndarray): (L, 3) Cartesian coordinates of the host
+                atoms (or their images) within `radius` of `point`,
+                relative to `point`
+            indices (np.ndarray): (L, ) index of each atom in the host
+            point (np.ndarray): (3, ) docking point
+            radius (float): radius of the environment
+            host_frac (np.ndarray): (N, 3) fractional coordinates of the host
+            lattice (Lattice): lattice of the host
+        """
+        self.coords = coords
+        self.indices = indices
+        self.point = point
+        self.radius = radius
+        self.host_frac = host_frac
+        self.lattice = lattice
+
+    def __len__(self):
+        return len(self.coords)
+
+    @classmethod
+    def from_point(cls, host_frac, lattice, point, radius):
+        search = get_neighbor_search(host_frac, lattice, max(radius, NEIGHBOR_CUTOFF))
+        wrapped = search.wrap(point)[0]
+        idx = np.array(search.tree.query_ball_point(wrapped, radius), dtype=int)
+
+        coords = search.tree.data[idx] - wrapped
+        return cls(coords, search.indices[idx], point, radius, host_frac, lattice)
+
+    def distances(self, guest_batch):
+        """Returns the (B, M, L) distances between the guest atoms and
+            the atoms of the environment.
+
+        Args:
+            guest_batch (np.ndarray): (B, M, 3) Cartesian coordinates of the
+                guests relative to the docking point
+        """
+        sq_guest = np.einsum("bmi,bmi->bm", guest_batch, guest_batch)
+        sq_host = np.einsum("li,li->l", self.coords, self.coords)
+        cross = guest_batch @ self.coords.T
+
+        distances = sq_guest[..., None] + sq_host - 2 * cross
+        return np.sqrt(np.maximum(distances, 0))
+
+    def min_distances(self, guest_batch):
+        """Returns the (B, ) minimum host-guest distance of each guest. A
+            local minimum smaller than `radius` minus the extent of the
+            guest is exact; the other guests are compared to the full host.
+        """
+        if len(self) == 0:
+            distances = np.full(len(guest_batch), np.inf)
+        else:
+            distances = self.distances(guest_batch).min(axis=(1, 2))
+
+        extent = np.linalg.norm(guest_batch, axis=-1).max(axis=1)
+        inexact = distances > self.radius - extent
+
+        if inexact.any():
+            search = get_neighbor_search(self.host_frac, self.lattice)
+            coords = guest_batch[inexact] + self.point
+            distances[inexact] = (
+                search.nearest_distances(coords.reshape(-1, 3))
+                .reshape(coords.shape[:2])
+                .min(axis=1)
+            )
+
+        return distances
+
+
+def get_host_environment(host_frac, lattice, point, radius):
+    """Returns the `HostEnvironment` of a docking point, cached by content"""
+    key = array_key(host_frac, lattice.matrix, np.asarray(point, dtype=float), radius=radius)
+    environment = _ENVIRONMENT_CACHE.get(key)
+
+    if environment is None:
+        environment = _ENVIRONMENT_CACHE.put(
+            key, HostEnvironment.from_point(host_frac, lattice, point, radius)
+        )
+
+    return environment
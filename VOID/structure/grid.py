@@ -0,0 +1,142 @@
+import numpy as np
+from pymatgen.core import Lattice
+
+from .neighbors import PeriodicNeighborSearch, get_neighbor_search
+from VOID.utils.cache import DiskCache, LRUCache, array_key
+
+
+GRID_SPACING = 0.2
+GRID_CUTOFF = 10.0
+
+_GRID_CACHE = LRUCache()
+
+
+class HostDistanceGrid:
+    def __init__(self, values, lattice, spacing=GRID_SPACING):
+        """Distance between each point of the unit cell and the closest
+            host atom, tabulated on a periodic grid. For rigid hosts,
+            the distance field is computed once and the distance of any
+            guest atom to the host is obtained by trilinear interpolation.
+            Interpolated distances are lowered by a bound of the
+            interpolation error, so that they never overestimate the
+            exact distance and clashes are never accepted.
+
+        Args:
+            values (np.ndarray): (na, nb, nc) distances at the grid points
+                i / na, j / nb, k / nc (fractional coordinates)
+            lattice (Lattice): lattice of the host
+            spacing (float): approximate grid spacing (in Å)
+        """
+        self.values = values
+        self.lattice = lattice
+        self.spacing = spacing
+
+        self.shape = np.array(values.shape)
+        self.inv_matrix = np.linalg.inv(lattice.matrix)
+
+        # squared length of the edges of a grid cell
+        self.sq_steps = (np.linalg.norm(lattice.matrix, axis=1) / self.shape) ** 2
+
+    @classmethod
+    def from_coords(cls, frac_coords, lattice, spacing=GRID_SPACING):
+        shape = np.maximum(np.ceil(np.array(lattice.abc) / spacing), 1).astype(int)
+
+        axes = [np.arange(n) / n for n in shape]
+        grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+        search = PeriodicNeighborSearch(frac_coords, lattice, cutoff=GRID_CUTOFF)
+        values = search.nearest_distances(lattice.get_cartesian_coords(grid))
+
+        return cls(values.reshape(shape), lattice, spacing)
+
+    @classmethod
+    def from_structure(cls, structure, spacing=GRID_SPACING):
+        return cls.from_coords(structure.frac_coords, structure.lattice, spacing)
+
+    def as_dict(self):
+        return {
+            "values": self.values,
+            "matrix": self.lattice.matrix,
+            "spacing": np.array(self.spacing),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["values"], Lattice(data["matrix"]), float(data["spacing"]))
+
+    def save(self, path):
+        np.savez_compressed(path, **self.as_dict())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls.from_dict(data)
+
+    def nearest_distances(self, coords):
+        """Interpolates the distance between each point in `coords`
+            and its closest host atom, minus the interpolation error.
+
+            As the distance field is 1-Lipschitz, the interpolated value
+            exceeds the exact distance by at most the weighted distance
+            to the corners of the grid cell, which is bounded by
+            sqrt(sum_a t_a (1 - t_a) |v_a|^2), with t_a the position of
+            the point along the cell edge v_a. The bound vanishes at the
+            grid points and is at most half the cell diagonal
+            (spacing * sqrt(3) / 2 for cubic cells).
+        """
+        frac = (np.asarray(coords).reshape(-1, 3) @ self.inv_matrix) % 1.0
+        scaled = frac * self.shape
+
+        lower = np.floor(scaled).astype(int)
+        weight = scaled - lower
+        lower %= self.shape
+        upper = (lower + 1) % self.shape
+
+        distances = np.zeros(len(frac))
+        for corner in np.ndindex(2, 2, 2):
+            corner = np.array(corner, dtype=bool)
+            idx = np.where(corner, upper, lower)
+            w = np.where(corner, weight, 1 - weight).prod(axis=1)
+            distances += w * self.values[idx[:, 0], idx[:, 1], idx[:, 2]]
+
+        error = np.sqrt((weight * (1 - weight)) @ self.sq_steps)
+        return np.maximum(distances - error, 0.0)
+
+    def min_distance(self, coords):
+        return self.nearest_distances(coords).min()
+
+
+def get_distance_grid(frac_coords, lattice, spacing=GRID_SPACING, cache_dir=None):
+    """Returns the `HostDistanceGrid` of the given host. Grids are cached
+        in memory by content and, if `cache_dir` is given, also stored
+        on disk to be reused by later runs.
+    """
+    key = array_key(frac_coords, lattice.matrix, spacing=spacing)
+    grid = _GRID_CACHE.get(key)
+
+    if grid is not None:
+        return grid
+
+    disk_cache = None if cache_dir is None else DiskCache(cache_dir, prefix="grid")
+    data = None if disk_cache is None else disk_cache.get(key)
+
+    if data is not None:
+        grid = HostDistanceGrid.from_dict(data)
+    else:
+        grid = HostDistanceGrid.from_coords(frac_coords, lattice, spacing)
+
+        if disk_cache is not None:
+            disk_cache.put(key, **grid.as_dict())
+
+    return _GRID_CACHE.put(key, grid)
+
+
+def get_distance_field(frac_coords, lattice, grid_spacing=None, cache_dir=None):
+    """Returns the object used to compute host-guest minimum distances:
+        an exact `PeriodicNeighborSearch` if `grid_spacing` is None,
+        or an interpolated `HostDistanceGrid` otherwise.
+    """
+    if grid_spacing is None:
+        return get_neighbor_search(frac_coords, lattice)
+
+    return get_distance_grid(frac_coords, lattice, grid_spacing, cache_dir)
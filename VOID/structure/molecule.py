@@ -5,26 +5,103 @@ from pymatgen.core import Molecule
 from pymatgen.analysis.local_env import JmolNN
 from pymatgen.analysis.graphs import MoleculeGraph
 
+from .topology import get_guest_topology
+from VOID.utils.cache import LRUCache
+
 
 HYDROGEN_CUTOFF = 1.2
 
+_GRAPH_CACHE = LRUCache(max_entries=32)
+
+
+class MoleculeGraphAnalysis:
+    def __init__(self, molecule):
+        """Molecular graph of a guest, with its rings and bonds. The graph
+            is built from a copy of the molecule and only depends on its
+            bonding, so a single analysis is shared (and never copied) by
+            all poses of a guest (see `get_graph_analysis`).
+
+            `molgraph.molecule` is a snapshot of the first guest analyzed
+            and does not follow any later move. Only the connectivity
+            of the graph should be used; coordinates have to be read
+            from the molecule itself.
+
+        Args:
+            molecule (Molecule)
+        """
+        self.molgraph = MoleculeGraph.with_local_env_strategy(molecule.copy(), JmolNN())
+        self.rings = list(nx.algorithms.cycles.cycle_basis(nx.Graph(self.molgraph.graph)))
+        self.bonds = list(self.molgraph.graph.edges(data=False))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def get_graph_analysis(molecule, topology=None):
+    """Returns the `MoleculeGraphAnalysis` of `molecule`, cached by the
+        key of its `GuestTopology`.
+    """
+    if topology is None:
+        topology = get_guest_topology(molecule)
+
+    analysis = _GRAPH_CACHE.get(topology.key)
+    if analysis is None:
+        analysis = _GRAPH_CACHE.put(topology.key, MoleculeGraphAnalysis(molecule))
+
+    return analysis
+
 
 class MoleculeAnalyzer:
-    """Assorted tools to analyze a molecule and its parts"""
+    """Assorted tools to analyze a molecule and its parts. The bonding
+        is analyzed on first use and shared by all molecules with the
+        same topology, so rigid-body moves never recompute it.
+    """
 
     def __init__(self, molecule):
         self.mol = molecule
         self.update_properties()
 
     def update_properties(self):
-        self.molgraph = MoleculeGraph.with_local_env_strategy(self.mol, JmolNN())
-        # self.rings = self.molgraph.find_rings()
-        self.rings = self.find_rings()
-        self.bonds = self.molgraph.graph.edges(data=False)
+        """Forgets the analysis of the molecule. Has to be called
+            whenever the bonding of the molecule changes.
+        """
+        self._topology = None
+
+    @property
+    def topology(self):
+        """Covalent-radii bonding analysis (bond orders, valences and
+            likely cations) of the molecule
+        """
+        if self._topology is None:
+            self._topology = get_guest_topology(self.mol)
+
+        return self._topology
+
+    @property
+    def graph_analysis(self):
+        return get_graph_analysis(self.mol, self.topology)
+
+    @property
+    def molgraph(self):
+        """Shared `MoleculeGraph` of the guest topology. Its molecule is a
+            snapshot which is not moved with `mol`, so it must only be
+            used for the connectivity, never for coordinates.
+        """
+        return self.graph_analysis.molgraph
+
+    @property
+    def rings(self):
+        return self.graph_analysis.rings
+
+    @property
+    def bonds(self):
+        return self.graph_analysis.bonds
 
     def find_rings(self):
-        G = nx.Graph(self.molgraph.graph)
-        return list(nx.algorithms.cycles.cycle_basis(G))
+        return self.rings
 
     def get_twistable_bonds(self):
         bonds = [[u, v] for u, v in self.bonds if self.is_twistable(u, v)]
@@ -73,7 +150,20 @@ class MoleculeAnalyzer:
 
 class MoleculeTransformer(MoleculeAnalyzer):
     def __init__(self, molecule):
+        """Applies in-place operations to a molecule.
+
+        Args:
+            molecule (Molecule)
+
+        Functions in `callbacks` are called without arguments
+        every time the molecule is modified.
+        """
         super().__init__(molecule)
+        self.callbacks = []
+
+    def on_change(self):
+        for callback in self.callbacks:
+            callback()
 
     def rotate(self, axis=None, theta=None, anchor=None, indices=None):
         if anchor is None:
@@ -86,6 +176,7 @@ class MoleculeTransformer(MoleculeAnalyzer):
             theta = 2 * np.pi * np.random.uniform()
 
         self.mol.rotate_sites(indices=indices, axis=axis, theta=theta, anchor=anchor)
+        self.on_change()
         return self.mol
 
     def translate(self, vector=None):
@@ -93,29 +184,78 @@ class MoleculeTransformer(MoleculeAnalyzer):
             vector = np.random.randn(3)
 
         self.mol.translate_sites(vector=vector)
+        self.on_change()
         return self.mol
 
     def twist_bond(self, bond=None, theta=None):
-        if bond is None:
-            bond = random.sample(self.get_twistable_bonds(), 1)[0]
+        """Rotates the smaller fragment of a bond around it. The rotatable
+            bonds and their fragments are looked up in the `TorsionTable`
+            of the guest topology, which is computed once. Guests without
+            rotatable bonds twist a random bond outside rings, as do
+            explicitly given bonds which are not in the table.
+        """
+        torsions = self.topology.torsions
+
+        if bond is None and len(torsions) > 0:
+            bond = torsions.bonds[random.randrange(len(torsions))]
 
-        axis = self.mol[bond[0]].coords - self.mol[bond[1]].coords
-        anchor = self.mol[bond[0]].coords
+        elif bond is None:
+            bonds = self.get_twistable_bonds()
+            if len(bonds) == 0:
+                return self.mol
 
-        subgraphs = self.molgraph.split_molecule_subgraphs([bond], allow_reverse=True)
-        fragment = random.sample(subgraphs, 1)[0]
-        indices = [self.mol.index(site) for site in fragment.molecule]
+            bond = random.choice(bonds)
+
+        u, v, indices = self.get_twist_fragment(bond)
+        axis = self.mol[v].coords - self.mol[u].coords
+        anchor = self.mol[u].coords
+
+        self.rotate(axis=axis, theta=theta, anchor=anchor, indices=indices)
+
+        # twisting can bring atoms close enough to change the bonding
+        self.update_properties()
+        return self.mol
 
-        return self.rotate(axis=axis, theta=theta, anchor=anchor, indices=indices)
+    def get_twist_fragment(self, bond):
+        """Returns the fixed atom u, the moving atom v and the indices of
+            the atoms moved by twisting `bond`, i.e. the smaller of the two
+            fragments obtained by breaking it.
+        """
+        torsions = self.topology.torsions
+        try:
+            idx = torsions.find(bond)
+            u, v = torsions.bonds[idx]
+            return u, v, np.flatnonzero(torsions.masks[idx]).tolist()
+        except ValueError:
+            pass
+
+        u, v = bond
+        graph = nx.Graph(self.molgraph.graph)
+        if not graph.has_edge(u, v):
+            raise ValueError(f"atoms {u} and {v} are not bonded")
+
+        graph.remove_edge(u, v)
+        fragment = nx.node_connected_component(graph, v)
+        if u in fragment:
+            raise ValueError(f"bond {bond} belongs to a ring")
+
+        if len(fragment) > len(self.mol) / 2:
+            u, v = v, u
+            fragment = set(range(len(self.mol))) - fragment
+
+        return u, v, sorted(fragment)
 
     def substitute(self, fragment, atom=None):
         """Replaces the given atom by fragment"""
         if atom is None:
             atom = random.sample(self.get_hydrogens(), 1)[0]
 
-        self.molgraph.substitute_group(atom, fragment, JmolNN)
+        # the shared graph is not modified, as it belongs to another molecule
+        molgraph = MoleculeGraph.with_local_env_strategy(self.mol, JmolNN())
+        molgraph.substitute_group(atom, fragment, JmolNN)
 
         self.update_properties()
+        self.on_change()
 
         return self.mol
 
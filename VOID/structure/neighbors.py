@@ -0,0 +1,138 @@
+import itertools
+import numpy as np
+from scipy.spatial import cKDTree
+
+from VOID.utils.cache import LRUCache, array_key
+
+
+NEIGHBOR_CUTOFF = 5.0
+FALLBACK_CHUNK = 4096
+
+_SEARCH_CACHE = LRUCache()
+
+
+class PeriodicNeighborSearch:
+    def __init__(self, frac_coords, lattice, cutoff=NEIGHBOR_CUTOFF):
+        """Neighbor search for periodic structures. The atoms of the
+            structure are padded with their periodic images up to a
+            distance `cutoff` from the unit cell and stored in a KD-tree.
+            Any point inside the unit cell can then be queried for its
+            neighbors within `cutoff` without building a dense distance
+            matrix.
+
+        Args:
+            frac_coords (np.ndarray): (N, 3) fractional coordinates of the atoms
+            lattice (Lattice): lattice of the structure
+            cutoff (float): maximum distance (in Å) answered by the tree.
+                Nearest-neighbor queries beyond it fall back to dense
+                periodic distances.
+        """
+        self.frac_coords = np.asarray(frac_coords) % 1.0
+        self.lattice = lattice
+        self.cutoff = cutoff
+
+        self.inv_matrix = np.linalg.inv(lattice.matrix)
+        self.indices, padded = self.pad_images()
+        self.tree = cKDTree(padded @ lattice.matrix)
+
+    def pad_images(self):
+        """Returns the periodic images of the atoms which lie within
+            `cutoff` of the unit cell and the original index of each image.
+        """
+        # fractional width corresponding to `cutoff` along each axis
+        pad = self.cutoff * np.linalg.norm(self.inv_matrix, axis=0)
+        ranges = [range(-int(np.ceil(p)), int(np.ceil(p)) + 1) for p in pad]
+        images = np.array(list(itertools.product(*ranges)))
+
+        padded = self.frac_coords[None, :, :] + images[:, None, :]
+        mask = np.all((padded >= -pad) & (padded < 1 + pad), axis=-1)
+
+        indices = np.broadcast_to(np.arange(len(self.frac_coords)), mask.shape)
+
+        return indices[mask], padded[mask]
+
+    def wrap(self, coords):
+        """Brings Cartesian coordinates back to the unit cell"""
+        frac = (np.asarray(coords).reshape(-1, 3) @ self.inv_matrix) % 1.0
+        return frac @ self.lattice.matrix
+
+    def nearest_distances(self, coords):
+        """Returns the distance between each point in `coords` and
+            its closest atom.
+        """
+        coords = np.asarray(coords).reshape(-1, 3)
+        distances, _ = self.tree.query(
+            self.wrap(coords), k=1, distance_upper_bound=self.cutoff
+        )
+
+        far = np.flatnonzero(np.isinf(distances))
+        for i in range(0, len(far), FALLBACK_CHUNK):
+            idx = far[i : i + FALLBACK_CHUNK]
+            distances[idx] = self.lattice.get_all_distances(
+                self.frac_coords, coords[idx] @ self.inv_matrix
+            ).min(axis=0)
+
+        return distances
+
+    def min_distance(self, coords):
+        return self.nearest_distances(coords).min()
+
+    def pairs_within(self, coords, radius):
+        """Returns all (atom, point) pairs closer than `radius`.
+
+        Returns:
+            atom_idx (np.ndarray): indices of the atoms of the structure
+            point_idx (np.ndarray): indices of the points in `coords`
+            distances (np.ndarray): minimum-image distance of each pair
+        """
+        if radius > self.cutoff:
+            raise ValueError("radius larger than the cutoff of the neighbor search")
+
+        wrapped = self.wrap(coords)
+        neighbors = self.tree.query_ball_point(wrapped, radius)
+
+        point_idx = np.repeat(
+            np.arange(len(wrapped)), [len(nbrs) for nbrs in neighbors]
+        ).astype(int)
+        padded_idx = np.array(
+            [i for nbrs in neighbors for i in nbrs], dtype=int
+        )
+        distances = np.linalg.norm(
+            self.tree.data[padded_idx] - wrapped[point_idx], axis=-1
+        )
+        atom_idx = self.indices[padded_idx]
+
+        # keeps only the closest image of each pair
+        order = np.lexsort((distances, atom_idx, point_idx))
+        atom_idx, point_idx, distances = (
+            atom_idx[order], point_idx[order], distances[order]
+        )
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (np.diff(atom_idx) != 0) | (np.diff(point_idx) != 0)
+
+        return atom_idx[first], point_idx[first], distances[first]
+
+    def any_within(self, coords, radius):
+        """Returns True if any atom is closer than `radius` to any point"""
+        if radius > self.cutoff:
+            return self.min_distance(coords) < radius
+
+        distances, _ = self.tree.query(
+            self.wrap(coords), k=1, distance_upper_bound=radius
+        )
+        return bool(np.isfinite(distances).any())
+
+
+def get_neighbor_search(frac_coords, lattice, cutoff=NEIGHBOR_CUTOFF):
+    """Returns a `PeriodicNeighborSearch` for the given structure. Searches
+        are cached by content, so the tree is built only once per host.
+    """
+    key = array_key(frac_coords, lattice.matrix, cutoff=cutoff)
+    search = _SEARCH_CACHE.get(key)
+
+    if search is None:
+        search = _SEARCH_CACHE.put(
+            key, PeriodicNeighborSearch(frac_coords, lattice, cutoff)
+        )
+
+    return search
@@ -0,0 +1,162 @@
+import numpy as np
+from pymatgen.core import Molecule, Structure
+
+from .complex import Complex
+
+
+class PoseRecord:
+    def __init__(self, host, guest, point, rotation, score=None, conformer=None):
+        """Lightweight description of a docked pose. Instead of copying
+            the host and the guest for every attempt, the record keeps
+            references to the original structures and only stores how
+            the pose was obtained. The `Complex` is built on demand with
+            `to_complex`.
+
+        Args:
+            host (Structure): host shared by all poses of a docker
+            guest (Molecule): reference guest shared by all poses
+            point (np.ndarray): (3, ) docking point. The host is translated
+                by `-point` when the complex is materialized.
+            rotation (np.ndarray): (3, 3) rotation applied to the guest
+            score (float): fitness of the pose, if already computed
+            conformer (np.ndarray): (M, 3) coordinates of the guest before
+                the rotation, for flexible guests. If None, the
+                coordinates of `guest` are used.
+        """
+        self.host = host
+        self.guest = guest
+        self.point = point
+        self.rotation = rotation
+        self.score = score
+        self.conformer = conformer
+
+    def __len__(self):
+        return len(self.host) + len(self.guest)
+
+    @property
+    def host_coords(self):
+        return self.host.cart_coords - self.point
+
+    @property
+    def guest_coords(self):
+        coords = self.guest.cart_coords if self.conformer is None else self.conformer
+        return coords @ self.rotation.T
+
+    def to_complex(self):
+        host = Structure(
+            species=self.host.species,
+            coords=self.host_coords,
+            lattice=self.host.lattice.matrix,
+            coords_are_cartesian=True,
+        )
+        guest = Molecule(species=self.guest.species, coords=self.guest_coords)
+
+        return Complex(host, guest, add_transform=False)
+
+
+def materialize(pose):
+    """Returns the `Complex` described by `pose`. Complexes are
+        returned unchanged.
+    """
+    if isinstance(pose, PoseRecord):
+        return pose.to_complex()
+
+    return pose
+
+
+class RigidPose:
+    def __init__(self, host, guest, coords=None):
+        """Mutable pose of a rigid guest, used by the Monte Carlo dockers.
+            The guest coordinates live in a preallocated array which is
+            modified in place. `save` keeps a copy of the coordinates
+            before a move, so that rejected moves are reverted with `undo`
+            without copying the host, the guest or any of their graphs.
+
+        Args:
+            host (Structure): host shared by all poses
+            guest (Molecule): reference guest
+            coords (np.ndarray): (M, 3) Cartesian coordinates of the guest.
+                If None, the coordinates of `guest` are used.
+        """
+        self.host = host
+        self.guest = guest
+        self.host_frac = host.frac_coords
+
+        if coords is None:
+            coords = guest.cart_coords
+
+        self.coords = np.array(coords, dtype=float)
+        self.saved = self.coords.copy()
+        self.buffer = np.empty_like(self.coords)
+
+        masses = np.array([site.specie.atomic_mass for site in guest])
+        self.mass_weights = masses / masses.sum()
+
+    def __len__(self):
+        return len(self.host) + len(self.guest)
+
+    @classmethod
+    def from_complex(cls, cpx):
+        return cls(cpx.host, cpx.guest)
+
+    @property
+    def center_of_mass(self):
+        return self.mass_weights @ self.coords
+
+    def save(self):
+        np.copyto(self.saved, self.coords)
+
+    def undo(self):
+        np.copyto(self.coords, self.saved)
+
+    def translate(self, vector):
+        self.coords += vector
+
+    def rotate(self, matrix, anchor=None):
+        """Rotates the guest by `matrix` around `anchor` (by default,
+            its center of mass).
+        """
+        if anchor is None:
+            anchor = self.center_of_mass
+
+        anchor = anchor[..., None, :]
+
+        np.subtract(self.coords, anchor, out=self.buffer)
+        np.matmul(self.buffer, matrix.swapaxes(-1, -2), out=self.coords)
+        self.coords += anchor
+
+    def to_complex(self):
+        guest = Molecule(species=self.guest.species, coords=self.coords.copy())
+        return Complex(self.host, guest, add_transform=False)
+
+
+class WalkerPoses(RigidPose):
+    def __init__(self, host, guest, num_walkers):
+        """Poses of `num_walkers` independent copies of a rigid guest,
+            stored as a single (W, M, 3) array. Moves take one vector
+            (or rotation matrix) per walker, and `undo` reverts only
+            the walkers whose moves were rejected.
+        """
+        coords = np.repeat(guest.cart_coords[None], num_walkers, axis=0)
+        super().__init__(host, guest, coords)
+
+    @property
+    def num_walkers(self):
+        return len(self.coords)
+
+    def undo(self, rejected=None):
+        if rejected is None:
+            return super().undo()
+
+        np.copyto(self.coords, self.saved, where=rejected[:, None, None])
+
+    def translate(self, vectors):
+        """Translates each walker by its own (3, ) vector"""
+        self.coords += vectors[:, None, :]
+
+    def to_complex(self, walker=0):
+        guest = Molecule(species=self.guest.species, coords=self.coords[walker].copy())
+        return Complex(self.host, guest, add_transform=False)
+
+    def to_complexes(self):
+        return [self.to_complex(walker) for walker in range(self.num_walkers)]
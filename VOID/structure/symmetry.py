@@ -0,0 +1,142 @@
+import numpy as np
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+
+from VOID.utils.cache import LRUCache, array_key
+from VOID.utils.geometry import periodic_distances
+
+
+SYMPREC = 0.1
+
+_OPERATIONS_CACHE = LRUCache()
+
+
+class HostSymmetry:
+    def __init__(self, rotations, translations, lattice, symprec=SYMPREC):
+        """Proper symmetry operations of a host. Improper operations
+            (mirrors, inversion) are left out, as they would turn a
+            guest into its mirror image.
+
+        Args:
+            rotations (np.ndarray): (K, 3, 3) rotations in fractional coordinates
+            translations (np.ndarray): (K, 3) translations in fractional coordinates
+            lattice (Lattice): lattice of the host
+            symprec (float): tolerance (in Å) to consider two points equivalent
+        """
+        self.rotations = rotations
+        self.translations = translations
+        self.lattice = lattice
+        self.symprec = symprec
+
+    def __len__(self):
+        return len(self.rotations)
+
+    @classmethod
+    def from_structure(cls, structure, symprec=SYMPREC):
+        analyzer = SpacegroupAnalyzer(structure, symprec=symprec)
+        operations = [
+            op
+            for op in analyzer.get_symmetry_operations(cartesian=False)
+            if np.linalg.det(op.rotation_matrix) > 0
+        ]
+
+        rotations = np.array([op.rotation_matrix for op in operations])
+        translations = np.array([op.translation_vector for op in operations])
+
+        return cls(rotations, translations, structure.lattice, symprec)
+
+    def get_images(self, frac_coords):
+        """Returns the (K, N, 3) images of the points under each operation"""
+        images = np.einsum("kij,nj->kni", self.rotations, frac_coords)
+        return (images + self.translations[:, None, :]) % 1.0
+
+    def get_cartesian_operations(self):
+        """Returns the operations in Cartesian coordinates as
+            (K, 3, 3) rotations and (K, 3) translations.
+        """
+        matrix = self.lattice.matrix
+        rotations = matrix.T @ self.rotations @ np.linalg.inv(matrix.T)
+        translations = self.translations @ matrix
+
+        return rotations, translations
+
+    def reduce_points(self, points):
+        """Keeps one point for each set of symmetry-equivalent points.
+
+        Args:
+            points (np.ndarray): (N, 3) Cartesian coordinates of the points
+
+        Returns:
+            unique (np.ndarray): (U, 3) symmetry-distinct points
+            multiplicity (np.ndarray): (U, ) number of points represented
+                by each of the unique points
+        """
+        points = np.asarray(points).reshape(-1, 3)
+        if len(points) == 0:
+            return points, np.zeros(0, dtype=int)
+
+        frac = self.lattice.get_fractional_coords(points)
+        images = self.get_images(frac)
+
+        # equivalent[i, j] is True if point i is an image of point j
+        distances = periodic_distances(frac, images.reshape(-1, 3), self.lattice.matrix)
+        distances = distances.reshape(len(frac), len(self), len(frac))
+        equivalent = (distances < self.symprec).any(axis=1)
+
+        kept = []
+        for i in range(len(frac)):
+            if not equivalent[i, kept].any():
+                kept.append(i)
+
+        # each point is represented by the first unique point equivalent to it
+        representative = equivalent[:, kept].argmax(axis=1)
+        multiplicity = np.bincount(representative, minlength=len(kept))
+
+        return points[kept], multiplicity
+
+    def expand_pose(self, point, rotation):
+        """Returns the poses equivalent by symmetry to the guest rotated
+            by `rotation` and placed at `point`. Poses which coincide
+            are only returned once.
+
+        Returns:
+            points (np.ndarray): (P, 3) docking points
+            rotations (np.ndarray): (P, 3, 3) rotations of the guest
+        """
+        cart_rotations, cart_translations = self.get_cartesian_operations()
+
+        points = np.einsum("kij,j->ki", cart_rotations, point) + cart_translations
+        rotations = cart_rotations @ rotation
+
+        # brings the points back to the unit cell to find duplicates
+        frac = self.lattice.get_fractional_coords(points) % 1.0
+        points = self.lattice.get_cartesian_coords(frac)
+
+        keys = np.concatenate(
+            [
+                np.round(points / self.symprec),
+                np.round(rotations.reshape(len(points), -1) / self.symprec),
+            ],
+            axis=1,
+        )
+        _, idx = np.unique(keys, axis=0, return_index=True)
+        idx = np.sort(idx)
+
+        return points[idx], rotations[idx]
+
+
+def get_host_symmetry(structure, symprec=SYMPREC):
+    """Returns the `HostSymmetry` of `structure`, cached by content"""
+    key = array_key(
+        structure.frac_coords,
+        structure.lattice.matrix,
+        np.array(structure.atomic_numbers),
+        symprec=symprec,
+    )
+    symmetry = _OPERATIONS_CACHE.get(key)
+
+    if symmetry is None:
+        symmetry = _OPERATIONS_CACHE.put(
+            key, HostSymmetry.from_structure(structure, symprec)
+        )
+
+    return symmetry
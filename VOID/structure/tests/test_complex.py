@@ -35,9 +35,72 @@ class TestComplex(ut.TestCase):
         dm = self.complex.distance_matrix
         self.assertEqual(dm.shape, (72, 47))
 
+    def test_distance_cache(self):
+        dm = self.complex.distance_matrix
+        min_dist = self.complex.min_distance()
+        self.assertIs(self.complex.distance_matrix, dm)
+        self.assertEqual(self.complex.min_distance(), min_dist)
+
+        self.complex.guest_transform.translate(np.array([0, 0, 1]))
+        newdm = self.complex.distance_matrix
+        self.assertIsNot(newdm, dm)
+
+        ref = Complex(self.host, self.complex.guest.copy(), add_transform=False)
+        self.assertTrue(np.allclose(newdm, ref.compute_distance_matrix("complex")))
+        self.assertAlmostEqual(self.complex.min_distance(), newdm.min())
+
+    def test_replace_guest(self):
+        dm = self.complex.distance_matrix
+        self.complex.guest = self.guest.copy()
+        self.assertIsNot(self.complex.distance_matrix, dm)
+
+    def test_lazy_transform(self):
+        self.assertIsNone(self.complex._guest_transform)
+
+        transformer = self.complex.guest_transform
+        self.assertIs(transformer.mol, self.complex.guest)
+        self.assertIs(self.complex.guest_transform, transformer)
+
+        # moved copies share the bonding analysis
+        copy = self.complex.copy()
+        copy.guest_transform.translate(np.array([0, 0, 1]))
+        self.assertIs(copy.guest_transform.molgraph, transformer.molgraph)
+
+        self.complex.guest = self.guest.copy()
+        self.assertIs(self.complex.guest_transform.mol, self.complex.guest)
+
+        cpx = Complex(self.host, self.guest, add_transform=False)
+        self.assertIsNone(cpx.guest_transform)
+
     def test_pose(self):
         self.assertEqual(len(self.complex.pose), 119)
 
+    def test_pose_cache(self):
+        pose = self.complex.pose
+        self.assertIs(self.complex.pose, pose)
+
+        host_frac = self.complex.host_frac_coords
+        self.complex.guest_transform.translate(np.array([0, 0, 1]))
+        newpose = self.complex.pose
+        self.assertIsNot(newpose, pose)
+        self.assertIs(self.complex.host_frac_coords, host_frac)
+
+        coords = np.concatenate([self.host.cart_coords, self.complex.guest.cart_coords])
+        np.testing.assert_allclose(newpose.cart_coords, coords, atol=1e-8)
+        self.assertEqual(
+            newpose.site_properties["label"], ["host"] * 72 + ["guest"] * 47
+        )
+        np.testing.assert_array_equal(
+            newpose.atomic_numbers,
+            np.concatenate([self.complex.host_numbers, self.complex.guest_numbers]),
+        )
+
+        self.complex.host = self.host.copy()
+        self.assertIsNot(self.complex.host_frac_coords, host_frac)
+
+        with self.assertRaises(AttributeError):
+            self.complex.score = 0
+
 
 if __name__ == "__main__":
     ut.main()
@@ -0,0 +1,85 @@
+import numpy as np
+import unittest as ut
+
+from VOID.structure.environment import HostEnvironment, get_host_environment
+from VOID.fitness import MinDistanceFitness, SumInvDistanceFitness, MinDistanceGaussianTarget
+from VOID.utils.geometry import random_rotation_matrices
+from VOID.tests.test_inputs import load_structure, load_molecule
+
+
+class TestHostEnvironment(ut.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.point = self.host.lattice.get_cartesian_coords(np.random.uniform(size=3))
+
+        rotations = random_rotation_matrices(8).reshape(-1, 3, 3)
+        self.guest_batch = self.guest.cart_coords @ rotations.swapaxes(-1, -2)
+        self.extent = np.linalg.norm(self.guest.cart_coords, axis=-1).max()
+
+    def get_environment(self, radius):
+        return HostEnvironment.from_point(
+            self.host.frac_coords, self.host.lattice, self.point, radius
+        )
+
+    def full_min_distances(self):
+        frac = self.host.lattice.get_fractional_coords(
+            (self.guest_batch + self.point).reshape(-1, 3)
+        )
+        dm = self.host.lattice.get_all_distances(self.host.frac_coords, frac)
+        return dm.reshape(len(self.host), len(self.guest_batch), -1).min(axis=(0, 2))
+
+    def test_atoms(self):
+        environment = self.get_environment(4.0)
+        frac = self.host.lattice.get_fractional_coords(self.point)
+        dm = self.host.lattice.get_all_distances(self.host.frac_coords, frac[None])[:, 0]
+
+        self.assertEqual(sorted(environment.indices), sorted(np.flatnonzero(dm < 4.0)))
+        np.testing.assert_allclose(
+            np.linalg.norm(environment.coords, axis=-1), dm[environment.indices]
+        )
+
+    def test_min_distances(self):
+        expected = self.full_min_distances()
+
+        # small environments fall back to the full host
+        for radius in [1.0, self.extent + 2.0, self.extent + 6.0]:
+            environment = self.get_environment(radius)
+            np.testing.assert_allclose(
+                environment.min_distances(self.guest_batch), expected
+            )
+
+    def test_fitness(self):
+        environment = self.get_environment(self.extent + 4.0)
+        frac = self.host.frac_coords
+        guest_batch = self.guest_batch + self.point
+
+        for fitness in [
+            MinDistanceFitness(threshold=1.5),
+            SumInvDistanceFitness(threshold=1.5),
+            MinDistanceGaussianTarget(),
+        ]:
+            np.testing.assert_allclose(
+                fitness.score_local(environment, self.guest_batch),
+                fitness.score_batch(frac, guest_batch, self.host.lattice),
+            )
+
+    def test_not_local(self):
+        environment = self.get_environment(self.extent + 1.0)
+
+        with self.assertRaises(NotImplementedError):
+            SumInvDistanceFitness(threshold=1.5).score_local(environment, self.guest_batch)
+
+    def test_cache(self):
+        environment = get_host_environment(
+            self.host.frac_coords, self.host.lattice, self.point, 3.0
+        )
+        same = get_host_environment(
+            self.host.frac_coords.copy(), self.host.lattice, self.point.copy(), 3.0
+        )
+        self.assertIs(environment, same)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import numpy as np
+import unittest as ut
+
+from VOID.structure import HostDistanceGrid
+from VOID.structure.grid import get_distance_grid
+from VOID.structure.neighbors import PeriodicNeighborSearch
+from VOID.tests.test_inputs import load_structure
+
+
+class TestHostDistanceGrid(ut.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        self.host = load_structure()
+        self.spacing = 0.3
+        self.grid = HostDistanceGrid.from_structure(self.host, spacing=self.spacing)
+        self.search = PeriodicNeighborSearch(self.host.frac_coords, self.host.lattice)
+
+    def test_shape(self):
+        expected = np.ceil(np.array(self.host.lattice.abc) / self.spacing)
+        np.testing.assert_array_equal(self.grid.values.shape, expected)
+
+    def test_grid_points(self):
+        frac = np.array([[0, 0, 0], [0.5, 0.5, 0.5]])
+        frac = np.round(frac * self.grid.shape) / self.grid.shape
+        coords = self.host.lattice.get_cartesian_coords(frac)
+
+        np.testing.assert_allclose(
+            self.grid.nearest_distances(coords), self.search.nearest_distances(coords)
+        )
+
+    def test_interpolation(self):
+        coords = self.host.lattice.get_cartesian_coords(np.random.uniform(-1, 2, (50, 3)))
+        exact = self.search.nearest_distances(coords)
+        interpolated = self.grid.nearest_distances(coords)
+
+        # interpolated distances are lower bounds of the exact ones
+        self.assertTrue(np.all(interpolated <= exact + 1e-8))
+        self.assertTrue((exact - interpolated).max() < np.sqrt(3) * self.spacing)
+
+    def test_cache(self):
+        scratchdir = ".tmp_grid"
+        grid = get_distance_grid(
+            self.host.frac_coords, self.host.lattice, self.spacing, cache_dir=scratchdir
+        )
+        self.assertEqual(len(os.listdir(scratchdir)), 1)
+
+        path = os.path.join(scratchdir, os.listdir(scratchdir)[0])
+        loaded = HostDistanceGrid.load(path)
+        np.testing.assert_allclose(loaded.values, grid.values)
+        self.assertEqual(loaded.spacing, self.spacing)
+
+        shutil.rmtree(scratchdir)
+
+
+if __name__ == "__main__":
+    ut.main()
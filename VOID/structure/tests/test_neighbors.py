@@ -0,0 +1,56 @@
+import numpy as np
+import unittest as ut
+
+from VOID.structure import Complex
+from VOID.structure.neighbors import PeriodicNeighborSearch, get_neighbor_search
+from VOID.tests.test_inputs import load_structure, load_molecule
+
+
+class TestNeighborSearch(ut.TestCase):
+    def setUp(self):
+        np.random.seed(3)
+        self.host = load_structure()
+        self.search = PeriodicNeighborSearch(
+            self.host.frac_coords, self.host.lattice, cutoff=3.0
+        )
+
+        frac = np.random.uniform(-1, 2, size=(40, 3))
+        self.coords = self.host.lattice.get_cartesian_coords(frac)
+        self.dm = self.host.lattice.get_all_distances(self.host.frac_coords, frac)
+
+    def test_nearest(self):
+        np.testing.assert_allclose(
+            self.search.nearest_distances(self.coords), self.dm.min(axis=0)
+        )
+        self.assertAlmostEqual(self.search.min_distance(self.coords), self.dm.min())
+
+    def test_pairs_within(self):
+        radius = 2.5
+        atom_idx, point_idx, distances = self.search.pairs_within(self.coords, radius)
+
+        expected = np.argwhere(self.dm < radius)
+        self.assertEqual(
+            sorted(zip(atom_idx, point_idx)), sorted(map(tuple, expected))
+        )
+        np.testing.assert_allclose(distances, self.dm[atom_idx, point_idx])
+
+    def test_any_within(self):
+        mindist = self.dm.min()
+        self.assertTrue(self.search.any_within(self.coords, mindist + 1e-3))
+        self.assertFalse(self.search.any_within(self.coords, mindist - 1e-3))
+
+    def test_cache(self):
+        search = get_neighbor_search(self.host.frac_coords, self.host.lattice)
+        same = get_neighbor_search(self.host.frac_coords.copy(), self.host.lattice)
+        self.assertIs(search, same)
+
+    def test_complex(self):
+        cpx = Complex(self.host, load_molecule(), add_transform=False)
+        self.assertAlmostEqual(cpx.min_distance(), cpx.distance_matrix.min())
+        self.assertEqual(
+            len(cpx.pairs_within(2.0)[0]), (cpx.distance_matrix < 2.0).sum()
+        )
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,77 @@
+import numpy as np
+import unittest as ut
+
+from VOID.structure import Complex, PoseRecord, RigidPose, materialize
+from VOID.utils.geometry import rotation_matrix
+from VOID.tests.test_inputs import load_structure, load_molecule
+
+
+class TestPoseRecord(ut.TestCase):
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.point = np.array([1.0, 2.0, 3.0])
+        self.rotation = rotation_matrix(np.array([0, 0, 1]), np.pi / 4)
+        self.record = PoseRecord(self.host, self.guest, self.point, self.rotation)
+
+    def test_shared(self):
+        self.assertIs(self.record.host, self.host)
+        self.assertIs(self.record.guest, self.guest)
+        self.assertEqual(len(self.record), 119)
+
+    def test_to_complex(self):
+        cpx = self.record.to_complex()
+        self.assertIsInstance(cpx, Complex)
+
+        np.testing.assert_allclose(
+            cpx.host.cart_coords, self.host.cart_coords - self.point
+        )
+        np.testing.assert_allclose(
+            cpx.guest.cart_coords, self.guest.cart_coords @ self.rotation.T
+        )
+
+    def test_materialize(self):
+        cpx = materialize(self.record)
+        self.assertIs(materialize(cpx), cpx)
+        self.assertEqual(len(cpx.pose), 119)
+
+
+class TestRigidPose(ut.TestCase):
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.pose = RigidPose(self.host, self.guest)
+
+    def test_rotate(self):
+        com = self.guest.center_of_mass
+        np.testing.assert_allclose(self.pose.center_of_mass, com)
+
+        rotation = rotation_matrix(np.array([1, 0, 0]), np.pi / 3)
+        self.pose.rotate(rotation)
+
+        np.testing.assert_allclose(self.pose.center_of_mass, com, atol=1e-8)
+        np.testing.assert_allclose(
+            self.pose.coords, (self.guest.cart_coords - com) @ rotation.T + com
+        )
+
+    def test_undo(self):
+        coords = self.pose.coords
+        self.pose.save()
+        self.pose.translate(np.array([1.0, 0, 0]))
+        self.pose.undo()
+
+        self.assertIs(self.pose.coords, coords)
+        np.testing.assert_allclose(self.pose.coords, self.guest.cart_coords)
+
+    def test_to_complex(self):
+        self.pose.translate(np.array([0, 0, 2.0]))
+        cpx = self.pose.to_complex()
+
+        self.assertIs(cpx.host, self.host)
+        np.testing.assert_allclose(
+            cpx.guest.cart_coords, self.guest.cart_coords + np.array([0, 0, 2.0])
+        )
+
+
+if __name__ == "__main__":
+    ut.main()
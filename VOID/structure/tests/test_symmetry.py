@@ -0,0 +1,48 @@
+import numpy as np
+import unittest as ut
+
+from VOID.structure import PoseRecord
+from VOID.structure.symmetry import get_host_symmetry
+from VOID.fitness import MinDistanceFitness
+from VOID.utils.geometry import uniform_rotation_matrices
+from VOID.tests.test_inputs import load_structure, load_molecule
+
+
+class TestSymmetry(ut.TestCase):
+    def setUp(self):
+        self.host = load_structure()
+        self.guest = load_molecule()
+        self.symmetry = get_host_symmetry(self.host)
+
+    def test_operations(self):
+        # P6/mcc has 12 proper operations
+        self.assertEqual(len(self.symmetry), 12)
+        self.assertIs(get_host_symmetry(self.host), self.symmetry)
+
+    def test_reduce(self):
+        point = self.host.lattice.get_fractional_coords([1.0, 2.0, 3.0])
+        images = self.symmetry.get_images(point[None, :])[:, 0]
+        points = self.host.lattice.get_cartesian_coords(images)
+
+        unique, multiplicity = self.symmetry.reduce_points(points)
+        self.assertEqual(len(unique), 1)
+        self.assertEqual(multiplicity.sum(), len(points))
+
+    def test_expand(self):
+        point = np.array([1.0, 2.0, 3.0])
+        rotation = uniform_rotation_matrices(1, np.random.default_rng(0))[0]
+        fitness = MinDistanceFitness(threshold=0)
+
+        pose = PoseRecord(self.host, self.guest, point, rotation)
+        score = fitness(pose.to_complex())
+
+        points, rotations = self.symmetry.expand_pose(point, rotation)
+        self.assertEqual(len(points), 12)
+
+        for p, r in zip(points, rotations):
+            equivalent = PoseRecord(self.host, self.guest, p, r)
+            self.assertAlmostEqual(fitness(equivalent.to_complex()), score, places=3)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,79 @@
+import copy
+import numpy as np
+import unittest as ut
+
+from VOID.structure import MoleculeTransformer
+from VOID.structure.topology import get_bonds, get_guest_topology
+from VOID.tests.test_inputs import load_molecule
+
+
+class TestTopology(ut.TestCase):
+    def setUp(self):
+        self.guest = load_molecule("DEB+.xyz")
+
+    def test_bonds(self):
+        symbols = [site.specie.symbol for site in self.guest]
+        bonds, lengths = get_bonds(symbols, self.guest.cart_coords)
+
+        dm = self.guest.distance_matrix
+        np.testing.assert_allclose(lengths, dm[bonds[:, 0], bonds[:, 1]])
+        self.assertTrue(np.all(bonds[:, 0] < bonds[:, 1]))
+
+    def test_cations(self):
+        topology = get_guest_topology(self.guest)
+        self.assertEqual(topology.cation_indexes, [1])
+        self.assertEqual(len(topology), len(self.guest))
+
+    def test_shared(self):
+        topology = get_guest_topology(self.guest)
+
+        moved = self.guest.copy()
+        moved.rotate_sites(theta=np.pi / 3, axis=[1, 1, 0], anchor=[0, 0, 0])
+        moved.translate_sites(vector=[1.0, -2.0, 0.5])
+
+        self.assertIs(get_guest_topology(moved), topology)
+
+    def test_torsions(self):
+        torsions = get_guest_topology(self.guest).torsions
+        self.assertEqual(len(torsions), 4)
+        self.assertIs(get_guest_topology(self.guest).torsions, torsions)
+
+        # the moving fragment is never the larger one
+        self.assertTrue(np.all(torsions.masks.sum(axis=1) <= len(self.guest) / 2))
+        for (u, v), mask in zip(torsions.bonds, torsions.masks):
+            self.assertFalse(mask[u])
+            self.assertTrue(mask[v])
+
+    def test_conformers(self):
+        topology = get_guest_topology(self.guest)
+        coords = self.guest.cart_coords
+        conformers = topology.torsions.sample_conformers(
+            coords, 8, np.random.default_rng(0), num_twists=3
+        )
+
+        self.assertEqual(conformers.shape, (8, len(self.guest), 3))
+        np.testing.assert_allclose(conformers[0], coords)
+        self.assertTrue(np.abs(conformers[1:] - coords).max() > 0.1)
+
+        # twisting bonds does not change the bond lengths
+        i, j = topology.bonds.T
+        lengths = np.linalg.norm(conformers[:, i] - conformers[:, j], axis=-1)
+        np.testing.assert_allclose(lengths, np.broadcast_to(lengths[0], lengths.shape))
+
+    def test_analyzer(self):
+        transformer = MoleculeTransformer(self.guest.copy())
+        self.assertIs(transformer.topology, get_guest_topology(self.guest))
+
+        # rigid-body moves keep the analysis, which is never copied
+        analysis = transformer.graph_analysis
+        transformer.rotate()
+        transformer.translate()
+        self.assertIs(transformer.graph_analysis, analysis)
+        self.assertIs(copy.deepcopy(transformer).graph_analysis, analysis)
+
+        # the shared graph holds a snapshot, not the transformed guest
+        self.assertIsNot(transformer.molgraph.molecule, transformer.mol)
+
+
+if __name__ == "__main__":
+    ut.main()
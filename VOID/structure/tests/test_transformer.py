@@ -38,7 +38,6 @@ class TestTransformer(ut.TestCase):
         twbonds = self.transformer.get_twistable_bonds()
         self.assertEqual(len(twbonds), 1)
 
-    @ut.skip("twisting bonds is not working so well for now")
     def test_twist(self):
         theta = np.pi / 4
 
@@ -66,6 +65,27 @@ class TestTransformer(ut.TestCase):
         rotcoords = oldcoords @ rot.T
         self.assertTrue(np.allclose(newcoords, rotcoords))
 
+    def test_twist_fallback(self):
+        # ammonium has no rotatable bonds; a bond outside rings is twisted
+        transformer = MoleculeTransformer(self.smallguest.copy())
+        self.assertEqual(len(transformer.topology.torsions), 0)
+
+        dm = self.smallguest.distance_matrix
+        newguest = transformer.twist_bond(theta=np.pi / 3)
+        np.testing.assert_allclose(newguest.distance_matrix, dm, atol=1e-8)
+
+        # bonds which are not rotatable can still be given explicitly
+        u, v = self.transformer.get_bonds_outside_rings()[0]
+        fixed, moving, indices = self.transformer.get_twist_fragment([u, v])
+        self.assertIn(moving, indices)
+        self.assertNotIn(fixed, indices)
+        self.assertTrue(len(indices) <= len(self.guest) / 2)
+        self.transformer.twist_bond(bond=[u, v], theta=np.pi / 3)
+
+        ring = self.transformer.rings[0]
+        with self.assertRaises(ValueError):
+            self.transformer.twist_bond(bond=[ring[0], ring[1]])
+
     def test_twist_small_molecule(self):
         transformer = MoleculeTransformer(self.smallguest)
         try:
@@ -0,0 +1,262 @@
+import numpy as np
+import networkx as nx
+
+from VOID.utils.cache import LRUCache, array_key
+from VOID.utils.geometry import axis_angle_matrices
+
+
+SCALE_CUTOFF = 1.2
+DEFAULT_RADIUS = 0.77  # ~C
+
+COVALENT_RADII = {
+    "H": 0.31, "C": 0.76, "N": 0.71, "O": 0.66, "F": 0.57,
+    "P": 1.07, "S": 1.05, "Cl": 1.02, "Br": 1.20, "I": 1.39, "Si": 1.11,
+}
+
+NEUTRAL_VALENCES = {
+    "H": 1, "C": 4, "N": 3, "O": 2, "F": 1,
+    "P": 3, "S": 2, "Cl": 1, "Br": 1, "I": 1, "Si": 4,
+}
+
+# twists bringing atoms closer than this (Å) are rejected
+CLASH_DISTANCE = 1.5
+NUM_TWISTS = 1
+
+# Approximate bond orders based on distance ranges (Å)
+BOND_ORDER_VALUES = {
+    "SINGLE": 1,
+    "DOUBLE": 2,
+    "TRIPLE": 3,
+    "AROMATIC": 1.5,
+}
+
+_TOPOLOGY_CACHE = LRUCache(max_entries=32)
+
+
+def get_bonds(symbols, coords, scale_cutoff=SCALE_CUTOFF):
+    """Finds bonded pairs of atoms using covalent radii. Two atoms are
+        bonded if their distance is below `scale_cutoff` times the sum
+        of their covalent radii.
+
+    Returns:
+        bonds (np.ndarray): (K, 2) indices of the bonded atoms, i < j
+        lengths (np.ndarray): (K, ) length of each bond
+    """
+    coords = np.asarray(coords)
+    radii = np.array([COVALENT_RADII.get(sym, DEFAULT_RADIUS) for sym in symbols])
+
+    i, j = np.triu_indices(len(coords), k=1)
+    lengths = np.linalg.norm(coords[i] - coords[j], axis=-1)
+    bonded = lengths <= scale_cutoff * (radii[i] + radii[j])
+
+    return np.stack([i[bonded], j[bonded]], axis=-1), lengths[bonded]
+
+
+def get_bond_orders(lengths):
+    """Assigns bond orders based on the bond length"""
+    return np.select(
+        [
+            (lengths >= 1.15) & (lengths <= 1.25),
+            (lengths >= 1.26) & (lengths <= 1.34),
+            (lengths >= 1.38) & (lengths <= 1.42),
+        ],
+        [
+            BOND_ORDER_VALUES["TRIPLE"],
+            BOND_ORDER_VALUES["DOUBLE"],
+            BOND_ORDER_VALUES["AROMATIC"],
+        ],
+        default=BOND_ORDER_VALUES["SINGLE"],
+    )
+
+
+class GuestTopology:
+    def __init__(self, symbols, bonds, lengths, key=None):
+        """Bonding of a guest molecule. As rigid-body moves do not change
+            the bonding, a single topology is shared by all poses of a
+            guest (see `get_guest_topology`).
+
+        Args:
+            symbols (list of str): element of each atom
+            bonds (np.ndarray): (K, 2) indices of the bonded atoms
+            lengths (np.ndarray): (K, ) length of each bond
+            key (str): content key of the species and bonds, used to
+                cache analyses which only depend on the topology
+        """
+        self.symbols = list(symbols)
+        self.bonds = bonds
+        self.key = key
+        self.bond_orders = get_bond_orders(lengths)
+
+        num_atoms = len(self.symbols)
+        self.valences = np.bincount(
+            bonds.reshape(-1), weights=np.repeat(self.bond_orders, 2), minlength=num_atoms
+        )
+        self.cation_indexes = self.find_cations()
+        self._torsions = None
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def torsions(self):
+        """`TorsionTable` of the rotatable bonds, computed on first use"""
+        if self._torsions is None:
+            self._torsions = TorsionTable.from_topology(self)
+
+        return self._torsions
+
+    def get_neighbors(self, idx):
+        i, j = self.bonds.T
+        return np.concatenate([j[i == idx], i[j == idx]])
+
+    def find_cations(self):
+        """Identify likely cation atoms heuristically: any atom that has
+            one fewer bond than its typical neutral valence.
+        """
+        max_valences = np.array(
+            [NEUTRAL_VALENCES.get(sym, np.nan) for sym in self.symbols]
+        )
+        return [int(i) for i in np.flatnonzero(self.valences - (max_valences - 1) == 0)]
+
+
+class TorsionTable:
+    def __init__(self, bonds, masks):
+        """Rotatable bonds of a guest and the atoms moved by each of them.
+            Twisting bond (u, v) rotates the atoms in its mask around the
+            u-v axis. The table only depends on the bonding, so it is
+            shared by all poses and conformers of a guest.
+
+        Args:
+            bonds (np.ndarray): (T, 2) atoms (u, v) of each rotatable bond,
+                where v belongs to the moving fragment
+            masks (np.ndarray): (T, N) True for the atoms moved by each bond
+        """
+        self.bonds = bonds
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.bonds)
+
+    @classmethod
+    def from_topology(cls, topology):
+        """Rotatable bonds are bonds between two heavy, non-terminal atoms
+            which do not belong to a ring. The smaller of the two fragments
+            obtained by breaking the bond is the one which moves.
+        """
+        num_atoms = len(topology)
+        graph = nx.Graph()
+        graph.add_nodes_from(range(num_atoms))
+        graph.add_edges_from(topology.bonds.tolist())
+
+        bonds, masks = [], []
+        for u, v in nx.bridges(graph):
+            if "H" in (topology.symbols[u], topology.symbols[v]):
+                continue
+            if graph.degree(u) == 1 or graph.degree(v) == 1:
+                continue
+
+            graph.remove_edge(u, v)
+            mask = np.zeros(num_atoms, dtype=bool)
+            mask[list(nx.node_connected_component(graph, v))] = True
+            graph.add_edge(u, v)
+
+            if mask.sum() > num_atoms / 2:
+                u, v, mask = v, u, ~mask
+
+            bonds.append([u, v])
+            masks.append(mask)
+
+        return cls(
+            np.array(bonds, dtype=int).reshape(-1, 2),
+            np.array(masks, dtype=bool).reshape(-1, num_atoms),
+        )
+
+    def find(self, bond):
+        """Returns the index of `bond` (in any order) in the table"""
+        for idx, (u, v) in enumerate(self.bonds):
+            if {u, v} == set(bond):
+                return idx
+
+        raise ValueError(f"bond {bond} is not rotatable")
+
+    def twist(self, coords, torsions, thetas):
+        """Twists one bond of each conformer in a batch.
+
+        Args:
+            coords (np.ndarray): (K, N, 3) coordinates of the conformers
+            torsions (np.ndarray): (K, ) bond twisted in each conformer
+            thetas (np.ndarray): (K, ) twisting angles
+
+        Returns:
+            coords (np.ndarray): (K, N, 3) twisted conformers
+        """
+        batch = np.arange(len(coords))
+        u, v = self.bonds[torsions].T
+
+        anchors = coords[batch, u][:, None, :]
+        rotations = axis_angle_matrices(coords[batch, v] - coords[batch, u], thetas)
+
+        twisted = (coords - anchors) @ rotations.swapaxes(-1, -2) + anchors
+        return np.where(self.masks[torsions][..., None], twisted, coords)
+
+    def has_clashes(self, coords, torsions, clash_distance=CLASH_DISTANCE):
+        """Returns True for the conformers in which an atom moved by the
+            twisted bond is closer than `clash_distance` to a fixed atom.
+        """
+        masks = self.masks[torsions]
+        pairs = masks[:, :, None] & ~masks[:, None, :]
+
+        distances = np.linalg.norm(coords[:, :, None] - coords[:, None, :], axis=-1)
+        return ((distances < clash_distance) & pairs).any(axis=(1, 2))
+
+    def sample_conformers(self, coords, size, rng=None, num_twists=NUM_TWISTS):
+        """Generates `size` conformers of a guest by twisting random
+            bonds by random angles. The first conformer is the original
+            one, and twists which create clashes are undone.
+
+        Args:
+            coords (np.ndarray): (N, 3) coordinates of the guest
+            size (int): number of conformers
+            rng (np.random.Generator): if None, the global numpy
+                random state is used
+            num_twists (int): number of bonds twisted in each conformer
+
+        Returns:
+            conformers (np.ndarray): (size, N, 3) coordinates
+        """
+        if rng is None:
+            rng = np.random
+
+        conformers = np.repeat(np.asarray(coords)[None], size, axis=0)
+        if len(self) == 0 or size <= 1:
+            return conformers
+
+        for _ in range(num_twists):
+            torsions = (rng.random(size - 1) * len(self)).astype(int)
+            thetas = 2 * np.pi * rng.random(size - 1)
+
+            twisted = self.twist(conformers[1:], torsions, thetas)
+            clashes = self.has_clashes(twisted, torsions)
+            conformers[1:][~clashes] = twisted[~clashes]
+
+        return conformers
+
+
+def get_guest_topology(molecule, scale_cutoff=SCALE_CUTOFF):
+    """Returns the `GuestTopology` of `molecule`. Topologies are cached
+        by species and connectivity, so poses of the same guest share
+        the same analysis.
+    """
+    symbols = [site.specie.symbol for site in molecule]
+    bonds, lengths = get_bonds(symbols, molecule.cart_coords, scale_cutoff)
+
+    key = array_key(np.array(molecule.atomic_numbers), bonds, scale_cutoff=scale_cutoff)
+    topology = _TOPOLOGY_CACHE.get(key)
+
+    if topology is None:
+        topology = _TOPOLOGY_CACHE.put(key, GuestTopology(symbols, bonds, lengths, key))
+
+    return topology
@@ -3,6 +3,8 @@ import unittest as ut
 from pymatgen.core import Structure, Molecule
 from pymatgen.io.xyz import XYZ
 
+from VOID.structure import Complex
+
 
 thisdir = os.path.dirname(os.path.abspath(__file__))
 inpath = os.path.join(thisdir, "files")
@@ -18,6 +20,38 @@ def load_molecule(filename="molecule.xyz"):
     return Molecule.from_file(path)
 
 
+def make_complex(host, guest, coords):
+    """Returns the complex of `host` and a copy of `guest` whose atoms
+        are moved to `coords`
+    """
+    guest = guest.copy()
+    for site, xyz in zip(guest, coords):
+        site.coords = xyz
+
+    return Complex(host, guest, add_transform=False)
+
+
+class ComplexTestMixin:
+    """Builds complexes of the `host` and `guest` of a test case"""
+
+    def get_complex(self, coords):
+        return make_complex(self.host, self.guest, coords)
+
+
+class DockerTestMixin:
+    """Builds dockers of class `docker_class` from the `host`, `guest`,
+        `sampler` and `fitness` of a test case. `docker_kwargs` are
+        default keyword arguments of the docker.
+    """
+
+    docker_class = None
+    docker_kwargs = {}
+
+    def get_docker(self, **kwargs):
+        kwargs = {**self.docker_kwargs, **kwargs}
+        return self.docker_class(self.host, self.guest, self.sampler, self.fitness, **kwargs)
+
+
 class TestInputs(ut.TestCase):
     def setUp(self):
         self.structure = load_structure()
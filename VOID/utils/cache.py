@@ -0,0 +1,129 @@
+import os
+import glob
+import hashlib
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+
+
+MAX_ENTRIES = 8
+MAX_DISK_ENTRIES = 256
+
+
+def array_key(*arrays, **params):
+    """Content-based key for a set of arrays and parameters. Two
+        calls with the same values give the same key.
+    """
+    digest = hashlib.sha1()
+    for arr in arrays:
+        arr = np.ascontiguousarray(arr)
+        digest.update(str(arr.dtype).encode())
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+
+    for name in sorted(params):
+        digest.update(f"{name}={params[name]!r};".encode())
+
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Small in-memory cache which discards the least recently
+        used entries once `max_entries` is exceeded.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        self._data.clear()
+
+
+class DiskCache:
+    """Stores sets of arrays as compressed `.npz` files named after their
+        key, so that results can be shared between runs (and processes).
+        Once more than `max_entries` files are stored, the least recently
+        used ones are deleted.
+    """
+
+    def __init__(self, cache_dir, prefix="cache", max_entries=MAX_DISK_ENTRIES):
+        self.cache_dir = cache_dir
+        self.prefix = prefix
+        self.max_entries = max_entries
+
+    def __contains__(self, key):
+        return os.path.exists(self.get_path(key))
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, f"{self.prefix}_{key}.npz")
+
+    def get(self, key, default=None):
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            return default
+
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # incomplete or corrupted file
+            os.remove(path)
+            return default
+
+        # marks the entry as recently used
+        os.utime(path)
+        return arrays
+
+    def put(self, key, **arrays):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # writes to a temporary file first, as other processes
+        # may be reading the same entry
+        path = self.get_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+
+        self.evict()
+        return arrays
+
+    def evict(self):
+        paths = glob.glob(os.path.join(self.cache_dir, f"{self.prefix}_*.npz"))
+        if len(paths) <= self.max_entries:
+            return
+
+        paths = sorted(paths, key=os.path.getmtime)
+        for path in paths[: len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.cache_dir, f"{self.prefix}_*.npz")):
+            os.remove(path)
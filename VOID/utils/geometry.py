@@ -1,5 +1,6 @@
 import numpy as np
 import math
+from scipy.stats import qmc
 
 
 def rotation_matrix(axis, theta):
@@ -24,19 +25,194 @@ def rotation_matrix(axis, theta):
     )
 
 
-def random_rotation_matrices(size):
+def random_rotation_matrices(size, rng=None):
+    """Random rotation matrices. If `rng` (a `np.random.Generator`) is
+        not given, the global numpy random state is used.
+    """
     assert type(size) == int and size > 0
 
+    if rng is None:
+        rng = np.random
+
     if size == 1:
         return rotation_matrix(
-            axis=np.random.randn(3), theta=(2 * np.pi * np.random.rand(1)[0])
+            axis=rng.standard_normal(3), theta=(2 * np.pi * rng.random(1)[0])
         )
 
     return np.stack(
         [
             rotation_matrix(
-                axis=np.random.randn(3), theta=(2 * np.pi * np.random.rand(1)[0])
+                axis=rng.standard_normal(3), theta=(2 * np.pi * rng.random(1)[0])
             )
             for _ in range(size)
         ]
     )
+
+
+def quaternion_to_matrix(quaternions):
+    """Converts unit quaternions (w, x, y, z) into rotation matrices.
+
+    Args:
+        quaternions (np.ndarray): (..., 4) unit quaternions
+
+    Returns:
+        rotation (np.ndarray): (..., 3, 3) rotation matrices
+    """
+    w, x, y, z = np.moveaxis(quaternions, -1, 0)
+
+    rotation = np.stack(
+        [
+            1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y),
+            2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x),
+            2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y),
+        ],
+        axis=-1,
+    )
+    return rotation.reshape(*rotation.shape[:-1], 3, 3)
+
+
+def uniform_to_quaternions(u):
+    """Maps points of the unit cube to unit quaternions (Shoemake, 1992).
+        Uniformly distributed points are mapped to rotations uniformly
+        distributed over SO(3).
+
+    Args:
+        u (np.ndarray): (N, 3) points in [0, 1)
+
+    Returns:
+        quaternions (np.ndarray): (N, 4) unit quaternions
+    """
+    u1, u2, u3 = u.T
+    r1, r2 = np.sqrt(1 - u1), np.sqrt(u1)
+    t1, t2 = 2 * np.pi * u2, 2 * np.pi * u3
+
+    return np.stack(
+        [r2 * np.cos(t2), r1 * np.sin(t1), r1 * np.cos(t1), r2 * np.sin(t2)], axis=-1
+    )
+
+
+def axis_angle_matrices(axes, thetas):
+    """Vectorized `rotation_matrix`.
+
+    Args:
+        axes (np.ndarray): (N, 3) rotation axes (not necessarily normalized)
+        thetas (np.ndarray): (N, ) rotation angles
+
+    Returns:
+        rotation (np.ndarray): (N, 3, 3) rotation matrices
+    """
+    axes = axes / np.linalg.norm(axes, axis=-1, keepdims=True)
+    quaternions = np.concatenate(
+        [np.cos(thetas / 2)[:, None], axes * np.sin(thetas / 2)[:, None]], axis=-1
+    )
+    return quaternion_to_matrix(quaternions)
+
+
+def uniform_rotation_matrices(size, rng=None):
+    """Random rotation matrices uniformly distributed over SO(3)"""
+    if rng is None:
+        rng = np.random
+
+    return quaternion_to_matrix(uniform_to_quaternions(rng.random((size, 3))))
+
+
+def sobol_rotation_matrices(size, rng=None):
+    """Quasi-random rotation matrices obtained from a scrambled Sobol
+        sequence. Covers SO(3) more evenly than random rotations.
+    """
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(2 ** 31))
+
+    sobol = qmc.Sobol(d=3, scramble=True, seed=rng)
+    u = sobol.random_base2(int(np.ceil(np.log2(max(size, 1)))))[:size]
+
+    return quaternion_to_matrix(uniform_to_quaternions(u))
+
+
+def hopf_rotation_matrices(size, rng=None):
+    """Deterministic grid of rotations based on the Hopf fibration of
+        SO(3) (Yershova et al., 2010). The sphere S2 is covered by a
+        Fibonacci lattice and each of its points is combined with evenly
+        spaced rotations around the circle S1. `rng` is not used.
+    """
+    # spacing giving approximately `size` orientations
+    spacing = (8 * np.pi ** 2 / size) ** (1 / 3)
+    num_psi = max(int(np.round(2 * np.pi / spacing)), 1)
+    num_sphere = int(np.ceil(size / num_psi))
+
+    idx = np.arange(num_sphere) + 0.5
+    theta = np.repeat(np.arccos(1 - 2 * idx / num_sphere), num_psi)
+    phi = np.repeat(np.pi * (1 + 5 ** 0.5) * idx, num_psi)
+    psi = np.tile(2 * np.pi * np.arange(num_psi) / num_psi, num_sphere)
+
+    quaternions = np.stack(
+        [
+            np.cos(theta / 2) * np.cos(psi / 2),
+            np.cos(theta / 2) * np.sin(psi / 2),
+            np.sin(theta / 2) * np.cos(phi + psi / 2),
+            np.sin(theta / 2) * np.sin(phi + psi / 2),
+        ],
+        axis=-1,
+    )
+
+    return quaternion_to_matrix(quaternions[:size])
+
+
+ORIENTATION_SAMPLERS = {
+    "uniform": uniform_rotation_matrices,
+    "axis_angle": random_rotation_matrices,
+    "sobol": sobol_rotation_matrices,
+    "hopf": hopf_rotation_matrices,
+}
+
+
+PERIODIC_IMAGES = np.array(
+    [[i, j, k] for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)]
+)
+
+
+def periodic_distances(frac_a, frac_b, matrix):
+    """Returns the minimum-image distances between two sets of
+        fractional coordinates. Leading dimensions are broadcast,
+        so a single host can be compared to a batch of guests.
+
+    Args:
+        frac_a (np.ndarray): (..., N, 3) fractional coordinates
+        frac_b (np.ndarray): (..., M, 3) fractional coordinates
+        matrix (np.ndarray): (3, 3) lattice matrix
+
+    Returns:
+        distances (np.ndarray): (..., N, M) distance matrix
+    """
+    diff = frac_b[..., None, :, :] - frac_a[..., :, None, :]
+    diff -= np.round(diff)
+    cart = diff @ matrix
+
+    # |c + v|^2 = |c|^2 + 2 c.v + |v|^2, minimized over the images v
+    images = PERIODIC_IMAGES @ matrix
+    shift = np.full(cart.shape[:-1], np.inf)
+    for image in images:
+        np.minimum(shift, 2 * (cart @ image) + image @ image, out=shift)
+
+    distances = np.einsum("...i,...i->...", cart, cart) + shift
+    return np.sqrt(np.maximum(distances, 0))
+
+
+def batch_distance_matrix(host_frac, guest_batch, lattice):
+    """Returns the distance matrices between the host (rows) and
+        each guest of a batch (columns).
+
+    Args:
+        host_frac (np.ndarray): (N, 3) fractional coordinates of the host
+        guest_batch (np.ndarray): (B, M, 3) Cartesian coordinates of the guests
+        lattice (Lattice): lattice of the host
+
+    Returns:
+        distances (np.ndarray): (B, N, M) distance matrices
+    """
+    num_poses, num_atoms, _ = guest_batch.shape
+    guest_frac = lattice.get_fractional_coords(guest_batch.reshape(-1, 3))
+
+    # a single (N, B * M) call is faster than broadcasting the batch
+    distances = lattice.get_all_distances(host_frac, guest_frac)
+    return distances.reshape(-1, num_poses, num_atoms).swapaxes(0, 1)
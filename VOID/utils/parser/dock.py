@@ -1,3 +1,5 @@
+import argparse
+
 from .base import Parser
 from VOID import dockers, samplers, fitness
 
@@ -40,8 +42,29 @@ class DockParser(Parser):
             help="fitness function to be used",
             choices=list(parsers.keys()),
         )
+        self.parser.add_argument(
+            "--fitnesses",
+            type=str,
+            nargs="+",
+            help="fitness functions combined by the `%s` fitness" % fitness.MultipleFitness.PARSER_NAME,
+            choices=[name for name in parsers.keys() if name != fitness.MultipleFitness.PARSER_NAME],
+            default=[],
+        )
         return parsers
 
+    def get_multiple_fitness_parser(self, names):
+        """Returns a parser with the arguments of all fitness functions
+            in `names`. Arguments shared by several fitness functions
+            (e.g. `--threshold`) are only added once.
+        """
+        classes = {cls.PARSER_NAME: cls for cls in fitness.__all__}
+        parser = argparse.ArgumentParser(add_help=False, conflict_handler="resolve")
+
+        for name in names:
+            classes[name].add_arguments(parser)
+
+        return parser
+
     def add_extra_main_kwargs(self):
         self.parser.add_argument(
             "--subdock",
@@ -58,6 +81,15 @@ class DockParser(Parser):
             self.fitness_opts[options.fitness],
         ]
 
+        if options.fitness == fitness.MultipleFitness.PARSER_NAME:
+            if len(options.fitnesses) == 0:
+                self.parser.error(
+                    "--fitnesses is required by the `%s` fitness"
+                    % fitness.MultipleFitness.PARSER_NAME
+                )
+
+            parent_parsers.append(self.get_multiple_fitness_parser(options.fitnesses))
+
         if options.subdock:
             parent_parsers.append(self.docker_opts["subdock"],)
 
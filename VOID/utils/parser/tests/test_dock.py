@@ -1,3 +1,5 @@
+import io
+import contextlib
 import numpy as np
 import unittest as ut
 
@@ -26,6 +28,50 @@ class TestParser(ut.TestCase):
         self.assertEqual(parsed.sampler, "voronoi_cluster")
         self.assertEqual(parsed.fitness, "min_distance")
 
+    def test_parse_multiple(self):
+        args = [
+            "../../tests/files/AFI.cif",
+            "../../tests/files/molecule.xyz",
+            "--docker",
+            "batch",
+            "--sampler",
+            "voronoi_cluster",
+            "--fitness",
+            "multiple",
+            "--fitnesses",
+            "min_distance",
+            "mean_distance_target",
+            "--weights",
+            "1",
+            "0.5",
+            "--threshold",
+            "2.0",
+            "--target",
+            "3.0",
+        ]
+
+        parsed = self.parser.parse_args(args)
+        self.assertEqual(parsed.fitnesses, ["min_distance", "mean_distance_target"])
+        self.assertEqual(parsed.weights, [1.0, 0.5])
+        self.assertEqual(parsed.threshold, 2.0)
+        self.assertEqual(parsed.target, 3.0)
+
+    def test_multiple_requires_fitnesses(self):
+        args = [
+            "../../tests/files/AFI.cif",
+            "../../tests/files/molecule.xyz",
+            "--docker",
+            "batch",
+            "--sampler",
+            "voronoi_cluster",
+            "--fitness",
+            "multiple",
+        ]
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args(args)
+
 
 if __name__ == "__main__":
     ut.main()
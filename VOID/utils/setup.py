@@ -12,10 +12,13 @@ class SetupRun:
         return {cls.PARSER_NAME: cls for cls in module.__all__}
 
     def get_docker_kwargs(self, docker_class):
-        if self.args["docker"] in ["mcdocker", "mcsuccess"]:
-            return {k: self.args[k] for k in ["temperature", "temperature_profile"] if k in self.args}
+        # options defined by the parser of the docker
+        keys = [k for k in vars(docker_class.get_parser().parse_args([])) if k != "attempts"]
 
-        return {}
+        if self.args["docker"] in ["mcdocker", "mcsuccess", "mctempering"]:
+            keys.append("temperature_profile")
+
+        return {k: self.args[k] for k in keys if k in self.args}
 
     def get_docker(self):
         classes = self.get_module_classes(dockers)
@@ -42,6 +45,11 @@ class SetupRun:
     def get_fitness(self):
         classes = self.get_module_classes(fitness)
         cls = classes[self.args["fitness"]]
+
+        if cls is fitness.MultipleFitness:
+            components = [classes[name](**self.args) for name in self.args["fitnesses"]]
+            return cls(components, weights=self.args.get("weights"))
+
         return cls(**self.args)
 
     def get_structures(self):
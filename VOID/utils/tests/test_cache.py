@@ -0,0 +1,66 @@
+import os
+import time
+import shutil
+import numpy as np
+import unittest as ut
+
+from VOID.utils.cache import LRUCache, DiskCache, array_key
+
+
+class TestLRUCache(ut.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_key(self):
+        x = np.arange(6.0).reshape(2, 3)
+        self.assertEqual(array_key(x, p=1), array_key(x.copy(), p=1))
+        self.assertNotEqual(array_key(x, p=1), array_key(x, p=2))
+        self.assertNotEqual(array_key(x), array_key(x.reshape(3, 2)))
+
+
+class TestDiskCache(ut.TestCase):
+    def setUp(self):
+        self.scratchdir = ".tmp_cache"
+        self.cache = DiskCache(self.scratchdir, prefix="test", max_entries=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.scratchdir, ignore_errors=True)
+
+    def test_put_get(self):
+        self.assertIsNone(self.cache.get("a"))
+
+        self.cache.put("a", x=np.arange(3), y=np.array(1.5))
+        data = self.cache.get("a")
+        np.testing.assert_array_equal(data["x"], np.arange(3))
+        self.assertEqual(float(data["y"]), 1.5)
+
+    def test_eviction(self):
+        for key in ["a", "b", "c"]:
+            self.cache.put(key, x=np.zeros(1))
+            # makes modification times distinct
+            time.sleep(0.01)
+            os.utime(self.cache.get_path(key), (time.time(), time.time()))
+
+        self.assertNotIn("a", self.cache)
+        self.assertIn("b", self.cache)
+        self.assertIn("c", self.cache)
+
+    def test_corrupted(self):
+        os.makedirs(self.scratchdir, exist_ok=True)
+        with open(self.cache.get_path("a"), "w") as f:
+            f.write("not a npz file")
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertNotIn("a", self.cache)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,55 @@
+import numpy as np
+import unittest as ut
+
+from VOID.utils.geometry import (
+    rotation_matrix,
+    axis_angle_matrices,
+    quaternion_to_matrix,
+    ORIENTATION_SAMPLERS,
+)
+
+
+class TestOrientations(ut.TestCase):
+    def test_quaternion(self):
+        axis = np.array([1.0, 2.0, -0.5])
+        axis /= np.linalg.norm(axis)
+        theta = 0.7
+
+        quaternion = np.concatenate([[np.cos(theta / 2)], np.sin(theta / 2) * axis])
+        self.assertTrue(
+            np.allclose(quaternion_to_matrix(quaternion), rotation_matrix(axis, theta))
+        )
+
+    def test_axis_angle(self):
+        axes = np.random.default_rng(0).standard_normal((5, 3))
+        thetas = np.linspace(0, 2 * np.pi, 5)
+
+        expected = [rotation_matrix(axis, theta) for axis, theta in zip(axes, thetas)]
+        np.testing.assert_allclose(axis_angle_matrices(axes, thetas), expected, atol=1e-12)
+
+    def test_samplers(self):
+        for name, sampler in ORIENTATION_SAMPLERS.items():
+            rotation = sampler(512, np.random.default_rng(0)).reshape(-1, 3, 3)
+
+            self.assertEqual(rotation.shape, (512, 3, 3), name)
+            self.assertTrue(
+                np.allclose(rotation @ rotation.swapaxes(-1, -2), np.eye(3)), name
+            )
+            self.assertTrue(np.allclose(np.linalg.det(rotation), 1), name)
+
+    def test_uniform(self):
+        # the trace of rotations uniformly distributed over SO(3) has mean 0
+        for name in ["uniform", "sobol", "hopf"]:
+            rotation = ORIENTATION_SAMPLERS[name](4096, np.random.default_rng(0))
+            trace = np.trace(rotation, axis1=-2, axis2=-1)
+            self.assertLess(abs(trace.mean()), 0.1, name)
+
+    def test_reproducible(self):
+        for name, sampler in ORIENTATION_SAMPLERS.items():
+            rot1 = sampler(16, np.random.default_rng(3))
+            rot2 = sampler(16, np.random.default_rng(3))
+            self.assertTrue(np.array_equal(rot1, rot2), name)
+
+
+if __name__ == "__main__":
+    ut.main()
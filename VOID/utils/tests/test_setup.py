@@ -36,6 +36,18 @@ class TestSetup(ut.TestCase):
         fit = self.setup.get_fitness()
         self.assertIsInstance(fit, fitness.MinDistanceFitness)
 
+    def test_multiple_fitness(self):
+        self.setup.args.update(
+            fitness="multiple",
+            fitnesses=["min_distance", "mean_distance_target"],
+            weights=[1.0, 0.5],
+        )
+        fit = self.setup.get_fitness()
+        self.assertIsInstance(fit, fitness.MultipleFitness)
+        self.assertIsInstance(fit.fitness[0], fitness.MinDistanceFitness)
+        self.assertIsInstance(fit.fitness[1], fitness.MeanDistanceGaussianTarget)
+        self.assertEqual(fit.weights, [1.0, 0.5])
+
     def test_structures(self):
         host, guest = self.setup.get_structures()
         host_ref = load_structure()
@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 import os
 import logging
+import numpy as np
 
 from VOID.utils.parser import DockParser
 from VOID.utils.setup import SetupRun
 from VOID.io.cif import write_cif
+from VOID.structure import materialize
 
 
 if __name__ == "__main__":
@@ -12,6 +14,10 @@ if __name__ == "__main__":
     parser = DockParser()
     args = parser.parse_args()
 
+    # makes the sampled points reproducible as well
+    if getattr(args, "seed", None) is not None:
+        np.random.seed(args.seed)
+
     setup = SetupRun(args)
     setup.make_output()
 
@@ -22,8 +28,9 @@ if __name__ == "__main__":
 
     complexes = docker.dock(args.attempts)
 
-    for idx, cpx in enumerate(complexes):
+    # complexes are only built for the poses that are written
+    for idx, pose in enumerate(complexes):
         outpath = os.path.join(args.output, "%04d.cif" % idx)
-        write_cif(outpath, cpx.pose)
+        write_cif(outpath, materialize(pose).pose)
 
     setup.save_args()
@@ -18,7 +18,7 @@ setup(
     packages=find_packages("."),
     scripts=["scripts/dock.py",],
     python_requires=">=3.5",
-    install_requires=["numpy", "networkx", "pymatgen>=2020.3.2", "scikit-learn"],
+    install_requires=["numpy", "scipy", "networkx", "pymatgen>=2020.3.2", "scikit-learn"],
     license="MIT",
     description="Voronoi Organic-Inorganic Docker",
     long_description=read("README.md"),